@@ -0,0 +1,190 @@
+"""共有キャッシュと判定経路のスレッド数に対するスループットを計測するベンチマーク.
+
+ロック1本の LRU とストライプ分割した LRU、CachedRoleLoader と DecisionCache、
+およびロール階層と MetricsAggregator を登録した状態での has_role・
+_resolve_roles・authorize_page を、スレッド数を変えながら計測し、
+結果を JSON で標準出力に書き出す。
+free-threaded ビルド (python3.13t など) で実行すると、
+ストライプ分割によるスケーリングの差が現れる。
+
+Usage:
+    uv run python benchmarks/concurrency.py [--duration SECONDS]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import threading
+import time
+from typing import TYPE_CHECKING
+
+from streamlit_rbac import (
+    CachedRoleLoader,
+    DecisionCache,
+    MetricsAggregator,
+    Policy,
+    RoleHierarchy,
+    has_role,
+    set_decision_cache,
+    set_metrics_hook,
+    set_role_hierarchy,
+)
+from streamlit_rbac._cache import _StripedLRU
+from streamlit_rbac._core import _resolve_roles
+from streamlit_rbac._streamlit import authorize_page
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+THREAD_COUNTS = (1, 2, 4, 8)
+USERS = [f"user{i}" for i in range(512)]
+ROLE_SETS = [frozenset({f"Group{i % 32}", "User"}) for i in range(512)]
+ROLE_LISTS = [[f"Group{i % 32}", "User", "Manager"] for i in range(512)]
+
+
+def _throughput(
+    operation: Callable[[int], object], threads: int, duration: float
+) -> float:
+    """threads 本のスレッドで duration 秒間 operation を繰り返し、毎秒の回数を返す."""
+    # 初回の import やキャッシュの構築を計測から除く
+    operation(0)
+    stop = threading.Event()
+    counts = [0] * threads
+
+    def worker(index: int) -> None:
+        count = 0
+        i = index
+        while not stop.is_set():
+            for _ in range(100):
+                operation(i)
+                i += 1
+            count += 100
+        counts[index] = count
+
+    workers = [threading.Thread(target=worker, args=(i,)) for i in range(threads)]
+    # 停止の指示が遅れても正しい値になるよう、実際の経過時間で割る
+    started = time.perf_counter()
+    for thread in workers:
+        thread.start()
+    time.sleep(duration)
+    stop.set()
+    for thread in workers:
+        thread.join()
+    return sum(counts) / (time.perf_counter() - started)
+
+
+def _lru_operation(stripes: int) -> Callable[[int], object]:
+    cache: _StripedLRU[str, frozenset[str]] = _StripedLRU(1024, stripes=stripes)
+    for user, roles in zip(USERS, ROLE_SETS, strict=True):
+        cache.put(user, roles)
+
+    def operation(i: int) -> object:
+        return cache.get(USERS[i % len(USERS)])
+
+    return operation
+
+
+def _role_loader_operation() -> Callable[[int], object]:
+    local = threading.local()
+    loader = CachedRoleLoader(lambda: ["User"], key=lambda: local.user)
+
+    def operation(i: int) -> object:
+        local.user = USERS[i % len(USERS)]
+        return loader()
+
+    return operation
+
+
+def _decision_operation() -> Callable[[int], object]:
+    set_decision_cache(DecisionCache())
+    policy = Policy.any_of("Group1") | Policy.all_of("Group2", "User")
+
+    def operation(i: int) -> object:
+        return policy.evaluate(ROLE_SETS[i % len(ROLE_SETS)])
+
+    return operation
+
+
+def _register_check_path() -> None:
+    """判定経路のケース用に、ロール階層と計測フックを登録する."""
+    set_role_hierarchy(RoleHierarchy({"Manager": ["User"], "Group1": ["Manager"]}))
+    set_metrics_hook(MetricsAggregator())
+
+
+def _has_role_operation() -> Callable[[int], object]:
+    _register_check_path()
+
+    def operation(i: int) -> object:
+        return has_role("Manager", user_roles=ROLE_LISTS[i % len(ROLE_LISTS)])
+
+    return operation
+
+
+def _resolve_roles_operation() -> Callable[[int], object]:
+    _register_check_path()
+    local = threading.local()
+
+    def loader() -> list[str]:
+        return ROLE_LISTS[local.index % len(ROLE_LISTS)]
+
+    def operation(i: int) -> object:
+        local.index = i
+        return _resolve_roles(None, loader)
+
+    return operation
+
+
+def _authorize_page_operation() -> Callable[[int], object]:
+    # スクリプト実行外のため、ロールは rerun 単位でキャッシュされず毎回解決される
+    _register_check_path()
+    local = threading.local()
+
+    def loader() -> list[str]:
+        return ROLE_LISTS[local.index % len(ROLE_LISTS)]
+
+    def operation(i: int) -> object:
+        local.index = i
+        authorize_page("Manager", role_loader=loader)
+        return None
+
+    return operation
+
+
+def main() -> None:
+    """ベンチマークを実行して JSON を出力する."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--duration", type=float, default=0.5)
+    args = parser.parse_args()
+
+    gil_enabled = getattr(sys, "_is_gil_enabled", lambda: True)()
+    results = []
+    cases: list[tuple[str, Callable[[], Callable[[int], object]]]] = [
+        ("lru[stripes=1]", lambda: _lru_operation(1)),
+        ("lru[stripes=16]", lambda: _lru_operation(16)),
+        ("CachedRoleLoader", _role_loader_operation),
+        ("DecisionCache", _decision_operation),
+        ("has_role", _has_role_operation),
+        ("_resolve_roles", _resolve_roles_operation),
+        ("authorize_page", _authorize_page_operation),
+    ]
+    for name, factory in cases:
+        for threads in THREAD_COUNTS:
+            ops = _throughput(factory(), threads, args.duration)
+            results.append(
+                {"case": name, "threads": threads, "ops_per_second": round(ops)}
+            )
+    set_decision_cache(None)
+    set_role_hierarchy(None)
+    set_metrics_hook(None)
+    json.dump(
+        {"python": sys.version, "gil_enabled": gil_enabled, "results": results},
+        sys.stdout,
+        indent=2,
+    )
+    sys.stdout.write("\n")
+
+
+if __name__ == "__main__":
+    main()
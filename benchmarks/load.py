@@ -0,0 +1,227 @@
+"""Streamlit AppTest による同時セッションの負荷試験.
+
+ページスクリプト (既定では example/pages/*.py) を多数のセッションで
+異なるユーザー・ロールの組み合わせにより繰り返し実行し、
+rerun の所要時間のパーセンタイル、ロールローダーの呼び出し回数、
+認可の拒否率を JSON で書き出す。各セッションの初回実行はスクリプトの
+読み込みなどを含むため、2回目以降の rerun とは分けて集計する。
+すべてローカルで完結し、ネットワークは使わない。
+
+AppTest は実行のたびにプロセス全体で共有される Runtime を差し替えるため、
+同一プロセス内のスレッドから同時に実行できない。そのため並行性は
+ワーカープロセスで確保し、各ワーカーは担当する全セッションを保持したまま
+rerun を交互に実行する。したがって同時に実行される rerun の数
+(実効並行数) はセッション数ではなくワーカー数であり、--sessions は
+セッション状態を保持したまま並存するセッションの数を表す。
+実効並行数はレポートの effective_concurrency に出力する。
+ローダー呼び出しと判定結果は計測フック (MetricsAggregator) で集計し、
+ワーカー間で合算する。
+
+Usage:
+    uv run python benchmarks/load.py [--sessions N] [--workers N] [--reruns N]
+        [--app-dir DIR] [--page PATH ...] [--session-key KEY] [--user VALUE ...]
+"""
+
+from __future__ import annotations
+
+import argparse
+import importlib
+import json
+import multiprocessing
+import os
+import statistics
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Any
+
+DEFAULT_APP_DIR = Path(__file__).resolve().parent.parent / "example"
+
+
+def _quiet_streamlit() -> None:
+    """スクリプト実行外での session_state 操作に対する警告を抑止する."""
+    from streamlit import logger  # noqa: PLC0415
+
+    logger.set_log_level("error")
+
+
+def _users(app_dir: Path, users: list[str] | None) -> list[str]:
+    """セッションに割り当てるユーザー. 省略時はデモアプリの common.USERS を使う."""
+    if users:
+        return users
+    _quiet_streamlit()
+    sys.path.insert(0, str(app_dir))
+    return list(importlib.import_module("common").USERS)
+
+
+def _run_worker(
+    app_dir: str,
+    sessions: list[tuple[str, str]],
+    session_key: str,
+    reruns: int,
+    timeout: float,
+) -> dict[str, Any]:
+    """割り当てられたセッションを保持し、rerun を交互に実行して結果を返す."""
+    _quiet_streamlit()
+    sys.path.insert(0, app_dir)
+    from streamlit.testing.v1 import AppTest  # noqa: PLC0415
+
+    from streamlit_rbac import MetricsAggregator, set_metrics_hook  # noqa: PLC0415
+
+    metrics = MetricsAggregator()
+    set_metrics_hook(metrics)
+    apps = []
+    for page, user in sessions:
+        app = AppTest.from_file(page, default_timeout=timeout)
+        app.session_state[session_key] = user
+        apps.append((page, app))
+
+    first_runs: list[float] = []
+    latencies: dict[str, list[float]] = {}
+    errors = 0
+    for rerun in range(reruns):
+        for page, app in apps:
+            start = time.perf_counter()
+            app.run()
+            elapsed = time.perf_counter() - start
+            if rerun == 0:
+                first_runs.append(elapsed)
+            else:
+                latencies.setdefault(page, []).append(elapsed)
+            errors += bool(app.exception)
+    return {
+        "first_runs": first_runs,
+        "latencies": latencies,
+        "errors": errors,
+        "metrics": metrics.snapshot(),
+    }
+
+
+def _percentiles(samples: list[float]) -> dict[str, float]:
+    """ミリ秒単位の p50 / p90 / p95 / p99 / max."""
+    if not samples:
+        return {}
+    if len(samples) < 2:  # noqa: PLR2004
+        samples = samples * 2
+    cuts = statistics.quantiles(samples, n=100, method="inclusive")
+    return {
+        name: round(value * 1000, 3)
+        for name, value in (
+            ("p50", cuts[49]),
+            ("p90", cuts[89]),
+            ("p95", cuts[94]),
+            ("p99", cuts[98]),
+            ("max", max(samples)),
+        )
+    }
+
+
+def _summarize(outcomes: list[dict[str, Any]], reruns_total: int) -> dict[str, Any]:
+    """ワーカーごとの結果を合算する."""
+    first_runs: list[float] = []
+    by_page: dict[str, list[float]] = {}
+    loader_calls: Counter[str] = Counter()
+    decisions: dict[str, Counter[str]] = {}
+    for outcome in outcomes:
+        first_runs.extend(outcome["first_runs"])
+        for page, samples in outcome["latencies"].items():
+            by_page.setdefault(page, []).extend(samples)
+        for name, stats in outcome["metrics"]["loaders"].items():
+            loader_calls[name] += stats["count"]
+        for source, policies in outcome["metrics"]["checks"].items():
+            counts = decisions.setdefault(source, Counter())
+            for result in policies.values():
+                counts.update(result)
+
+    all_samples = [sample for samples in by_page.values() for sample in samples]
+    return {
+        "first_run_ms": _percentiles(first_runs),
+        "latency_ms": _percentiles(all_samples),
+        "pages": {
+            Path(page).name: {"reruns": len(samples), **_percentiles(samples)}
+            for page, samples in sorted(by_page.items())
+        },
+        "loader_calls": dict(loader_calls),
+        "loader_calls_per_rerun": {
+            name: round(count / reruns_total, 4) for name, count in loader_calls.items()
+        },
+        "denial_rate": {
+            source: round(counts["denied"] / (counts["granted"] + counts["denied"]), 4)
+            for source, counts in sorted(decisions.items())
+        },
+        "errors": sum(outcome["errors"] for outcome in outcomes),
+    }
+
+
+def main() -> None:
+    """負荷試験を実行して JSON を出力する."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=200)
+    parser.add_argument("--workers", type=int, default=min(8, os.cpu_count() or 1))
+    parser.add_argument(
+        "--reruns", type=int, default=5, help="runs per session, including the first"
+    )
+    parser.add_argument("--timeout", type=float, default=30.0)
+    parser.add_argument("--app-dir", type=Path, default=DEFAULT_APP_DIR)
+    parser.add_argument(
+        "--page",
+        type=Path,
+        action="append",
+        help="page script to drive (default: APP_DIR/pages/*.py)",
+    )
+    parser.add_argument(
+        "--session-key", default="user", help="session_state key set per session"
+    )
+    parser.add_argument(
+        "--user",
+        action="append",
+        help="value stored under SESSION_KEY (default: keys of common.USERS)",
+    )
+    parser.add_argument("--output", type=Path, help="write JSON here (default: stdout)")
+    args = parser.parse_args()
+
+    app_dir = args.app_dir.resolve()
+    pages = [
+        str(page.resolve()) for page in args.page or sorted(app_dir.glob("pages/*.py"))
+    ]
+    users = _users(app_dir, args.user)
+    sessions = [
+        (pages[i % len(pages)], users[(i // len(pages)) % len(users)])
+        for i in range(args.sessions)
+    ]
+    workers = max(1, min(args.workers, len(sessions)))
+    shares = [sessions[index::workers] for index in range(workers)]
+
+    start = time.perf_counter()
+    with multiprocessing.get_context("spawn").Pool(workers) as pool:
+        outcomes = pool.starmap(
+            _run_worker,
+            [
+                (str(app_dir), share, args.session_key, args.reruns, args.timeout)
+                for share in shares
+            ],
+        )
+    elapsed = time.perf_counter() - start
+
+    reruns_total = len(sessions) * args.reruns
+    report = {
+        "sessions": len(sessions),
+        "workers": workers,
+        # 各ワーカー内のセッションは順に実行されるため、同時に走る rerun は workers 件
+        "effective_concurrency": workers,
+        "reruns": reruns_total,
+        "elapsed_seconds": round(elapsed, 3),
+        "reruns_per_second": round(reruns_total / elapsed, 1),
+        **_summarize(outcomes, reruns_total),
+    }
+    text = json.dumps(report, indent=2, ensure_ascii=False) + "\n"
+    if args.output is None:
+        sys.stdout.write(text)
+    else:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,244 @@
+"""判定関数・デコレータ・ページガードのマイクロベンチマーク.
+
+has_role / has_any_role / has_all_roles のロール数ごとの所要時間、
+require_roles の素の関数に対するオーバーヘッド、
+Streamlit をスタブに置き換えた authorize_page の所要時間、
+模擬した rerun 1回あたりのロールローダー呼び出し回数を計測し、
+結果を JSON で書き出す。ネットワークや Streamlit の実行環境は不要である。
+
+Usage:
+    uv run python benchmarks/micro.py [--output PATH] [--compare BASELINE]
+"""
+
+from __future__ import annotations
+
+import argparse
+import functools
+import json
+import platform
+import subprocess
+import sys
+import timeit
+import types
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+from unittest.mock import patch
+
+from streamlit_rbac import (
+    Policy,
+    SessionRoleLoader,
+    has_all_roles,
+    has_any_role,
+    has_role,
+    require_roles,
+    rerun_cached,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterator
+
+ROLE_COUNTS = (1, 10, 100, 1000, 10_000)
+REPEAT = 5
+# 1回の計測にかける目安の秒数
+SAMPLE_SECONDS = 0.02
+
+
+def _ns_per_op(operation: Callable[[], object]) -> float:
+    """operation 1回あたりの所要時間 (ナノ秒) を、繰り返し計測の最小値で返す."""
+    timer = timeit.Timer(operation)
+    number = 1
+    while (elapsed := timer.timeit(number)) < SAMPLE_SECONDS / 10:
+        number *= 10
+    number = max(1, int(number * SAMPLE_SECONDS / elapsed))
+    return min(timer.repeat(REPEAT, number)) / number * 1e9
+
+
+def _result(name: str, value: float, unit: str = "ns/op") -> dict[str, Any]:
+    return {"name": name, "unit": unit, "value": round(value, 3)}
+
+
+def _roles(count: int) -> list[str]:
+    # 判定対象のロールを末尾に置き、リストの走査では最悪ケースになるようにする
+    return [f"group-{i}" for i in range(count - 1)] + ["Admin"]
+
+
+def bench_core() -> Iterator[dict[str, Any]]:
+    """ロール数と入力の形式ごとの has_* の所要時間."""
+    for count in ROLE_COUNTS:
+        roles = _roles(count)
+        inputs: dict[str, dict[str, Any]] = {
+            "list": {"user_roles": roles},
+            "frozenset": {"user_roles": frozenset(roles)},
+            "loader": {"role_loader": lambda roles=roles: roles},
+        }
+        for kind, source in inputs.items():
+            suffix = f"[{kind},n={count}]"
+            yield _result(
+                f"has_role{suffix}",
+                _ns_per_op(functools.partial(has_role, "Admin", **source)),
+            )
+            yield _result(
+                f"has_any_role{suffix}",
+                _ns_per_op(
+                    functools.partial(has_any_role, "Manager", "Admin", **source)
+                ),
+            )
+            yield _result(
+                f"has_all_roles{suffix}",
+                _ns_per_op(
+                    functools.partial(has_all_roles, "Admin", "group-0", **source)
+                ),
+            )
+
+
+def bench_decorator() -> Iterator[dict[str, Any]]:
+    """require_roles で保護した関数と素の関数の1回あたりの所要時間."""
+    roles = frozenset({"Admin", "User"})
+
+    def plain() -> int:
+        return 1
+
+    guarded_static = require_roles("Admin", user_roles=roles)(plain)
+    guarded_loader = require_roles("Admin", role_loader=lambda: roles)(plain)
+    guarded_policy = require_roles(
+        Policy.any_of("Manager") | Policy.all_of("Admin", "User"),
+        role_loader=lambda: roles,
+    )(plain)
+
+    baseline = _ns_per_op(plain)
+    yield _result("call[undecorated]", baseline)
+    for name, func in (
+        ("require_roles[user_roles]", guarded_static),
+        ("require_roles[role_loader]", guarded_loader),
+        ("require_roles[policy]", guarded_policy),
+    ):
+        elapsed = _ns_per_op(func)
+        yield _result(f"call[{name}]", elapsed)
+        yield _result(f"overhead[{name}]", elapsed - baseline)
+
+
+class _FakeContext:
+    """rerun ごとに cursors が置き換わる ScriptRunContext の代替."""
+
+    def __init__(self) -> None:
+        self.cursors: dict[Any, Any] = {}
+
+    def rerun(self) -> None:
+        self.cursors = {}
+
+
+def _stub_streamlit() -> types.ModuleType:
+    """authorize_page と SessionRoleLoader が使う API だけを持つスタブ."""
+    stub = types.ModuleType("streamlit")
+    stub.session_state = {}  # type: ignore[attr-defined]
+    for name in ("error", "warning", "link_button", "stop"):
+        setattr(stub, name, lambda *_args, **_kwargs: None)
+    return stub
+
+
+def bench_streamlit() -> Iterator[dict[str, Any]]:
+    """authorize_page の所要時間と、rerun 1回あたりのローダー呼び出し回数."""
+    context = _FakeContext()
+    with (
+        patch.dict(sys.modules, {"streamlit": _stub_streamlit()}),
+        patch("streamlit_rbac._streamlit._get_script_run_ctx", return_value=context),
+    ):
+        from streamlit_rbac._streamlit import authorize_page  # noqa: PLC0415
+
+        roles = frozenset({"Manager", "User"})
+        yield _result(
+            "authorize_page[granted]",
+            _ns_per_op(lambda: authorize_page("Manager", role_loader=lambda: roles)),
+        )
+        yield _result(
+            "authorize_page[denied]",
+            _ns_per_op(lambda: authorize_page("Admin", role_loader=lambda: roles)),
+        )
+
+        calls = 0
+
+        def load() -> list[str]:
+            nonlocal calls
+            calls += 1
+            return ["Manager", "User"]
+
+        loaders: dict[str, Callable[[], Any]] = {
+            "plain": load,
+            "rerun_cached": rerun_cached(load),
+            "SessionRoleLoader": SessionRoleLoader(load, user=lambda: "alice"),
+        }
+        reruns = 20
+        for name, loader in loaders.items():
+            calls = 0
+            guarded = require_roles("Manager", role_loader=loader)(lambda: None)
+            for _ in range(reruns):
+                context.rerun()
+                # ページガード・セクション判定3回・保護された関数1回を含むページを模擬する
+                authorize_page("Manager", role_loader=loader)
+                has_role("Admin", role_loader=loader)
+                has_any_role("Manager", "Auditor", role_loader=loader)
+                has_all_roles("Manager", "User", role_loader=loader)
+                guarded()
+            yield _result(
+                f"loader_calls_per_rerun[{name}]", calls / reruns, unit="calls"
+            )
+
+
+def _git_commit() -> str | None:
+    try:
+        completed = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            check=True,
+            text=True,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return completed.stdout.strip()
+
+
+def _compare(results: list[dict[str, Any]], baseline_path: Path) -> None:
+    """ベースラインの結果と比較した表を標準エラー出力に書き出す."""
+    baseline = {
+        entry["name"]: entry["value"]
+        for entry in json.loads(baseline_path.read_text())["results"]
+    }
+    sys.stderr.write(
+        f"{'benchmark':<48} {'baseline':>12} {'current':>12} {'ratio':>7}\n"
+    )
+    for entry in results:
+        before = baseline.get(entry["name"])
+        if before is None:
+            continue
+        ratio = f"{entry['value'] / before:.2f}" if before else "-"
+        sys.stderr.write(
+            f"{entry['name']:<48} {before:>12} {entry['value']:>12} {ratio:>7}\n"
+        )
+
+
+def main() -> None:
+    """ベンチマークを実行して JSON を出力する."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--output", type=Path, help="write JSON here (default: stdout)")
+    parser.add_argument("--compare", type=Path, help="baseline JSON to compare with")
+    args = parser.parse_args()
+
+    results = [*bench_core(), *bench_decorator(), *bench_streamlit()]
+    report = {
+        "commit": _git_commit(),
+        "python": sys.version,
+        "platform": platform.platform(),
+        "results": results,
+    }
+    text = json.dumps(report, indent=2) + "\n"
+    if args.output is None:
+        sys.stdout.write(text)
+    else:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(text)
+    if args.compare is not None:
+        _compare(results, args.compare)
+
+
+if __name__ == "__main__":
+    main()
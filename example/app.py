@@ -7,21 +7,10 @@ Usage:
     uv run streamlit run example/app.py
 """
 
-import streamlit as st
-from common import Role, get_user_roles, setup_sidebar
-
-from streamlit_rbac import has_role
+from common import NAVIGATION, get_user_roles, setup_sidebar
 
 setup_sidebar()
 
-pages = [
-    st.Page("pages/Home.py", title="Home", default=True),
-    st.Page("pages/User.py", title="User"),
-    st.Page("pages/Manager.py", title="Manager"),
-]
-
-if has_role(Role.ADMIN.value, role_loader=get_user_roles):
-    pages.append(st.Page("pages/Admin.py", title="Admin"))
-
-pg = st.navigation(pages)
+# 現在のユーザーがアクセスできるページだけをナビゲーションに表示する
+pg = NAVIGATION.navigation(role_loader=get_user_roles)
 pg.run()
@@ -7,6 +7,16 @@ from enum import Enum
 
 import streamlit as st
 
+from streamlit_rbac import (
+    PermissionMap,
+    RoleHierarchy,
+    RoleNavigation,
+    RolePage,
+    SessionRoleLoader,
+    set_permission_map,
+    set_role_hierarchy,
+)
+
 
 class Role(Enum):
     ADMIN = "Admin"
@@ -14,6 +24,29 @@ class Role(Enum):
     USER = "User"
 
 
+# Admin ⊃ Manager ⊃ User. 上位ロールは下位ロールのページにもアクセスできる
+set_role_hierarchy(
+    RoleHierarchy(
+        {
+            Role.ADMIN.value: [Role.MANAGER.value],
+            Role.MANAGER.value: [Role.USER.value],
+        }
+    )
+)
+
+# ロールが付与するパーミッション. 上位ロールは下位ロールのパーミッションも持つ
+set_permission_map(PermissionMap({Role.ADMIN.value: ["member:delete"]}))
+
+# ロールごとの表示ページはロールの組み合わせ単位でキャッシュされる
+NAVIGATION = RoleNavigation(
+    [
+        RolePage("pages/Home.py", title="Home", default=True),
+        RolePage("pages/User.py", Role.USER.value, title="User"),
+        RolePage("pages/Manager.py", Role.MANAGER.value, title="Manager"),
+        RolePage("pages/Admin.py", Role.ADMIN.value, title="Admin"),
+    ]
+)
+
 USERS: dict[str, list[str]] = {
     "alice (Admin)": [Role.ADMIN.value, Role.USER.value],
     "bob (Manager)": [Role.MANAGER.value, Role.USER.value],
@@ -22,9 +55,16 @@ USERS: dict[str, list[str]] = {
 }
 
 
-def get_user_roles() -> list[str]:
-    """st.session_state からロール一覧を取得する."""
-    return st.session_state.get("user_roles", [])
+def load_user_roles() -> list[str]:
+    """選択中のユーザーのロール一覧を取得する. 実際のアプリでは DB や IdP に問い合わせる."""
+    return USERS.get(st.session_state.get("user", ""), [])
+
+
+# 階層展開済みのロールをユーザー切り替え時に一度だけ解決して session_state に保持する.
+# 管理画面でロールを変更した場合は bump_role_version(user) で再解決させる
+get_user_roles = SessionRoleLoader(
+    load_user_roles, user=lambda: st.session_state.get("user")
+)
 
 
 def setup_sidebar() -> str:
@@ -32,11 +72,11 @@ def setup_sidebar() -> str:
     st.sidebar.title("Demo: ユーザー切り替え")
 
     selected_user = st.sidebar.selectbox("ユーザーを選択", list(USERS.keys()))
-    st.session_state["user_roles"] = USERS[selected_user]
+    st.session_state["user"] = selected_user
 
     st.sidebar.divider()
     st.sidebar.write("**現在のロール:**")
-    roles = st.session_state["user_roles"]
+    roles = USERS[selected_user]
     if roles:
         for role in roles:
             st.sidebar.write(f"- {role}")
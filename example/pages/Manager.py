@@ -4,9 +4,15 @@
 import streamlit as st
 from common import Role, get_user_roles
 
-from streamlit_rbac import authorize_page, has_role, require_roles
+from streamlit_rbac import (
+    authorize_page,
+    authorized,
+    permission_policy,
+    require_permission,
+)
 
-authorize_page(Role.MANAGER.value, Role.ADMIN.value, role_loader=get_user_roles)
+# ロール階層により Admin も Manager として扱われる
+authorize_page(Role.MANAGER.value, role_loader=get_user_roles)
 
 st.header("Manager ページ")
 st.write("Manager / Admin ロールを持つユーザーが閲覧できます。")
@@ -21,9 +27,10 @@ st.dataframe(
 )
 
 
-# @require_roles デコレータの使用例
-# Admin ロールがなければ PermissionError が発生し、関数は実行されない
-@require_roles(Role.ADMIN.value, role_loader=get_user_roles)
+# @require_permission デコレータの使用例
+# member:delete パーミッション (Admin) がなければ PermissionError が発生し、
+# 関数は実行されない
+@require_permission("member:delete", role_loader=get_user_roles)
 def delete_member(name: str) -> str:
     """Delete a member (Admin only)."""
     return f"{name} を削除しました。"
@@ -32,7 +39,13 @@ def delete_member(name: str) -> str:
 st.divider()
 st.subheader("メンバー削除（Admin のみ）")
 
-if has_role(Role.ADMIN.value, role_loader=get_user_roles):
+# authorized はセクション単位の判定. 拒否時は placeholder を表示し、
+# 同じ rerun 内の他の判定とロールの解決結果を共有する
+if authorized(
+    permission_policy("member:delete"),
+    role_loader=get_user_roles,
+    placeholder="メンバー削除の操作には Admin 権限が必要です。",
+):
     target = st.selectbox("削除対象", ["田中", "佐藤", "鈴木"])
     if st.button("削除を実行"):
         try:
@@ -40,5 +53,3 @@ if has_role(Role.ADMIN.value, role_loader=get_user_roles):
             st.success(result)
         except PermissionError as e:
             st.error(str(e))
-else:
-    st.info("メンバー削除の操作には Admin 権限が必要です。")
@@ -1,26 +1,167 @@
 """streamlit-rbac: Lightweight RBAC library for Streamlit applications."""
 
+from typing import TYPE_CHECKING
+
+from streamlit_rbac._async import (
+    has_all_roles_async,
+    has_any_role_async,
+    has_role_async,
+)
+from streamlit_rbac._audit import (
+    AuditEvent,
+    AuditSink,
+    AuditStats,
+    AuditWriter,
+    JSONLinesAuditWriter,
+    SQLiteAuditWriter,
+    get_audit_sink,
+    set_audit_sink,
+)
+from streamlit_rbac._batch import authorize_batch
+from streamlit_rbac._cache import CachedRoleLoader, CacheStats
 from streamlit_rbac._core import has_all_roles, has_any_role, has_role
-from streamlit_rbac._decorators import require_roles
-from streamlit_rbac._types import OnDeniedHandler, RoleLoader
+from streamlit_rbac._data import RoleDataFilter
+from streamlit_rbac._decisions import (
+    DecisionCache,
+    get_decision_cache,
+    set_decision_cache,
+)
+from streamlit_rbac._decorators import require_permission, require_roles
+from streamlit_rbac._expression import parse_policy
+from streamlit_rbac._hierarchy import (
+    RoleHierarchy,
+    get_role_hierarchy,
+    set_role_hierarchy,
+)
+from streamlit_rbac._metrics import (
+    MetricsAggregator,
+    MetricsHook,
+    get_metrics_hook,
+    set_metrics_hook,
+)
+from streamlit_rbac._partition import (
+    RolePartitionedCache,
+    role_fingerprint,
+    role_partitioned_cache,
+)
+from streamlit_rbac._permissions import (
+    PermissionMap,
+    get_permission_map,
+    has_permission,
+    permission_policy,
+    set_permission_map,
+)
+from streamlit_rbac._policy import Policy
+from streamlit_rbac._policy_file import (
+    PolicyFile,
+    get_named_policies,
+    named_policy,
+    set_named_policies,
+)
+from streamlit_rbac._registry import RoleRegistry
+from streamlit_rbac._shared import SharedRoleCache
+from streamlit_rbac._singleflight import SingleFlight, SingleFlightRoleLoader
+from streamlit_rbac._sqlite import SQLiteRoleStore
+from streamlit_rbac._types import AsyncRoleLoader, OnDeniedHandler, RoleLoader
+from streamlit_rbac._versions import bump_role_version
+
+if TYPE_CHECKING:
+    # 型検査器には実体を見せ、実行時は __getattr__ で遅延 import する
+    from streamlit_rbac._streamlit import (
+        RoleNavigation,
+        RolePage,
+        SessionRoleLoader,
+        authorize_page,
+        authorize_permission,
+        authorized,
+        authorized_section,
+        rerun_cached,
+    )
 
 __all__ = [
+    "AsyncRoleLoader",
+    "AuditEvent",
+    "AuditSink",
+    "AuditStats",
+    "AuditWriter",
+    "CacheStats",
+    "CachedRoleLoader",
+    "DecisionCache",
+    "JSONLinesAuditWriter",
+    "MetricsAggregator",
+    "MetricsHook",
     "OnDeniedHandler",
+    "PermissionMap",
+    "Policy",
+    "PolicyFile",
+    "RoleDataFilter",
+    "RoleHierarchy",
     "RoleLoader",
+    "RoleNavigation",
+    "RolePage",
+    "RolePartitionedCache",
+    "RoleRegistry",
+    "SQLiteAuditWriter",
+    "SQLiteRoleStore",
+    "SessionRoleLoader",
+    "SharedRoleCache",
+    "SingleFlight",
+    "SingleFlightRoleLoader",
+    "authorize_batch",
     "authorize_page",
+    "authorize_permission",
+    "authorized",
+    "authorized_section",
+    "bump_role_version",
+    "get_audit_sink",
+    "get_decision_cache",
+    "get_metrics_hook",
+    "get_named_policies",
+    "get_permission_map",
+    "get_role_hierarchy",
     "has_all_roles",
+    "has_all_roles_async",
     "has_any_role",
+    "has_any_role_async",
+    "has_permission",
     "has_role",
+    "has_role_async",
+    "named_policy",
+    "parse_policy",
+    "permission_policy",
+    "require_permission",
     "require_roles",
+    "rerun_cached",
+    "role_fingerprint",
+    "role_partitioned_cache",
+    "set_audit_sink",
+    "set_decision_cache",
+    "set_metrics_hook",
+    "set_named_policies",
+    "set_permission_map",
+    "set_role_hierarchy",
 ]
 
 __version__ = "0.1.0"
 
+_STREAMLIT_EXPORTS = frozenset(
+    {
+        "RoleNavigation",
+        "RolePage",
+        "SessionRoleLoader",
+        "authorize_page",
+        "authorize_permission",
+        "authorized",
+        "authorized_section",
+        "rerun_cached",
+    }
+)
+
 
 def __getattr__(name: str) -> object:
     """Streamlit統合モジュールの遅延import."""
-    if name == "authorize_page":
+    if name in _STREAMLIT_EXPORTS:
         from streamlit_rbac import _streamlit  # noqa: PLC0415
 
-        return _streamlit.authorize_page
+        return getattr(_streamlit, name)
     raise AttributeError(f"module 'streamlit_rbac' has no attribute {name!r}")
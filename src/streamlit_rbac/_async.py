@@ -0,0 +1,108 @@
+"""streamlit-rbac の非同期判定関数.
+
+async def のロールローダーを await しながらロールを解決する。
+判定の意味はコア判定関数と同一である。
+"""
+
+from __future__ import annotations
+
+import inspect
+import time
+from typing import TYPE_CHECKING
+
+from streamlit_rbac._config import _get_config
+from streamlit_rbac._core import (
+    _as_role_set,
+    _check_role_source,
+    _expand_roles,
+    _loader_name,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+    from streamlit_rbac._types import AsyncRoleLoader, RoleLoader
+
+
+async def _load_roles_async(
+    role_loader: RoleLoader | AsyncRoleLoader,
+) -> frozenset[str]:
+    """排他チェック済みの role_loader を必要に応じて await して解決する内部関数.
+
+    計測フックが登録されている場合は await を含む所要時間を通知する。
+    """
+    metrics = _get_config().metrics
+    start = time.perf_counter() if metrics is not None else 0.0
+    try:
+        result = role_loader()
+        if inspect.isawaitable(result):
+            result = await result
+    finally:
+        if metrics is not None:
+            metrics.record_load(_loader_name(role_loader), time.perf_counter() - start)
+    return _expand_roles(_as_role_set(result))
+
+
+async def _resolve_roles_async(
+    user_roles: Iterable[str] | None,
+    role_loader: RoleLoader | AsyncRoleLoader | None,
+) -> frozenset[str]:
+    """_resolve_roles の非同期版. 同期のロールローダーも受け付ける.
+
+    Raises:
+        ValueError: 両方が指定された場合、またはどちらも指定されない場合.
+    """
+    _check_role_source(user_roles, role_loader)
+    if user_roles is not None:
+        return _expand_roles(_as_role_set(user_roles))
+    if role_loader is None:  # pragma: no cover
+        msg = "Either user_roles or role_loader must be specified."
+        raise ValueError(msg)
+    return await _load_roles_async(role_loader)
+
+
+async def has_role_async(
+    required: str,
+    *,
+    user_roles: Iterable[str] | None = None,
+    role_loader: RoleLoader | AsyncRoleLoader | None = None,
+) -> bool:
+    """has_role の非同期版."""
+    resolved = await _resolve_roles_async(user_roles, role_loader)
+    granted = required in resolved
+    metrics = _get_config().metrics
+    if metrics is not None:
+        metrics.record_check("has_role_async", f"one of {(required,)}", granted)
+    return granted
+
+
+async def has_any_role_async(
+    *required: str,
+    user_roles: Iterable[str] | None = None,
+    role_loader: RoleLoader | AsyncRoleLoader | None = None,
+) -> bool:
+    """has_any_role の非同期版."""
+    if not required:
+        return False
+    resolved = await _resolve_roles_async(user_roles, role_loader)
+    granted = not resolved.isdisjoint(required)
+    metrics = _get_config().metrics
+    if metrics is not None:
+        metrics.record_check("has_any_role_async", f"one of {required}", granted)
+    return granted
+
+
+async def has_all_roles_async(
+    *required: str,
+    user_roles: Iterable[str] | None = None,
+    role_loader: RoleLoader | AsyncRoleLoader | None = None,
+) -> bool:
+    """has_all_roles の非同期版."""
+    if not required:
+        return True
+    resolved = await _resolve_roles_async(user_roles, role_loader)
+    granted = resolved.issuperset(required)
+    metrics = _get_config().metrics
+    if metrics is not None:
+        metrics.record_check("has_all_roles_async", f"all of {required}", granted)
+    return granted
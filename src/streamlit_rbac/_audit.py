@@ -0,0 +1,306 @@
+"""streamlit-rbac の監査ログ.
+
+require_roles・authorize_page の判定結果をイベントとして有界キューに積み、
+バックグラウンドスレッドがまとめて書き込む。判定を行うスレッドは
+ディスクへの書き込みを待たない。すべての機能は標準ライブラリのみに依存する。
+"""
+
+from __future__ import annotations
+
+import atexit
+import dataclasses
+import json
+import queue
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Literal, Protocol
+
+from streamlit_rbac._config import _get_config, _update_config
+
+if TYPE_CHECKING:
+    import os
+    from collections.abc import Callable, Sequence
+    from typing import TextIO
+
+    from streamlit_rbac._policy import Policy
+
+Backpressure = Literal["drop", "block"]
+
+
+@dataclass(frozen=True)
+class AuditEvent:
+    """1回の認可判定の記録."""
+
+    timestamp: float
+    source: str
+    """判定を行った API ("require_roles" / "authorize_page")."""
+    target: str
+    """保護対象. 関数の完全修飾名またはページのスクリプトパス."""
+    policy: str
+    required: tuple[str, ...]
+    roles: tuple[str, ...]
+    granted: bool
+
+
+@dataclass(frozen=True)
+class AuditStats:
+    """監査シンクの統計情報."""
+
+    recorded: int
+    written: int
+    dropped: int
+    failed: int
+
+
+class AuditWriter(Protocol):
+    """イベントのバッチを永続化するライター."""
+
+    def write(self, events: Sequence[AuditEvent]) -> None:
+        """イベントのバッチを書き込む."""
+
+    def close(self) -> None:
+        """リソースを解放する."""
+
+
+class JSONLinesAuditWriter:
+    """イベントを1行1件の JSON としてファイルに追記するライター."""
+
+    def __init__(self, path: str | os.PathLike[str]) -> None:
+        self._path = Path(path)
+        self._file: TextIO | None = None
+
+    def write(self, events: Sequence[AuditEvent]) -> None:
+        """イベントのバッチを追記し、バッチごとにフラッシュする."""
+        if self._file is None:
+            self._file = self._path.open("a", encoding="utf-8")
+        self._file.writelines(
+            json.dumps(dataclasses.asdict(event), ensure_ascii=False) + "\n"
+            for event in events
+        )
+        self._file.flush()
+
+    def close(self) -> None:
+        """ファイルを閉じる."""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+class SQLiteAuditWriter:
+    """イベントを SQLite のテーブルに挿入するライター.
+
+    接続は書き込みを行うバックグラウンドスレッドで作成する。
+    """
+
+    def __init__(
+        self, database: str | os.PathLike[str], *, table: str = "audit_log"
+    ) -> None:
+        if not table.isidentifier():
+            msg = f"Invalid table name: {table!r}"
+            raise ValueError(msg)
+        self._database = database
+        self._table = table
+        self._connection: sqlite3.Connection | None = None
+
+    def write(self, events: Sequence[AuditEvent]) -> None:
+        """イベントのバッチを1つのトランザクションで挿入する."""
+        if self._connection is None:
+            self._connection = sqlite3.connect(self._database, check_same_thread=False)
+            with self._connection:
+                self._connection.execute(
+                    f"CREATE TABLE IF NOT EXISTS {self._table} ("
+                    "timestamp REAL NOT NULL, source TEXT NOT NULL, "
+                    "target TEXT NOT NULL, policy TEXT NOT NULL, "
+                    "required TEXT NOT NULL, roles TEXT NOT NULL, "
+                    "granted INTEGER NOT NULL)"
+                )
+                self._connection.execute(
+                    f"CREATE INDEX IF NOT EXISTS {self._table}_timestamp "
+                    f"ON {self._table} (timestamp)"
+                )
+        with self._connection:
+            self._connection.executemany(
+                f"INSERT INTO {self._table} VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (
+                        event.timestamp,
+                        event.source,
+                        event.target,
+                        event.policy,
+                        json.dumps(event.required, ensure_ascii=False),
+                        json.dumps(event.roles, ensure_ascii=False),
+                        event.granted,
+                    )
+                    for event in events
+                ],
+            )
+
+    def close(self) -> None:
+        """接続を閉じる."""
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+
+class AuditSink:
+    """判定イベントを有界キューに積み、バックグラウンドでまとめて書き込む.
+
+    拒否はすべて記録する。許可は record_grant が True を返したものだけを記録する
+    (例: `lambda event: "Admin" in event.required`)。
+    キューが満杯の場合、backpressure が "drop" ならイベントを破棄して
+    dropped に計上し、"block" なら空きができるまで待つ。
+    プロセス終了時には残りのイベントを書き込んでから終了する。
+
+    Raises:
+        ValueError: maxsize または batch_size が正の値でない場合.
+    """
+
+    def __init__(
+        self,
+        writer: AuditWriter,
+        *,
+        maxsize: int = 10_000,
+        batch_size: int = 256,
+        backpressure: Backpressure = "drop",
+        record_grant: Callable[[AuditEvent], bool] | None = None,
+    ) -> None:
+        if maxsize <= 0:
+            msg = "maxsize must be positive."
+            raise ValueError(msg)
+        if batch_size <= 0:
+            msg = "batch_size must be positive."
+            raise ValueError(msg)
+        self._writer = writer
+        self._batch_size = batch_size
+        self._block = backpressure == "block"
+        self._record_grant = record_grant
+        self._queue: queue.Queue[AuditEvent | None] = queue.Queue(maxsize)
+        self._lock = threading.Lock()
+        # キューへの投入と close を直列化し、終了の番兵より後にイベントが積まれないようにする
+        self._emit_lock = threading.Lock()
+        self._closed = False
+        self._recorded = 0
+        self._written = 0
+        self._dropped = 0
+        self._failed = 0
+        self.last_error: Exception | None = None
+        """ライターで最後に発生した例外."""
+        self._thread = threading.Thread(
+            target=self._run, name="streamlit-rbac-audit", daemon=True
+        )
+        self._thread.start()
+        atexit.register(self.close)
+
+    def record(
+        self,
+        source: str,
+        target: str,
+        policy: Policy,
+        roles: frozenset[str],
+        granted: bool,
+    ) -> None:
+        """判定結果を記録対象であればキューに積む."""
+        if granted and self._record_grant is None:
+            return
+        event = AuditEvent(
+            timestamp=time.time(),
+            source=source,
+            target=target,
+            policy=policy.description,
+            required=tuple(sorted(policy.roles)),
+            roles=tuple(sorted(roles)),
+            granted=granted,
+        )
+        if granted and self._record_grant is not None and not self._record_grant(event):
+            return
+        self.emit(event)
+
+    def emit(self, event: AuditEvent) -> None:
+        """イベントをキューに積む. 閉じた後のイベントは破棄する."""
+        with self._emit_lock:
+            if not self._closed:
+                try:
+                    self._queue.put(event, block=self._block)
+                except queue.Full:
+                    pass
+                else:
+                    with self._lock:
+                        self._recorded += 1
+                    return
+        with self._lock:
+            self._dropped += 1
+
+    def _run(self) -> None:
+        closing = False
+        while not closing:
+            batch: list[AuditEvent] = []
+            item = self._queue.get()
+            while True:
+                if item is None:
+                    closing = True
+                else:
+                    batch.append(item)
+                if closing or len(batch) >= self._batch_size:
+                    break
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+            if batch:
+                self._write(batch)
+            for _ in range(len(batch) + closing):
+                self._queue.task_done()
+
+    def _write(self, batch: list[AuditEvent]) -> None:
+        try:
+            self._writer.write(batch)
+        except Exception as error:
+            self.last_error = error
+            with self._lock:
+                self._failed += len(batch)
+        else:
+            with self._lock:
+                self._written += len(batch)
+
+    def flush(self) -> None:
+        """キューに積まれたイベントがすべて書き込まれるまで待つ."""
+        self._queue.join()
+
+    def close(self) -> None:
+        """残りのイベントを書き込み、バックグラウンドスレッドとライターを終了する."""
+        with self._emit_lock:
+            if self._closed:
+                return
+            self._closed = True
+            # バックグラウンドスレッドは動作中のため、キューが満杯でもいずれ空きができる
+            self._queue.put(None)
+        self._thread.join()
+        self._writer.close()
+        atexit.unregister(self.close)
+
+    @property
+    def stats(self) -> AuditStats:
+        """現在の統計情報を返す."""
+        with self._lock:
+            return AuditStats(
+                recorded=self._recorded,
+                written=self._written,
+                dropped=self._dropped,
+                failed=self._failed,
+            )
+
+
+def set_audit_sink(sink: AuditSink | None) -> None:
+    """require_roles・authorize_page の判定を記録する監査シンクを登録する.
+
+    None で解除する。解除したシンクは閉じないため、必要に応じて close を呼ぶ。
+    """
+    _update_config(audit=sink)
+
+
+def get_audit_sink() -> AuditSink | None:
+    """登録済みの監査シンクを返す."""
+    return _get_config().audit
@@ -0,0 +1,52 @@
+"""streamlit-rbac のバッチ認可.
+
+多数のロール集合と多数のポリシーの組み合わせを一度に判定する。
+判定の意味はコア判定関数・Policy と同一である。
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from streamlit_rbac._config import _get_config
+from streamlit_rbac._core import _expand_roles
+from streamlit_rbac._policy import _any_of
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Sequence
+
+    from streamlit_rbac._policy import Policy
+
+
+def authorize_batch(
+    role_sets: Iterable[Iterable[str]],
+    policies: Sequence[str | Policy],
+) -> list[tuple[bool, ...]]:
+    """ロール集合ごとに各ポリシーの判定結果を返す.
+
+    policies のロール名は has_role と同じ単一ロールの判定として扱い、
+    呼び出しをまたいで同じポリシーを使うため判定キャッシュのエントリを共有する。
+    同一のロール集合は一度だけ評価し、結果の行を共有する。
+    戻り値の i 行 j 列目は role_sets[i] に対する policies[j] の判定結果である。
+    """
+    compiled = [
+        _any_of((policy,)) if isinstance(policy, str) else policy for policy in policies
+    ]
+    evaluators = [policy.evaluate for policy in compiled]
+    rows: dict[frozenset[str], tuple[bool, ...]] = {}
+    matrix: list[tuple[bool, ...]] = []
+    for roles in role_sets:
+        key = frozenset(roles)
+        row = rows.get(key)
+        if row is None:
+            resolved = _expand_roles(key)
+            row = rows[key] = tuple(evaluate(resolved) for evaluate in evaluators)
+        matrix.append(row)
+
+    metrics = _get_config().metrics
+    if metrics is not None:
+        # 重複したロール集合も含め、行列の要素ごとに1回の判定として通知する
+        for row in matrix:
+            for policy, granted in zip(compiled, row, strict=True):
+                metrics.record_check("authorize_batch", policy.description, granted)
+    return matrix
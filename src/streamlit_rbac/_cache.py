@@ -0,0 +1,210 @@
+"""streamlit-rbac のロールローダーキャッシュ.
+
+LDAP・DB・OIDC userinfo などの低速な role_loader の結果を
+ユーザー単位でキャッシュするアダプタを提供する。
+すべての機能は標準ライブラリのみに依存する。
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Generic, TypeVar
+
+from streamlit_rbac._core import _intern_roles
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Hashable
+
+    from streamlit_rbac._types import RoleLoader
+
+K = TypeVar("K")
+V = TypeVar("V")
+
+# ストライプあたりの最小エントリ数. 小さなキャッシュは1本のストライプで厳密な LRU とする
+_MIN_STRIPE_SIZE = 64
+
+
+@dataclass(frozen=True)
+class CacheStats:
+    """キャッシュの統計情報."""
+
+    hits: int
+    misses: int
+    evictions: int
+    size: int
+
+    @property
+    def hit_rate(self) -> float:
+        """ヒット率. 一度も参照されていない場合は 0.0."""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+class _Stripe(Generic[K, V]):
+    """ロックとエントリを共有するキャッシュの分割単位."""
+
+    __slots__ = (
+        "capacity",
+        "entries",
+        "evictions",
+        "generation",
+        "hits",
+        "lock",
+        "misses",
+    )
+
+    def __init__(self, capacity: int) -> None:
+        self.capacity = capacity
+        self.entries: OrderedDict[K, V] = OrderedDict()
+        self.lock = threading.Lock()
+        # pop / clear のたびに進む. 破棄前に読み込みを始めた値の保存を防ぐ
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+
+class _StripedLRU(Generic[K, V]):
+    """キーのハッシュ値で複数のストライプに分割した LRU キャッシュ.
+
+    ストライプごとに独立したロックを持つため、異なるキーへの同時アクセスは
+    互いを待たない。LRU の順序と容量はストライプ単位で管理し、
+    容量の合計は maxsize に一致する。
+    """
+
+    def __init__(self, maxsize: int, *, stripes: int = 16) -> None:
+        count = max(1, min(stripes, maxsize // _MIN_STRIPE_SIZE))
+        base, extra = divmod(maxsize, count)
+        self._stripes = tuple(
+            _Stripe[K, V](base + (index < extra)) for index in range(count)
+        )
+
+    def _stripe(self, key: K) -> _Stripe[K, V]:
+        return self._stripes[hash(key) % len(self._stripes)]
+
+    def get(self, key: K, is_valid: Callable[[V], bool] | None = None) -> V | None:
+        """キャッシュ済みの値を返す. 未キャッシュまたは is_valid が偽なら None."""
+        stripe = self._stripe(key)
+        with stripe.lock:
+            value = stripe.entries.get(key)
+            if value is not None and (is_valid is None or is_valid(value)):
+                stripe.entries.move_to_end(key)
+                stripe.hits += 1
+                return value
+            stripe.misses += 1
+            return None
+
+    def generation(self, key: K) -> int:
+        """キーが属するストライプの世代番号を返す."""
+        stripe = self._stripe(key)
+        with stripe.lock:
+            return stripe.generation
+
+    def put(self, key: K, value: V, *, generation: int | None = None) -> None:
+        """値を保存し、ストライプの容量を超えた分を古い順に破棄する.
+
+        generation を指定した場合、その後に pop / clear が行われていれば保存しない。
+        """
+        stripe = self._stripe(key)
+        with stripe.lock:
+            if generation is not None and generation != stripe.generation:
+                return
+            stripe.entries[key] = value
+            stripe.entries.move_to_end(key)
+            while len(stripe.entries) > stripe.capacity:
+                stripe.entries.popitem(last=False)
+                stripe.evictions += 1
+
+    def pop(self, key: K) -> None:
+        """キーのエントリを破棄する."""
+        stripe = self._stripe(key)
+        with stripe.lock:
+            stripe.entries.pop(key, None)
+            stripe.generation += 1
+
+    def clear(self) -> None:
+        """すべてのエントリを破棄する. 統計情報は保持する."""
+        for stripe in self._stripes:
+            with stripe.lock:
+                stripe.entries.clear()
+                stripe.generation += 1
+
+    def stats(self) -> CacheStats:
+        """全ストライプを合計した統計情報を返す."""
+        hits = misses = evictions = size = 0
+        for stripe in self._stripes:
+            with stripe.lock:
+                hits += stripe.hits
+                misses += stripe.misses
+                evictions += stripe.evictions
+                size += len(stripe.entries)
+        return CacheStats(hits=hits, misses=misses, evictions=evictions, size=size)
+
+
+class CachedRoleLoader:
+    """TTL と LRU 上限付きでロール解決結果をキャッシュする RoleLoader.
+
+    key が返す値 (ユーザーIDやセッションIDなど) ごとに結果を保持する。
+    ロールの取得中に invalidate / clear が呼ばれた場合、その取得結果は保存しない。
+    エントリはキーのハッシュ値で複数のロックへ分散されるため、
+    多数のセッションスレッドからの同時参照が1つのロックに集中しない。
+    インスタンス自体が RoleLoader として振る舞うため、
+    has_role / require_roles / authorize_page にそのまま渡せる。
+
+    Raises:
+        ValueError: ttl または maxsize が正の値でない場合.
+    """
+
+    def __init__(
+        self,
+        role_loader: RoleLoader,
+        *,
+        key: Callable[[], Hashable],
+        ttl: float = 300.0,
+        maxsize: int = 1024,
+        timer: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if ttl <= 0:
+            msg = "ttl must be positive."
+            raise ValueError(msg)
+        if maxsize <= 0:
+            msg = "maxsize must be positive."
+            raise ValueError(msg)
+        self._role_loader = role_loader
+        self._key = key
+        self._ttl = ttl
+        self._timer = timer
+        self._entries: _StripedLRU[Hashable, tuple[float, frozenset[str]]] = (
+            _StripedLRU(maxsize)
+        )
+
+    def __call__(self) -> frozenset[str]:
+        """現在のユーザーのロールを返す. 未キャッシュまたは期限切れなら再取得する."""
+        key = self._key()
+        now = self._timer()
+        entry = self._entries.get(key, lambda cached: cached[0] > now)
+        if entry is not None:
+            return entry[1]
+
+        # ローダー呼び出し中はロックを保持しない.
+        # 呼び出し中に invalidate / clear された場合、取得済みの古いロールは保存しない
+        generation = self._entries.generation(key)
+        roles = _intern_roles(self._role_loader())
+        self._entries.put(key, (now + self._ttl, roles), generation=generation)
+        return roles
+
+    def invalidate(self, user: Hashable) -> None:
+        """指定ユーザーのキャッシュを破棄する. ログイン・ログアウト・ロール変更時に使う."""
+        self._entries.pop(user)
+
+    def clear(self) -> None:
+        """すべてのキャッシュを破棄する. 統計情報は保持する."""
+        self._entries.clear()
+
+    @property
+    def stats(self) -> CacheStats:
+        """現在の統計情報を返す."""
+        return self._entries.stats()
@@ -0,0 +1,63 @@
+"""streamlit-rbac のグローバル設定.
+
+ロール階層・パーミッション定義などアプリケーション全体で共有する設定を保持する。
+設定は不変オブジェクトとして丸ごと差し替えるため、
+判定中のスレッドが更新途中の状態を観測することはない。
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import threading
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from collections.abc import Mapping
+
+    from streamlit_rbac._audit import AuditSink
+    from streamlit_rbac._decisions import DecisionCache
+    from streamlit_rbac._hierarchy import RoleHierarchy
+    from streamlit_rbac._metrics import MetricsHook
+    from streamlit_rbac._permissions import PermissionMap
+    from streamlit_rbac._policy import Policy
+
+
+@dataclass(frozen=True)
+class _Config:
+    """共有設定のスナップショット."""
+
+    hierarchy: RoleHierarchy | None = None
+    permissions: PermissionMap | None = None
+    policies: Mapping[str, Policy] | None = None
+    decision_cache: DecisionCache | None = None
+    audit: AuditSink | None = None
+    metrics: MetricsHook | None = None
+    version: int = 0
+    """判定結果に影響する設定を更新するたびに増える世代番号.
+
+    設定に依存するキャッシュの無効化に使う。
+    """
+
+
+# 更新時に version を進める設定. 判定キャッシュや計測フックの登録では進めない
+_VERSIONED_FIELDS = frozenset({"hierarchy", "permissions", "policies"})
+
+_current = _Config()
+_lock = threading.Lock()
+
+
+def _get_config() -> _Config:
+    """現在の設定スナップショットを返す."""
+    return _current
+
+
+def _update_config(**changes: Any) -> None:
+    """設定の一部を置き換えた新しいスナップショットを公開する.
+
+    判定結果に影響する設定を含む場合のみ version を進める。
+    """
+    global _current  # noqa: PLW0603
+    with _lock:
+        version = _current.version + (not _VERSIONED_FIELDS.isdisjoint(changes))
+        _current = dataclasses.replace(_current, **changes, version=version)
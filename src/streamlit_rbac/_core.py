@@ -1,27 +1,75 @@
 """streamlit-rbac のコア判定関数.
 
-状態を持たない純粋関数としてロールベースのアクセス判定を提供する。
+ロールベースのアクセス判定関数を提供する。
+判定関数自体は状態を持たないが、set_role_hierarchy などで登録された
+グローバル設定 (ロール階層・計測フック) を判定のたびに参照するため、
+結果や副作用は登録内容に依存する。
 すべての関数は標準ライブラリのみに依存する。
 """
 
 from __future__ import annotations
 
+import functools
+import inspect
+import time
 from typing import TYPE_CHECKING
 
+from streamlit_rbac._config import _get_config
+
 if TYPE_CHECKING:
-    from collections.abc import Iterable
+    from collections.abc import Iterable, Sequence
 
     from streamlit_rbac._types import RoleLoader
 
+# この要素数以上のロール集合は、等しい集合同士で1つのインスタンスを共有する
+_INTERN_THRESHOLD = 64
 
-def _resolve_roles(
-    user_roles: Iterable[str] | None,
-    role_loader: RoleLoader | None,
-) -> frozenset[str]:
-    """ユーザーロールを解決する内部関数.
 
-    user_roles と role_loader の排他チェックを行い、
-    ロール一覧を frozenset として返却する。
+@functools.lru_cache(maxsize=1024)
+def _intern(roles: frozenset[str]) -> frozenset[str]:
+    """等しいロール集合に対して最初に登録されたインスタンスを返す内部関数."""
+    return roles
+
+
+def _as_role_set(roles: Iterable[str]) -> frozenset[str]:
+    """ロール一覧を frozenset に変換する内部関数. frozenset はコピーせずにそのまま使う.
+
+    Raises:
+        TypeError: async のロールローダーの戻り値 (awaitable) が渡された場合.
+    """
+    if isinstance(roles, frozenset):
+        return roles
+    try:
+        return frozenset(roles)
+    except TypeError:
+        if not inspect.isawaitable(roles):
+            raise
+    # 未 await のコルーチンの警告を出さないよう、破棄してから例外を送出する
+    if inspect.iscoroutine(roles):
+        roles.close()
+    msg = (
+        "role_loader returned an awaitable. Use has_role_async, "
+        "has_any_role_async or has_all_roles_async with async role loaders."
+    )
+    raise TypeError(msg)
+
+
+def _intern_roles(roles: Iterable[str]) -> frozenset[str]:
+    """ロール一覧を保存用の frozenset に変換する内部関数.
+
+    大きな集合は等しい集合同士で1つのインスタンスを共有するため、
+    同じロールを持つ多数のセッションが個別の複製を保持しない。
+    共有インスタンスはハッシュ値を保持しているため、
+    後段の判定キャッシュでの比較も同一性の確認だけで済む。
+    """
+    resolved = _as_role_set(roles)
+    if len(resolved) < _INTERN_THRESHOLD:
+        return resolved
+    return _intern(resolved)
+
+
+def _check_role_source(user_roles: object, role_loader: object) -> None:
+    """user_roles と role_loader の排他チェックを行う内部関数.
 
     Raises:
         ValueError: 両方が指定された場合、またはどちらも指定されない場合.
@@ -36,13 +84,76 @@ def _resolve_roles(
         msg = "Either user_roles or role_loader must be specified."
         raise ValueError(msg)
 
+
+def _resolve_roles(
+    user_roles: Iterable[str] | None,
+    role_loader: RoleLoader | None,
+) -> frozenset[str]:
+    """ユーザーロールを解決する内部関数.
+
+    user_roles と role_loader の排他チェックを行い、
+    ロール一覧を frozenset として返却する。
+    ロール階層が登録されている場合は実効ロールに展開する。
+
+    Raises:
+        ValueError: 両方が指定された場合、またはどちらも指定されない場合.
+    """
+    _check_role_source(user_roles, role_loader)
+
     if user_roles is not None:
-        return frozenset(user_roles)
+        return _expand_roles(_as_role_set(user_roles))
 
     if role_loader is None:  # pragma: no cover
         msg = "Either user_roles or role_loader must be specified."
         raise ValueError(msg)
-    return frozenset(role_loader())
+    return _load_roles(role_loader)
+
+
+def _load_roles(role_loader: RoleLoader) -> frozenset[str]:
+    """排他チェック済みの role_loader からロールを解決する内部関数.
+
+    計測フックが登録されている場合はローダーの所要時間を通知する。
+    """
+    metrics = _get_config().metrics
+    if metrics is None:
+        return _expand_roles(_as_role_set(role_loader()))
+    start = time.perf_counter()
+    try:
+        roles = role_loader()
+    finally:
+        metrics.record_load(_loader_name(role_loader), time.perf_counter() - start)
+    return _expand_roles(_as_role_set(roles))
+
+
+def _loader_name(role_loader: object) -> str:
+    """計測で使うロールローダーの名前を返す内部関数."""
+    name = getattr(role_loader, "__qualname__", None)
+    return name if isinstance(name, str) else type(role_loader).__qualname__
+
+
+def _expand_roles(roles: frozenset[str]) -> frozenset[str]:
+    """登録済みのロール階層に従ってロール集合を展開する内部関数."""
+    hierarchy = _get_config().hierarchy
+    if hierarchy is None:
+        return roles
+    return hierarchy.expand(roles)
+
+
+def _direct_roles(
+    user_roles: Iterable[str] | None, role_loader: RoleLoader | None
+) -> Sequence[str] | None:
+    """集合に変換せずに走査できる user_roles を返す内部関数.
+
+    ロール階層が登録されておらず、user_roles がリストまたはタプルの場合のみ返す。
+    数千件のロールを持つユーザーでも、判定ごとに集合を構築せずに済む。
+    """
+    if (
+        role_loader is None
+        and isinstance(user_roles, list | tuple)
+        and _get_config().hierarchy is None
+    ):
+        return user_roles
+    return None
 
 
 def has_role(
@@ -52,8 +163,15 @@ def has_role(
     role_loader: RoleLoader | None = None,
 ) -> bool:
     """指定されたロールを保持しているかを判定する."""
-    resolved = _resolve_roles(user_roles, role_loader)
-    return required in resolved
+    direct = _direct_roles(user_roles, role_loader)
+    if direct is not None:
+        granted = required in direct
+    else:
+        granted = required in _resolve_roles(user_roles, role_loader)
+    metrics = _get_config().metrics
+    if metrics is not None:
+        metrics.record_check("has_role", f"one of {(required,)}", granted)
+    return granted
 
 
 def has_any_role(
@@ -64,8 +182,21 @@ def has_any_role(
     """指定されたロールのいずれかを保持しているかを判定する."""
     if not required:
         return False
-    resolved = _resolve_roles(user_roles, role_loader)
-    return bool(resolved & frozenset(required))
+    direct = _direct_roles(user_roles, role_loader)
+    if direct is None:
+        resolved = _resolve_roles(user_roles, role_loader)
+        # タプルを引数にすると集合を作らずに required 側を走査し、一致した時点で打ち切る
+        granted = not resolved.isdisjoint(required)
+    elif len(required) == 1:
+        granted = required[0] in direct
+    else:
+        # 保持ロールを1回だけ走査し、最初に一致した時点で打ち切る
+        wanted = frozenset(required)
+        granted = any(map(wanted.__contains__, direct))
+    metrics = _get_config().metrics
+    if metrics is not None:
+        metrics.record_check("has_any_role", f"one of {required}", granted)
+    return granted
 
 
 def has_all_roles(
@@ -76,5 +207,17 @@ def has_all_roles(
     """指定されたロールのすべてを保持しているかを判定する."""
     if not required:
         return True
-    resolved = _resolve_roles(user_roles, role_loader)
-    return frozenset(required) <= resolved
+    direct = _direct_roles(user_roles, role_loader)
+    if direct is None:
+        granted = _resolve_roles(user_roles, role_loader).issuperset(required)
+    elif len(required) == 1:
+        granted = required[0] in direct
+    else:
+        # 保持ロール側の集合は作らず、要求ロールの集合から保持しているものを取り除く
+        missing = set(required)
+        missing.difference_update(direct)
+        granted = not missing
+    metrics = _get_config().metrics
+    if metrics is not None:
+        metrics.record_check("has_all_roles", f"all of {required}", granted)
+    return granted
@@ -0,0 +1,170 @@
+"""streamlit-rbac の行・列レベルのデータフィルタ.
+
+ロール列の値に応じて行を、列ごとのルールに応じて列を絞り込む。
+pandas.DataFrame・pyarrow.Table はベクトル演算で処理し、
+どちらも利用できない場合は dict of lists として処理する。
+pandas / pyarrow は任意依存であり、利用者が渡したデータの型から判別するため
+このモジュールの読み込み時には import しない。
+"""
+
+from __future__ import annotations
+
+import functools
+import importlib
+import itertools
+import sys
+from collections.abc import Hashable, Iterable, Mapping
+from typing import TYPE_CHECKING, Any, TypeVar, cast
+
+from streamlit_rbac._config import _get_config
+from streamlit_rbac._core import _resolve_roles
+from streamlit_rbac._policy import Policy
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+    from streamlit_rbac._types import RoleLoader
+
+FrameT = TypeVar("FrameT")
+
+
+def _cell_allowed(cell: object, roles: frozenset[str]) -> bool:
+    """ロール列の1セルについて、表示してよいかを判定する.
+
+    セルには単一のロール名、またはロール名の集合を指定できる。
+    いずれかのロールを保持していれば表示する。空・欠損値は表示しない。
+    """
+    if isinstance(cell, str):
+        return cell in roles
+    if isinstance(cell, Iterable):
+        return any(isinstance(role, str) and role in roles for role in cell)
+    return False
+
+
+def _module(name: str) -> Any:
+    """import 済みの任意依存モジュールを返す. 未 import の場合は None."""
+    return sys.modules.get(name)
+
+
+class RoleDataFilter:
+    """ロールに応じて表形式データの行と列を絞り込むフィルタ.
+
+    role_column の各セルには、その行の閲覧に必要なロール (またはロールの集合)
+    を格納する。column_roles には列ごとの閲覧条件をロール名または Policy で
+    指定し、指定のない列は常に表示する。
+    表示列はロール集合と設定の世代ごとに一度だけ計算してキャッシュする。
+    """
+
+    def __init__(
+        self,
+        role_column: str,
+        *,
+        column_roles: Mapping[str, str | Policy] | None = None,
+        maxsize: int = 256,
+    ) -> None:
+        self.role_column = role_column
+        self._column_policies = {
+            column: Policy.any_of(rule) if isinstance(rule, str) else rule
+            for column, rule in (column_roles or {}).items()
+        }
+        self._visible_columns = functools.lru_cache(maxsize=maxsize)(
+            self._compute_visible_columns
+        )
+
+    def _compute_visible_columns(
+        self, columns: tuple[str, ...], roles: frozenset[str], _version: int
+    ) -> tuple[str, ...]:
+        policies = self._column_policies
+        return tuple(
+            column
+            for column in columns
+            if column not in policies or policies[column].evaluate(roles)
+        )
+
+    def visible_columns(
+        self, columns: Iterable[str], roles: frozenset[str]
+    ) -> tuple[str, ...]:
+        """解決済みのロール集合で表示できる列を返す."""
+        return self._visible_columns(tuple(columns), roles, _get_config().version)
+
+    def apply(
+        self,
+        data: FrameT,
+        *,
+        user_roles: Iterable[str] | None = None,
+        role_loader: RoleLoader | None = None,
+    ) -> FrameT:
+        """ロールに応じて行と列を絞り込んだデータを返す.
+
+        Raises:
+            KeyError: role_column がデータに存在しない場合.
+        """
+        roles = _resolve_roles(user_roles, role_loader)
+        pd = _module("pandas")
+        if pd is not None and isinstance(data, pd.DataFrame):
+            return cast("FrameT", self._apply_pandas(pd, data, roles))
+        pa = _module("pyarrow")
+        if pa is not None and isinstance(data, pa.Table):
+            return cast("FrameT", self._apply_arrow(pa, data, roles))
+        if isinstance(data, Mapping):
+            return cast("FrameT", self._apply_mapping(data, roles))
+        msg = f"Unsupported data type: {type(data).__name__}"
+        raise TypeError(msg)
+
+    def _apply_pandas(self, pd: Any, frame: Any, roles: frozenset[str]) -> Any:
+        import numpy as np  # noqa: PLC0415
+
+        column = frame[self.role_column]
+        try:
+            # 値を整数コードに変換し、異なる値ごとに一度だけ判定する
+            codes, uniques = pd.factorize(column)
+        except TypeError:
+            # list などハッシュ不可能なセルは展開して判定する
+            exploded = column.reset_index(drop=True).explode()
+            hits = exploded.isin(roles).groupby(level=0).any()
+            mask = hits.to_numpy(dtype=bool)
+        else:
+            allowed = np.fromiter(
+                (_cell_allowed(value, roles) for value in uniques),
+                dtype=bool,
+                count=len(uniques),
+            )
+            # 欠損値のコード -1 は末尾に追加した False を参照する
+            mask = np.append(allowed, False)[codes]
+        columns = self.visible_columns(frame.columns, roles)
+        return frame.loc[mask, list(columns)]
+
+    def _apply_arrow(self, pa: Any, table: Any, roles: frozenset[str]) -> Any:
+        import numpy as np  # noqa: PLC0415
+
+        pc = importlib.import_module("pyarrow.compute")
+        column = table.column(self.role_column).combine_chunks()
+        value_set = pa.array(sorted(roles), type=pa.string())
+        if pa.types.is_list(column.type) or pa.types.is_large_list(column.type):
+            hits = pc.fill_null(pc.is_in(pc.list_flatten(column), value_set), False)
+            parents = pc.list_parent_indices(column).to_numpy()
+            mask = np.zeros(len(column), dtype=bool)
+            mask[parents[hits.to_numpy(zero_copy_only=False)]] = True
+            row_mask = pa.array(mask)
+        else:
+            row_mask = pc.fill_null(pc.is_in(column, value_set), False)
+        columns = self.visible_columns(table.column_names, roles)
+        return table.filter(row_mask).select(list(columns))
+
+    def _apply_mapping(
+        self, data: Mapping[str, Sequence[Any]], roles: frozenset[str]
+    ) -> dict[str, list[Any]]:
+        decisions: dict[Hashable, bool] = {}
+        mask: list[bool] = []
+        for cell in data[self.role_column]:
+            if isinstance(cell, Hashable):
+                decision = decisions.get(cell)
+                if decision is None:
+                    decision = decisions[cell] = _cell_allowed(cell, roles)
+            else:
+                decision = _cell_allowed(cell, roles)
+            mask.append(decision)
+        columns = self.visible_columns(data.keys(), roles)
+        return {
+            column: list(itertools.compress(data[column], mask)) for column in columns
+        }
@@ -0,0 +1,82 @@
+"""streamlit-rbac の認可判定キャッシュ.
+
+(解決済みロール集合, ポリシー) ごとの判定結果を LRU 上限付きで保持する。
+ロール階層やパーミッションなどの設定が更新されると、
+キャッシュ済みの判定はすべて破棄される。
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from streamlit_rbac._cache import _StripedLRU
+from streamlit_rbac._config import _get_config, _update_config
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from streamlit_rbac._cache import CacheStats
+
+
+class DecisionCache:
+    """認可判定の結果をキャッシュする.
+
+    キーは解決済みロールの frozenset とポリシーの同一性の組であり、
+    frozenset のハッシュ値は一度計算されると再利用される。
+    エントリはキーのハッシュ値で複数のロックへ分散される。
+    set_decision_cache で登録すると、Policy.evaluate を経由する
+    すべての判定 (require_roles・authorize_page など) で使われる。
+
+    Raises:
+        ValueError: maxsize が正の値でない場合.
+    """
+
+    def __init__(self, *, maxsize: int = 4096) -> None:
+        if maxsize <= 0:
+            msg = "maxsize must be positive."
+            raise ValueError(msg)
+        # 値には設定の世代と判定結果を保持し、古い世代の判定は参照しない
+        self._entries: _StripedLRU[tuple[frozenset[str], object], tuple[int, bool]] = (
+            _StripedLRU(maxsize)
+        )
+        self._version = _get_config().version
+
+    def decide(
+        self,
+        policy: object,
+        roles: frozenset[str],
+        evaluate: Callable[[frozenset[str]], bool],
+    ) -> bool:
+        """キャッシュ済みの判定を返す. 未キャッシュなら evaluate で判定して保持する."""
+        key = (roles, policy)
+        version = _get_config().version
+        if version != self._version:
+            self._version = version
+            self._entries.clear()
+        entry = self._entries.get(key, lambda cached: cached[0] == version)
+        if entry is not None:
+            return entry[1]
+
+        # 判定中はロックを保持しない
+        decision = evaluate(roles)
+        self._entries.put(key, (version, decision))
+        return decision
+
+    def clear(self) -> None:
+        """すべての判定を破棄する. 統計情報は保持する."""
+        self._entries.clear()
+
+    @property
+    def stats(self) -> CacheStats:
+        """現在の統計情報を返す."""
+        return self._entries.stats()
+
+
+def set_decision_cache(cache: DecisionCache | None) -> None:
+    """すべての判定で使う判定キャッシュを登録する. None で解除する."""
+    _update_config(decision_cache=cache)
+
+
+def get_decision_cache() -> DecisionCache | None:
+    """登録済みの判定キャッシュを返す."""
+    return _get_config().decision_cache
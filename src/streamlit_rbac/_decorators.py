@@ -3,44 +3,126 @@
 from __future__ import annotations
 
 import functools
-from typing import TYPE_CHECKING, ParamSpec, TypeVar
+import inspect
+from typing import TYPE_CHECKING, Any, ParamSpec, TypeVar, cast
 
-from streamlit_rbac._core import has_any_role
+from streamlit_rbac._async import _load_roles_async
+from streamlit_rbac._config import _get_config
+from streamlit_rbac._core import (
+    _as_role_set,
+    _check_role_source,
+    _expand_roles,
+    _load_roles,
+)
+from streamlit_rbac._permissions import permission_policy
+from streamlit_rbac._policy import _to_policy
 
 if TYPE_CHECKING:
-    from collections.abc import Callable, Iterable
+    from collections.abc import Awaitable, Callable, Iterable
 
-    from streamlit_rbac._types import OnDeniedHandler, RoleLoader
+    from streamlit_rbac._policy import Policy
+    from streamlit_rbac._types import AsyncRoleLoader, OnDeniedHandler, RoleLoader
 
 P = ParamSpec("P")
 R = TypeVar("R")
 
 
 def require_roles(
-    *allowed_roles: str,
+    *allowed_roles: str | Policy,
     user_roles: Iterable[str] | None = None,
-    role_loader: RoleLoader | None = None,
+    role_loader: RoleLoader | AsyncRoleLoader | None = None,
     on_denied: OnDeniedHandler | None = None,
 ) -> Callable[[Callable[P, R]], Callable[P, R]]:
-    """関数実行前にロールチェックを行うデコレータ."""
-    if not allowed_roles:
-        msg = "allowed_roles must not be empty."
-        raise ValueError(msg)
+    """関数実行前にロールチェックを行うデコレータ.
+
+    ポリシーはデコレート時に一度だけコンパイルする。
+    user_roles が指定された場合は最初の呼び出しで判定し、その結果を
+    ロール階層・パーミッションなどの設定が更新されるまで再利用する。
+    async def の関数には await するラッパーを返し、
+    その場合は async def のロールローダーも使用できる。
+    """
+    policy = _to_policy(allowed_roles)
+    _check_role_source(user_roles, role_loader)
+    raw_roles = _as_role_set(user_roles) if user_roles is not None else None
+    # user_roles による判定結果を、設定の世代と展開済みのロールとともに保持する
+    static: tuple[int, frozenset[str], bool] | None = None
+    evaluate = policy.evaluate
+
+    def static_decision(roles: frozenset[str]) -> tuple[frozenset[str], bool]:
+        nonlocal static
+        version = _get_config().version
+        if static is None or static[0] != version:
+            expanded = _expand_roles(roles)
+            static = (version, expanded, evaluate(expanded))
+        return static[1], static[2]
+
+    def check(target: str, roles: frozenset[str], granted: bool) -> None:
+        config = _get_config()
+        if config.metrics is not None:
+            config.metrics.record_check("require_roles", policy.description, granted)
+        if config.audit is not None:
+            config.audit.record("require_roles", target, policy, roles, granted)
+        if granted:
+            return
+        if on_denied is not None:
+            on_denied()
+        msg = f"Access denied: required {policy.description}"
+        raise PermissionError(msg)
 
     def decorator(func: Callable[P, R]) -> Callable[P, R]:
+        target = f"{func.__module__}.{func.__qualname__}"
+        if inspect.iscoroutinefunction(func):
+            async_func = cast("Callable[P, Awaitable[Any]]", func)
+
+            @functools.wraps(func)
+            async def async_wrapper(*args: P.args, **kwargs: P.kwargs) -> Any:
+                if raw_roles is not None:
+                    check(target, *static_decision(raw_roles))
+                else:
+                    loader = cast("RoleLoader | AsyncRoleLoader", role_loader)
+                    roles = await _load_roles_async(loader)
+                    check(target, roles, evaluate(roles))
+                return await async_func(*args, **kwargs)
+
+            return cast("Callable[P, R]", async_wrapper)
+
+        if raw_roles is not None:
+            static_roles = raw_roles
+
+            @functools.wraps(func)
+            def static_wrapper(*args: P.args, **kwargs: P.kwargs) -> R:
+                check(target, *static_decision(static_roles))
+                return func(*args, **kwargs)
+
+            return static_wrapper
+
+        if inspect.iscoroutinefunction(role_loader):
+            msg = "An async role_loader can only guard async functions."
+            raise TypeError(msg)
+        loader = cast("RoleLoader", role_loader)
+
         @functools.wraps(func)
         def wrapper(*args: P.args, **kwargs: P.kwargs) -> R:
-            if not has_any_role(
-                *allowed_roles,
-                user_roles=user_roles,
-                role_loader=role_loader,
-            ):
-                if on_denied is not None:
-                    on_denied()
-                msg = f"Access denied: required one of {allowed_roles}"
-                raise PermissionError(msg)
+            roles = _load_roles(loader)
+            check(target, roles, evaluate(roles))
             return func(*args, **kwargs)
 
         return wrapper
 
     return decorator
+
+
+def require_permission(
+    permission: str,
+    *,
+    user_roles: Iterable[str] | None = None,
+    role_loader: RoleLoader | AsyncRoleLoader | None = None,
+    on_denied: OnDeniedHandler | None = None,
+) -> Callable[[Callable[P, R]], Callable[P, R]]:
+    """関数実行前にパーミッションチェックを行うデコレータ."""
+    return require_roles(
+        permission_policy(permission),
+        user_roles=user_roles,
+        role_loader=role_loader,
+        on_denied=on_denied,
+    )
@@ -0,0 +1,128 @@
+"""streamlit-rbac のポリシー式.
+
+`Admin or (Manager and not Contractor)` のような論理式を構文解析し、
+Policy にコンパイルする。同じ式の構文解析結果はキャッシュされる。
+
+文法::
+
+    expr  := term ("or" term)*
+    term  := factor ("and" factor)*
+    factor := "not" factor | "(" expr ")" | ROLE
+
+ROLE は空白と括弧を含まない語、または引用符で囲んだ文字列である。
+"""
+
+from __future__ import annotations
+
+import functools
+import re
+
+from streamlit_rbac._policy import Policy
+
+_TOKEN = re.compile(r"""\s*(?:([()])|"([^"]*)"|'([^']*)'|([^\s()"']+))""")
+_KEYWORDS = frozenset({"and", "or", "not"})
+
+
+def _tokenize(expression: str) -> list[tuple[str, str, int]]:
+    """式を (種別, 値, 位置) のトークン列に分割する.
+
+    Raises:
+        ValueError: 閉じていない引用符がある場合.
+    """
+    tokens: list[tuple[str, str, int]] = []
+    position = 0
+    end = len(expression.rstrip())
+    while position < end:
+        match = _TOKEN.match(expression, position)
+        if match is None:
+            msg = f"Unterminated quote at position {position}: {expression!r}"
+            raise ValueError(msg)
+        paren, double, single, word = match.groups()
+        start = match.start(match.lastindex or 0)
+        if paren is not None:
+            tokens.append((paren, paren, start))
+        elif word is not None and word in _KEYWORDS:
+            tokens.append((word, word, start))
+        else:
+            role = next(value for value in (double, single, word) if value is not None)
+            tokens.append(("role", role, start))
+        position = match.end()
+    return tokens
+
+
+class _Parser:
+    """トークン列を Policy に変換する再帰下降パーサ."""
+
+    def __init__(self, expression: str) -> None:
+        self._expression = expression
+        self._tokens = _tokenize(expression)
+        self._index = 0
+
+    def _peek(self) -> str | None:
+        if self._index < len(self._tokens):
+            return self._tokens[self._index][0]
+        return None
+
+    def _error(self, expected: str) -> ValueError:
+        if self._index < len(self._tokens):
+            _, value, position = self._tokens[self._index]
+            found = f"{value!r} at position {position}"
+        else:
+            found = "end of expression"
+        return ValueError(
+            f"Invalid policy expression {self._expression!r}: "
+            f"expected {expected}, found {found}"
+        )
+
+    def parse(self) -> Policy:
+        policy = self._expr()
+        if self._peek() is not None:
+            raise self._error("'and', 'or' or end of expression")
+        return policy
+
+    def _expr(self) -> Policy:
+        policy = self._term()
+        while self._peek() == "or":
+            self._index += 1
+            policy |= self._term()
+        return policy
+
+    def _term(self) -> Policy:
+        policy = self._factor()
+        while self._peek() == "and":
+            self._index += 1
+            policy &= self._factor()
+        return policy
+
+    def _factor(self) -> Policy:
+        kind = self._peek()
+        if kind == "not":
+            self._index += 1
+            return ~self._factor()
+        if kind == "(":
+            self._index += 1
+            policy = self._expr()
+            if self._peek() != ")":
+                raise self._error("')'")
+            self._index += 1
+            return policy
+        if kind == "role":
+            role = self._tokens[self._index][1]
+            self._index += 1
+            return Policy.any_of(role)
+        raise self._error("a role name, 'not' or '('")
+
+
+@functools.lru_cache(maxsize=256)
+def parse_policy(expression: str) -> Policy:
+    """ポリシー式を構文解析し、コンパイル済みの Policy を返す.
+
+    and / or は短絡評価される。結果は式の文字列をキーにキャッシュされる。
+    返される Policy は require_roles・authorize_page にそのまま渡せる。
+
+    Raises:
+        ValueError: 式の構文が正しくない場合.
+    """
+    policy = _Parser(expression).parse()
+    policy.description = expression.strip()
+    return policy
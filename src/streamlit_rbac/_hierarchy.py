@@ -0,0 +1,89 @@
+"""streamlit-rbac のロール階層.
+
+上位ロールが下位ロールを包含する宣言的な階層を定義する。
+推移閉包は登録時に一度だけ計算し、判定時にはグラフを辿らない。
+ロール集合ごとの展開結果はロックを取らずに参照できる dict に保持する。
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from streamlit_rbac._config import _get_config, _update_config
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Mapping
+
+# 展開結果を保持するロール集合の数の上限
+_EXPAND_CACHE_SIZE = 1024
+
+
+class RoleHierarchy:
+    """ロール階層と、その推移閉包.
+
+    inherits には「ロール → そのロールが包含する下位ロール」を指定する。
+    1つのロールが複数の上位ロールに含まれてもよい。
+
+    Raises:
+        ValueError: 階層に循環がある場合.
+    """
+
+    def __init__(self, inherits: Mapping[str, Iterable[str]]) -> None:
+        graph = {role: tuple(children) for role, children in inherits.items()}
+        closure: dict[str, frozenset[str]] = {}
+
+        def visit(role: str, path: tuple[str, ...]) -> frozenset[str]:
+            if role in path:
+                cycle = " -> ".join((*path[path.index(role) :], role))
+                msg = f"Cycle detected in role hierarchy: {cycle}"
+                raise ValueError(msg)
+            cached = closure.get(role)
+            if cached is not None:
+                return cached
+            implied = {role}
+            for child in graph.get(role, ()):
+                implied |= visit(child, (*path, role))
+            closure[role] = frozenset(implied)
+            return closure[role]
+
+        for role in graph:
+            visit(role, ())
+        self._closure = closure
+        # 判定のたびに全スレッドから参照されるため、ロックを取らない dict で保持する.
+        # 上限に達したら丸ごと破棄する
+        self._expanded: dict[frozenset[str], frozenset[str]] = {}
+
+    def implied(self, role: str) -> frozenset[str]:
+        """指定ロールが包含するロール (自身を含む) を返す."""
+        return self._closure.get(role, frozenset((role,)))
+
+    def _expand(self, roles: frozenset[str]) -> frozenset[str]:
+        expanded = self._expanded.get(roles)
+        if expanded is None:
+            if len(self._expanded) >= _EXPAND_CACHE_SIZE:
+                self._expanded.clear()
+            expanded = self._expanded[roles] = self._compute_expand(roles)
+        return expanded
+
+    def _compute_expand(self, roles: frozenset[str]) -> frozenset[str]:
+        closure = self._closure
+        expanded = set(roles)
+        for role in roles:
+            implied = closure.get(role)
+            if implied is not None:
+                expanded |= implied
+        return roles if len(expanded) == len(roles) else frozenset(expanded)
+
+    def expand(self, roles: Iterable[str]) -> frozenset[str]:
+        """ロール集合を、包含される下位ロールを含む実効ロール集合に展開する."""
+        return self._expand(frozenset(roles))
+
+
+def set_role_hierarchy(hierarchy: RoleHierarchy | None) -> None:
+    """すべての判定で使うロール階層を登録する. None で解除する."""
+    _update_config(hierarchy=hierarchy)
+
+
+def get_role_hierarchy() -> RoleHierarchy | None:
+    """登録済みのロール階層を返す."""
+    return _get_config().hierarchy
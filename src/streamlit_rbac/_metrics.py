@@ -0,0 +1,254 @@
+"""streamlit-rbac の計測フック.
+
+判定の回数・許可・拒否、ロールローダーの所要時間を計測フックへ通知する。
+フックが登録されていない場合、判定のたびに行うのは設定の参照1回のみである。
+組み込みの MetricsAggregator はプロセス内で集計し、
+Prometheus のテキスト形式または dict として出力する。
+すべての機能は標準ライブラリのみに依存する。
+"""
+
+from __future__ import annotations
+
+import bisect
+import itertools
+import threading
+from typing import TYPE_CHECKING, Any, Protocol
+
+from streamlit_rbac._config import _get_config, _update_config
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+    from streamlit_rbac._cache import CacheStats
+
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0)
+"""ローダー所要時間のヒストグラムの既定の境界値 (秒)."""
+
+# 集計を分割するストライプの数
+_STRIPES = 16
+
+# (メトリクス名, 種別, 説明, CacheStats の属性)
+_CACHE_METRICS = (
+    ("hits_total", "counter", "Cache hits.", "hits"),
+    ("misses_total", "counter", "Cache misses.", "misses"),
+    ("evictions_total", "counter", "Cache evictions.", "evictions"),
+    ("size", "gauge", "Cached entries.", "size"),
+    ("hit_ratio", "gauge", "Cache hit ratio.", "hit_rate"),
+)
+
+
+class MetricsHook(Protocol):
+    """判定とロール解決の通知を受け取る計測フック."""
+
+    def record_check(self, source: str, policy: str, granted: bool) -> None:
+        """1回の判定結果を受け取る.
+
+        source は判定を行った API 名、policy はポリシーの説明である。
+        """
+
+    def record_load(self, loader: str, seconds: float) -> None:
+        """1回のロールローダー呼び出しの所要時間を受け取る. 例外時も通知される."""
+
+
+class _CacheSource(Protocol):
+    @property
+    def stats(self) -> CacheStats: ...
+
+
+class _LoadStats:
+    """ローダーごとの呼び出し回数・合計時間・バケットごとの件数."""
+
+    __slots__ = ("buckets", "count", "seconds")
+
+    def __init__(self, size: int) -> None:
+        self.count = 0
+        self.seconds = 0.0
+        self.buckets = [0] * size
+
+
+class _MetricsStripe:
+    """ロックと集計を共有する計測の分割単位."""
+
+    __slots__ = ("checks", "loads", "lock")
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.checks: dict[tuple[str, str], list[int]] = {}
+        self.loads: dict[str, _LoadStats] = {}
+
+
+def _escape(value: str) -> str:
+    """Prometheus のラベル値をエスケープする."""
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class MetricsAggregator:
+    """判定回数とローダー所要時間をプロセス内で集計する計測フック.
+
+    watch_cache で登録したキャッシュと、登録済みの DecisionCache の
+    ヒット率も出力に含める。
+    集計はスレッドごとに割り当てた複数のストライプに分割して行うため、
+    異なるセッションのスレッドからの同時の記録は互いを待たない。
+
+    Raises:
+        ValueError: buckets が空、または昇順でない場合.
+    """
+
+    def __init__(self, *, buckets: Sequence[float] = DEFAULT_BUCKETS) -> None:
+        if not buckets or list(buckets) != sorted(set(buckets)):
+            msg = "buckets must be a non-empty increasing sequence."
+            raise ValueError(msg)
+        self._buckets = tuple(buckets)
+        self._stripes = tuple(_MetricsStripe() for _ in range(_STRIPES))
+        self._next_stripe = itertools.count()
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._caches: dict[str, _CacheSource] = {}
+
+    def _stripe(self) -> _MetricsStripe:
+        """現在のスレッドのストライプを返す. スレッドごとに順番に割り当てる."""
+        try:
+            stripe: _MetricsStripe = self._local.stripe
+        except AttributeError:
+            index = next(self._next_stripe) % len(self._stripes)
+            stripe = self._local.stripe = self._stripes[index]
+        return stripe
+
+    def record_check(self, source: str, policy: str, granted: bool) -> None:
+        """判定結果を (source, policy) ごとに数える."""
+        stripe = self._stripe()
+        with stripe.lock:
+            counts = stripe.checks.get((source, policy))
+            if counts is None:
+                counts = stripe.checks[source, policy] = [0, 0]
+            counts[not granted] += 1
+
+    def record_load(self, loader: str, seconds: float) -> None:
+        """ローダーの所要時間をヒストグラムに加える."""
+        index = bisect.bisect_left(self._buckets, seconds)
+        stripe = self._stripe()
+        with stripe.lock:
+            entry = stripe.loads.get(loader)
+            if entry is None:
+                entry = stripe.loads[loader] = _LoadStats(len(self._buckets))
+            entry.count += 1
+            entry.seconds += seconds
+            if index < len(self._buckets):
+                entry.buckets[index] += 1
+
+    def _merged(self) -> tuple[dict[tuple[str, str], list[int]], dict[str, _LoadStats]]:
+        """全ストライプの集計を合算して返す."""
+        checks: dict[tuple[str, str], list[int]] = {}
+        loads: dict[str, _LoadStats] = {}
+        for stripe in self._stripes:
+            with stripe.lock:
+                for key, (granted, denied) in stripe.checks.items():
+                    counts = checks.setdefault(key, [0, 0])
+                    counts[0] += granted
+                    counts[1] += denied
+                for name, entry in stripe.loads.items():
+                    total = loads.get(name)
+                    if total is None:
+                        total = loads[name] = _LoadStats(len(self._buckets))
+                    total.count += entry.count
+                    total.seconds += entry.seconds
+                    for index, bucket in enumerate(entry.buckets):
+                        total.buckets[index] += bucket
+        return checks, loads
+
+    def watch_cache(self, name: str, cache: _CacheSource) -> None:
+        """stats プロパティを持つキャッシュを name で出力に含める."""
+        with self._lock:
+            self._caches[name] = cache
+
+    def reset(self) -> None:
+        """判定回数とローダーの集計を破棄する. 登録済みのキャッシュは保持する."""
+        for stripe in self._stripes:
+            with stripe.lock:
+                stripe.checks.clear()
+                stripe.loads.clear()
+
+    def _cache_stats(self) -> dict[str, CacheStats]:
+        with self._lock:
+            caches = dict(self._caches)
+        decision_cache = _get_config().decision_cache
+        if decision_cache is not None:
+            caches.setdefault("decision_cache", decision_cache)
+        return {name: cache.stats for name, cache in caches.items()}
+
+    def snapshot(self) -> dict[str, Any]:
+        """現在の集計を dict で返す.
+
+        checks は source → policy → {"granted", "denied"}、
+        loaders はローダー名 → {"count", "seconds"}、
+        caches はキャッシュ名 → {"hits", "misses", "evictions", "size", "hit_rate"}。
+        """
+        merged_checks, merged_loads = self._merged()
+        checks: dict[str, dict[str, dict[str, int]]] = {}
+        for (source, policy), (granted, denied) in merged_checks.items():
+            checks.setdefault(source, {})[policy] = {
+                "granted": granted,
+                "denied": denied,
+            }
+        loaders = {
+            name: {"count": entry.count, "seconds": entry.seconds}
+            for name, entry in merged_loads.items()
+        }
+        caches = {
+            name: {field: getattr(stats, field) for *_, field in _CACHE_METRICS}
+            for name, stats in self._cache_stats().items()
+        }
+        return {"checks": checks, "loaders": loaders, "caches": caches}
+
+    def prometheus(self) -> str:
+        """現在の集計を Prometheus のテキスト形式で返す."""
+        lines = [
+            "# HELP streamlit_rbac_checks_total Authorization checks by result.",
+            "# TYPE streamlit_rbac_checks_total counter",
+        ]
+        checks, loads = self._merged()
+        for (source, policy), counts in sorted(checks.items()):
+            labels = f'source="{_escape(source)}",policy="{_escape(policy)}"'
+            for result, count in zip(("granted", "denied"), counts, strict=True):
+                lines.append(
+                    f'streamlit_rbac_checks_total{{{labels},result="{result}"}} {count}'
+                )
+        lines += [
+            "# HELP streamlit_rbac_loader_seconds Role loader call duration.",
+            "# TYPE streamlit_rbac_loader_seconds histogram",
+        ]
+        for name, entry in sorted(loads.items()):
+            label = f'loader="{_escape(name)}"'
+            cumulative = 0
+            for bound, bucket in zip(self._buckets, entry.buckets, strict=True):
+                cumulative += bucket
+                lines.append(
+                    f'streamlit_rbac_loader_seconds_bucket{{{label},le="{bound}"}} {cumulative}'
+                )
+            lines += [
+                f'streamlit_rbac_loader_seconds_bucket{{{label},le="+Inf"}} {entry.count}',
+                f"streamlit_rbac_loader_seconds_sum{{{label}}} {entry.seconds}",
+                f"streamlit_rbac_loader_seconds_count{{{label}}} {entry.count}",
+            ]
+        stats = sorted(self._cache_stats().items())
+        for metric, kind, help_text, field in _CACHE_METRICS:
+            lines += [
+                f"# HELP streamlit_rbac_cache_{metric} {help_text}",
+                f"# TYPE streamlit_rbac_cache_{metric} {kind}",
+            ]
+            lines.extend(
+                f'streamlit_rbac_cache_{metric}{{cache="{_escape(name)}"}} '
+                f"{getattr(cache_stats, field)}"
+                for name, cache_stats in stats
+            )
+        return "\n".join(lines) + "\n"
+
+
+def set_metrics_hook(hook: MetricsHook | None) -> None:
+    """判定とロールローダー呼び出しを通知する計測フックを登録する. None で解除する."""
+    _update_config(metrics=hook)
+
+
+def get_metrics_hook() -> MetricsHook | None:
+    """登録済みの計測フックを返す."""
+    return _get_config().metrics
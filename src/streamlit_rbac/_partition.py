@@ -0,0 +1,178 @@
+"""streamlit-rbac のロール単位で分割されたデータキャッシュ.
+
+キャッシュキーに解決済みロール集合のフィンガープリントを含めることで、
+実効ロールが同じユーザー同士は結果を共有し、
+実効ロールが異なるユーザー同士のエントリは衝突しない。
+すべての機能は標準ライブラリのみに依存する。
+"""
+
+from __future__ import annotations
+
+import functools
+import hashlib
+import json
+import threading
+import time
+from collections import Counter, OrderedDict
+from typing import TYPE_CHECKING, Generic, ParamSpec, TypeVar
+
+from streamlit_rbac._cache import CacheStats
+from streamlit_rbac._core import _as_role_set, _expand_roles, _resolve_roles
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Hashable, Iterable
+
+    from streamlit_rbac._types import RoleLoader
+
+P = ParamSpec("P")
+R = TypeVar("R")
+
+
+def role_fingerprint(roles: Iterable[str]) -> str:
+    """ロール集合の正規化されたフィンガープリントを返す.
+
+    順序や重複に依存せず、同じ集合には常に同じ値を返す。
+    """
+    canonical = json.dumps(sorted(set(roles)), ensure_ascii=False)
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+class RolePartitionedCache(Generic[P, R]):
+    """解決済みロール集合ごとに結果を分割してキャッシュする関数ラッパー.
+
+    role_partitioned_cache デコレータが返す。キーは
+    (ロールのフィンガープリント, 引数) であり、引数はハッシュ可能である必要がある。
+    ttl と maxsize はすべてのパーティションを合わせたエントリに適用される。
+    関数の実行中に invalidate や clear が呼ばれた場合、その結果は保存しない。
+
+    Raises:
+        ValueError: ttl または maxsize が正の値でない場合.
+    """
+
+    def __init__(
+        self,
+        func: Callable[P, R],
+        *,
+        role_loader: RoleLoader,
+        ttl: float = 300.0,
+        maxsize: int = 128,
+        timer: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if ttl <= 0:
+            msg = "ttl must be positive."
+            raise ValueError(msg)
+        if maxsize <= 0:
+            msg = "maxsize must be positive."
+            raise ValueError(msg)
+        functools.update_wrapper(self, func)
+        self._func = func
+        self._role_loader = role_loader
+        self._ttl = ttl
+        self._maxsize = maxsize
+        self._timer = timer
+        self._entries: OrderedDict[tuple[str, Hashable], tuple[float, R]] = (
+            OrderedDict()
+        )
+        self._partitions: Counter[str] = Counter()
+        self._fingerprints = functools.lru_cache(maxsize=maxsize)(role_fingerprint)
+        self._lock = threading.Lock()
+        # invalidate・clear のたびに進め、実行中だった関数の結果の保存を取り消す
+        self._generation = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def __call__(self, *args: P.args, **kwargs: P.kwargs) -> R:
+        """現在のユーザーのロール集合のパーティションから結果を返す."""
+        roles = _resolve_roles(None, self._role_loader)
+        key = (self._fingerprints(roles), (args, tuple(sorted(kwargs.items()))))
+        now = self._timer()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > now:
+                self._entries.move_to_end(key)
+                self._hits += 1
+                return entry[1]
+            self._misses += 1
+            generation = self._generation
+
+        # 関数の実行中はロックを保持しない
+        value = self._func(*args, **kwargs)
+
+        with self._lock:
+            if generation != self._generation:
+                return value
+            if key not in self._entries:
+                self._partitions[key[0]] += 1
+            self._entries[key] = (now + self._ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._maxsize:
+                (fingerprint, _), _ = self._entries.popitem(last=False)
+                self._discard(fingerprint)
+                self._evictions += 1
+        return value
+
+    def _discard(self, fingerprint: str) -> None:
+        """パーティションのエントリ数を1つ減らす. ロックを保持して呼び出す."""
+        self._partitions[fingerprint] -= 1
+        if not self._partitions[fingerprint]:
+            del self._partitions[fingerprint]
+
+    def invalidate(self, roles: Iterable[str]) -> None:
+        """指定されたロール集合のパーティションを破棄する.
+
+        エントリは実効ロールで分割されているため、roles もロール階層に従って展開する。
+        """
+        fingerprint = role_fingerprint(_expand_roles(_as_role_set(roles)))
+        with self._lock:
+            self._generation += 1
+            for key in [key for key in self._entries if key[0] == fingerprint]:
+                del self._entries[key]
+            self._partitions.pop(fingerprint, None)
+
+    def clear(self) -> None:
+        """すべてのキャッシュを破棄する. 統計情報は保持する."""
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+            self._partitions.clear()
+
+    @property
+    def partition_sizes(self) -> dict[str, int]:
+        """フィンガープリントごとのエントリ数を返す."""
+        with self._lock:
+            return dict(self._partitions)
+
+    @property
+    def stats(self) -> CacheStats:
+        """現在の統計情報を返す."""
+        with self._lock:
+            return CacheStats(
+                hits=self._hits,
+                misses=self._misses,
+                evictions=self._evictions,
+                size=len(self._entries),
+            )
+
+
+def role_partitioned_cache(
+    *,
+    role_loader: RoleLoader,
+    ttl: float = 300.0,
+    maxsize: int = 128,
+    timer: Callable[[], float] = time.monotonic,
+) -> Callable[[Callable[P, R]], RolePartitionedCache[P, R]]:
+    """関数の結果を実効ロール集合ごとにキャッシュするデコレータ.
+
+    ロールは呼び出しのたびに role_loader から解決し、
+    ロール階層が登録されている場合は展開後の集合で分割する。
+    ユーザー単位のキャッシュよりヒット率が高く、
+    キーにロールを含めないキャッシュと異なりロール間でデータが漏れない。
+    """
+
+    def decorator(func: Callable[P, R]) -> RolePartitionedCache[P, R]:
+        return RolePartitionedCache(
+            func, role_loader=role_loader, ttl=ttl, maxsize=maxsize, timer=timer
+        )
+
+    return decorator
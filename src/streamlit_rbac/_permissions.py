@@ -0,0 +1,116 @@
+"""streamlit-rbac のパーミッション.
+
+ロールが付与するパーミッション ("member:delete" など) を定義し、
+パーミッション → ロールの転置インデックスで判定する。
+"""
+
+from __future__ import annotations
+
+import functools
+from typing import TYPE_CHECKING
+
+from streamlit_rbac._config import _get_config, _update_config
+from streamlit_rbac._core import _resolve_roles
+from streamlit_rbac._policy import Policy
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Mapping
+
+    from streamlit_rbac._types import RoleLoader
+
+
+class PermissionMap:
+    """ロール → パーミッションの対応と、その転置インデックス.
+
+    インデックスは生成時に一度だけ構築する。ロール階層は判定時の
+    ロール解決で展開されるため、grants には各ロールに直接付与する
+    パーミッションのみを指定すればよい。
+    """
+
+    def __init__(self, grants: Mapping[str, Iterable[str]]) -> None:
+        index: dict[str, set[str]] = {}
+        for role, permissions in grants.items():
+            for permission in permissions:
+                index.setdefault(permission, set()).add(role)
+        self._index = {
+            permission: frozenset(roles) for permission, roles in index.items()
+        }
+
+    @property
+    def permissions(self) -> frozenset[str]:
+        """定義済みのパーミッション."""
+        return frozenset(self._index)
+
+    def roles_for(self, permission: str) -> frozenset[str]:
+        """パーミッションを付与するロールを返す. 未定義の場合は空集合."""
+        return self._index.get(permission, frozenset())
+
+    def permissions_for(self, roles: Iterable[str]) -> frozenset[str]:
+        """ロール集合が保持するパーミッションを返す."""
+        held = frozenset(roles)
+        return frozenset(
+            permission
+            for permission, granted in self._index.items()
+            if not held.isdisjoint(granted)
+        )
+
+    def grants(self, permission: str, roles: frozenset[str]) -> bool:
+        """解決済みのロール集合がパーミッションを保持しているかを判定する."""
+        granted = self._index.get(permission)
+        return granted is not None and not roles.isdisjoint(granted)
+
+
+def set_permission_map(permissions: PermissionMap | None) -> None:
+    """すべての判定で使うパーミッション定義を登録する. None で解除する."""
+    _update_config(permissions=permissions)
+
+
+def get_permission_map() -> PermissionMap | None:
+    """登録済みのパーミッション定義を返す."""
+    return _get_config().permissions
+
+
+def _current_permission_map() -> PermissionMap:
+    """登録済みのパーミッション定義を返す内部関数.
+
+    Raises:
+        RuntimeError: パーミッション定義が登録されていない場合.
+    """
+    permissions = _get_config().permissions
+    if permissions is None:
+        msg = "No PermissionMap is registered. Call set_permission_map() first."
+        raise RuntimeError(msg)
+    return permissions
+
+
+def permission_policy(permission: str) -> Policy:
+    """パーミッションを要求するポリシーを返す.
+
+    登録済みのパーミッション定義は判定のたびに参照するため、
+    定義の差し替えはポリシー生成後にも反映される。
+    同じパーミッションには同じポリシーを返すため、判定キャッシュを共有できる。
+    """
+    return _permission_policy(permission)
+
+
+@functools.lru_cache(maxsize=1024)
+def _permission_policy(permission: str) -> Policy:
+    return Policy(
+        lambda resolved: _current_permission_map().grants(permission, resolved),
+        description=f"permission {permission!r}",
+    )
+
+
+def has_permission(
+    permission: str,
+    *,
+    user_roles: Iterable[str] | None = None,
+    role_loader: RoleLoader | None = None,
+) -> bool:
+    """指定されたパーミッションを保持しているかを判定する."""
+    permissions = _current_permission_map()
+    granted = permissions.grants(permission, _resolve_roles(user_roles, role_loader))
+    metrics = _get_config().metrics
+    if metrics is not None:
+        metrics.record_check("has_permission", f"permission {permission!r}", granted)
+    return granted
@@ -0,0 +1,146 @@
+"""streamlit-rbac の認可ポリシー.
+
+any / all / none-of の判定を生成時に一度だけコンパイルし、
+require_roles・authorize_page・Policy.allows から再利用できるようにする。
+"""
+
+from __future__ import annotations
+
+import functools
+from typing import TYPE_CHECKING
+
+from streamlit_rbac._config import _get_config
+from streamlit_rbac._core import _resolve_roles
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable
+
+    from streamlit_rbac._types import RoleLoader
+
+
+class Policy:
+    """コンパイル済みの認可ポリシー.
+
+    判定関数は生成時に確定し、評価時には解決済みロール集合に対する
+    集合演算のみを行う。`&` / `|` / `~` で合成できる。
+    """
+
+    __slots__ = ("_evaluate", "description", "roles")
+
+    def __init__(
+        self,
+        evaluate: Callable[[frozenset[str]], bool],
+        *,
+        description: str,
+        roles: Iterable[str] = (),
+    ) -> None:
+        self._evaluate = evaluate
+        self.description = description
+        """判定内容の説明. 拒否時のメッセージに使われる."""
+        self.roles: frozenset[str] = frozenset(roles)
+        """判定で参照されるロール名."""
+
+    @classmethod
+    def any_of(cls, *roles: str) -> Policy:
+        """指定されたロールのいずれかを要求するポリシー. 空の場合は常に拒否."""
+        required = frozenset(roles)
+        evaluate: Callable[[frozenset[str]], bool]
+        if len(required) == 1:
+            (role,) = required
+            evaluate = lambda resolved: role in resolved  # noqa: E731
+        else:
+            evaluate = lambda resolved: not resolved.isdisjoint(required)  # noqa: E731
+        return cls(evaluate, description=f"one of {roles}", roles=required)
+
+    @classmethod
+    def all_of(cls, *roles: str) -> Policy:
+        """指定されたロールのすべてを要求するポリシー. 空の場合は常に許可."""
+        required = frozenset(roles)
+        return cls(required.issubset, description=f"all of {roles}", roles=required)
+
+    @classmethod
+    def none_of(cls, *roles: str) -> Policy:
+        """指定されたロールをいずれも保持していないことを要求するポリシー."""
+        excluded = frozenset(roles)
+        return cls(excluded.isdisjoint, description=f"none of {roles}", roles=excluded)
+
+    def evaluate(self, roles: frozenset[str]) -> bool:
+        """解決済みのロール集合に対して判定する.
+
+        判定キャッシュが登録されている場合はキャッシュ済みの結果を返す。
+        """
+        cache = _get_config().decision_cache
+        if cache is None:
+            return self._evaluate(roles)
+        return cache.decide(self, roles, self._evaluate)
+
+    def allows(
+        self,
+        *,
+        user_roles: Iterable[str] | None = None,
+        role_loader: RoleLoader | None = None,
+    ) -> bool:
+        """has_role 等と同じ引数規約でロールを解決して判定する."""
+        granted = self.evaluate(_resolve_roles(user_roles, role_loader))
+        metrics = _get_config().metrics
+        if metrics is not None:
+            metrics.record_check("Policy.allows", self.description, granted)
+        return granted
+
+    def __and__(self, other: Policy) -> Policy:
+        left, right = self._evaluate, other._evaluate
+        return Policy(
+            lambda resolved: left(resolved) and right(resolved),
+            description=f"({self.description} and {other.description})",
+            roles=self.roles | other.roles,
+        )
+
+    def __or__(self, other: Policy) -> Policy:
+        left, right = self._evaluate, other._evaluate
+        return Policy(
+            lambda resolved: left(resolved) or right(resolved),
+            description=f"({self.description} or {other.description})",
+            roles=self.roles | other.roles,
+        )
+
+    def __invert__(self) -> Policy:
+        inner = self._evaluate
+        return Policy(
+            lambda resolved: not inner(resolved),
+            description=f"not {self.description}",
+            roles=self.roles,
+        )
+
+    def __repr__(self) -> str:
+        return f"Policy({self.description})"
+
+
+def _to_policy(allowed: tuple[str | Policy, ...]) -> Policy:
+    """require_roles 等の可変長引数をポリシーに変換する.
+
+    ロール名は any_of にまとめ、複数のポリシーは OR で結合する。
+    ロール名のみの場合は同じ引数に同じポリシーを返すため、ページを開くたびに
+    呼ばれる authorize_page などでも判定キャッシュのエントリを共有できる。
+
+    Raises:
+        ValueError: allowed が空の場合.
+    """
+    if not allowed:
+        msg = "allowed_roles must not be empty."
+        raise ValueError(msg)
+    names = tuple(item for item in allowed if isinstance(item, str))
+    if len(names) == len(allowed):
+        return _any_of(names)
+    policies = [item for item in allowed if isinstance(item, Policy)]
+    if names:
+        policies.insert(0, Policy.any_of(*names))
+    combined = policies[0]
+    for policy in policies[1:]:
+        combined |= policy
+    return combined
+
+
+@functools.lru_cache(maxsize=1024)
+def _any_of(names: tuple[str, ...]) -> Policy:
+    """ロール名の組ごとにコンパイル済みの any_of ポリシーを保持する."""
+    return Policy.any_of(*names)
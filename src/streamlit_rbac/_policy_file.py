@@ -0,0 +1,233 @@
+"""streamlit-rbac のポリシーファイル.
+
+ロール階層・パーミッション・名前付きポリシーを TOML ファイルから読み込み、
+判定用の構造に一度だけコンパイルする。ファイルの変更は更新時刻と
+ハッシュ値で検出し、コンパイル済みの設定を丸ごと差し替える。
+
+ファイルの形式::
+
+    [hierarchy]
+    Admin = ["Manager"]
+
+    [permissions]
+    Admin = ["member:delete"]
+
+    [policies]
+    "page:reports" = "Manager or Auditor"
+"""
+
+from __future__ import annotations
+
+import hashlib
+import threading
+import time
+import tomllib
+from pathlib import Path
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Any
+
+from streamlit_rbac._config import _get_config, _update_config
+from streamlit_rbac._expression import parse_policy
+from streamlit_rbac._hierarchy import RoleHierarchy
+from streamlit_rbac._permissions import PermissionMap
+from streamlit_rbac._policy import Policy
+
+if TYPE_CHECKING:
+    import os
+    from collections.abc import Callable, Mapping
+
+_SECTIONS = frozenset({"hierarchy", "permissions", "policies"})
+
+
+def _role_table(data: dict[str, Any], section: str) -> dict[str, list[str]]:
+    """ロール名 → 文字列リストのテーブルを検証して返す.
+
+    Raises:
+        ValueError: テーブルの形式が正しくない場合.
+    """
+    table = data.get(section, {})
+    if not isinstance(table, dict) or not all(
+        isinstance(values, list) and all(isinstance(v, str) for v in values)
+        for values in table.values()
+    ):
+        msg = f"[{section}] must map role names to lists of strings."
+        raise ValueError(msg)
+    return table
+
+
+def _compile(data: dict[str, Any]) -> dict[str, Any]:
+    """読み込んだ TOML を _update_config に渡す設定に変換する.
+
+    Raises:
+        ValueError: 未知のセクションがある場合、または形式が正しくない場合.
+    """
+    unknown = set(data) - _SECTIONS
+    if unknown:
+        msg = f"Unknown sections in policy file: {sorted(unknown)}"
+        raise ValueError(msg)
+    hierarchy = _role_table(data, "hierarchy")
+    permissions = _role_table(data, "permissions")
+    policies = data.get("policies", {})
+    if not isinstance(policies, dict) or not all(
+        isinstance(expression, str) for expression in policies.values()
+    ):
+        msg = "[policies] must map policy names to expressions."
+        raise ValueError(msg)
+    return {
+        "hierarchy": RoleHierarchy(hierarchy) if hierarchy else None,
+        "permissions": PermissionMap(permissions) if permissions else None,
+        "policies": MappingProxyType(
+            {name: parse_policy(expression) for name, expression in policies.items()}
+        ),
+    }
+
+
+class PolicyFile:
+    """TOML のポリシーファイルを読み込み、変更時に再読み込みする.
+
+    読み込んだ内容はロール階層・パーミッション定義・名前付きポリシーとして
+    まとめて登録される。ファイルに含まれないセクションは解除される。
+    コンパイルはすべて新しいオブジェクト上で行い、完了後に設定を
+    一度に差し替えるため、判定中のスレッドが構築途中の状態を観測することはない。
+
+    check は interval 秒に一度だけファイルの更新時刻とサイズを確認し、
+    変化があった場合のみ内容のハッシュ値を比較して再コンパイルする。
+    start で同じ確認をバックグラウンドスレッドから定期的に行う。
+
+    Raises:
+        ValueError: interval が正の値でない場合.
+    """
+
+    def __init__(
+        self,
+        path: str | os.PathLike[str],
+        *,
+        interval: float = 2.0,
+        timer: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if interval <= 0:
+            msg = "interval must be positive."
+            raise ValueError(msg)
+        self._path = Path(path)
+        self._interval = interval
+        self._timer = timer
+        self._lock = threading.Lock()
+        self._next_check = float("-inf")
+        self._signature: tuple[int, int] | None = None
+        self._digest: str | None = None
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self.last_error: Exception | None = None
+        """バックグラウンドでの再読み込みで最後に発生した例外."""
+
+    def load(self) -> None:
+        """ファイルを読み込み、コンパイルした設定を登録する.
+
+        Raises:
+            OSError: ファイルを読み込めない場合.
+            tomllib.TOMLDecodeError: TOML として不正な場合.
+            ValueError: ポリシーファイルとして不正な場合.
+        """
+        with self._lock:
+            self._reload(force=True)
+
+    def check(self) -> bool:
+        """前回の確認から interval 秒以上経過していればファイルの変更を確認する.
+
+        他のスレッドが確認中の場合は待たずに戻る。
+        再読み込みした場合は True を返す。
+        """
+        now = self._timer()
+        if now < self._next_check or not self._lock.acquire(blocking=False):
+            return False
+        try:
+            if now < self._next_check:
+                return False
+            self._next_check = now + self._interval
+            return self._reload(force=False)
+        finally:
+            self._lock.release()
+
+    def _reload(self, *, force: bool) -> bool:
+        """ロックを保持して呼び出す. 内容が変化していれば設定を差し替える."""
+        stat = self._path.stat()
+        signature = (stat.st_mtime_ns, stat.st_size)
+        if not force and signature == self._signature:
+            return False
+        content = self._path.read_bytes()
+        digest = hashlib.sha256(content).hexdigest()
+        self._signature = signature
+        if not force and digest == self._digest:
+            return False
+        config = _compile(tomllib.loads(content.decode()))
+        _update_config(**config)
+        self._digest = digest
+        return True
+
+    def start(self) -> None:
+        """バックグラウンドでの定期的な変更確認を開始する.
+
+        再読み込みに失敗した場合は直前の設定を維持し、例外を last_error に保持する。
+        """
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="streamlit-rbac-policy-file", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        """バックグラウンドでの変更確認を停止する."""
+        thread, self._thread = self._thread, None
+        if thread is not None:
+            self._stop.set()
+            thread.join()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self._interval):
+            try:
+                with self._lock:
+                    self._reload(force=False)
+            except Exception as error:
+                self.last_error = error
+
+
+def named_policy(name: str) -> Policy:
+    """ポリシーファイルで定義された名前付きポリシーを返す.
+
+    登録済みのポリシーは判定のたびに参照するため、
+    ファイルの再読み込みはポリシー生成後にも反映される。
+    """
+
+    def evaluate(resolved: frozenset[str]) -> bool:
+        policies = _get_config().policies
+        policy = policies.get(name) if policies is not None else None
+        if policy is None:
+            msg = f"No policy named {name!r} is registered."
+            raise RuntimeError(msg)
+        return policy.evaluate(resolved)
+
+    return Policy(evaluate, description=f"policy {name!r}")
+
+
+def set_named_policies(policies: Mapping[str, str | Policy] | None) -> None:
+    """名前付きポリシーをコードから登録する. 文字列はポリシー式として解釈する.
+
+    None で解除する。
+    """
+    _update_config(
+        policies=None
+        if policies is None
+        else MappingProxyType(
+            {
+                name: parse_policy(policy) if isinstance(policy, str) else policy
+                for name, policy in policies.items()
+            }
+        )
+    )
+
+
+def get_named_policies() -> Mapping[str, Policy]:
+    """登録済みの名前付きポリシーを返す."""
+    return _get_config().policies or MappingProxyType({})
@@ -0,0 +1,146 @@
+"""streamlit-rbac のロールレジストリ.
+
+既知のロール集合をビット位置に割り当て、解決済みのロール集合を整数の
+ビットマスクとして扱う。判定はマスクの論理積のみで行われる。
+"""
+
+from __future__ import annotations
+
+import functools
+from enum import Enum
+from typing import TYPE_CHECKING, Literal
+
+from streamlit_rbac._core import _check_role_source, _resolve_roles
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+    from streamlit_rbac._types import RoleLoader
+
+UnknownRolePolicy = Literal["raise", "ignore"]
+
+
+class RoleRegistry:
+    """ロール名をビット位置に割り当てるレジストリ.
+
+    ロール名は文字列のまま受け付け、内部では整数マスクとして判定する。
+    user_roles には解決済みのマスク (int) も渡せるため、
+    ループ内ではマスクを使い回すことでロール解決を省略できる。
+
+    on_unknown はレジストリに登録されていないロールの扱いを決める。
+    "raise" の場合は ValueError を送出し、"ignore" の場合は
+    そのロールを保持していないものとして扱う。
+
+    Raises:
+        ValueError: ロール名が重複している場合.
+    """
+
+    def __init__(
+        self,
+        roles: Iterable[str | Enum],
+        *,
+        on_unknown: UnknownRolePolicy = "raise",
+    ) -> None:
+        names = tuple(
+            str(role.value) if isinstance(role, Enum) else role for role in roles
+        )
+        if len(set(names)) != len(names):
+            msg = "roles must not contain duplicates."
+            raise ValueError(msg)
+        self._names = names
+        self._bits = {name: 1 << index for index, name in enumerate(names)}
+        self._on_unknown = on_unknown
+        # 呼び出し箇所ごとの required や、キャッシュ済みローダーが返す
+        # 同一の frozenset に対するマスク計算を省略する
+        self._lookup = functools.lru_cache(maxsize=1024)(self._compute_mask)
+
+    @property
+    def roles(self) -> tuple[str, ...]:
+        """ビット位置の順に並んだロール名."""
+        return self._names
+
+    @property
+    def all_mask(self) -> int:
+        """登録済みのすべてのロールを表すマスク."""
+        return (1 << len(self._names)) - 1
+
+    def _unknown(self, role: str) -> None:
+        """未登録ロールを on_unknown に従って処理する."""
+        if self._on_unknown == "raise":
+            msg = f"Unknown role: {role!r}"
+            raise ValueError(msg)
+
+    def _compute_mask(self, roles: Iterable[str]) -> tuple[int, bool]:
+        """ロール集合のマスクと、未登録ロールを含むかどうかを返す."""
+        mask = 0
+        unknown = False
+        bits = self._bits
+        for role in roles:
+            bit = bits.get(role)
+            if bit is None:
+                self._unknown(role)
+                unknown = True
+                continue
+            mask |= bit
+        return mask, unknown
+
+    def mask(self, roles: Iterable[str]) -> int:
+        """ロール名の集合をマスクに変換する."""
+        return self._compute_mask(roles)[0]
+
+    def names(self, mask: int) -> frozenset[str]:
+        """マスクをロール名の集合に戻す."""
+        return frozenset(name for name, bit in self._bits.items() if mask & bit)
+
+    def resolve(
+        self,
+        *,
+        user_roles: Iterable[str] | int | None = None,
+        role_loader: RoleLoader | None = None,
+    ) -> int:
+        """has_role 等と同じ引数規約でロールを解決し、マスクとして返す."""
+        if isinstance(user_roles, int):
+            _check_role_source(user_roles, role_loader)
+            return user_roles
+        return self._lookup(_resolve_roles(user_roles, role_loader))[0]
+
+    def has_role(
+        self,
+        required: str,
+        *,
+        user_roles: Iterable[str] | int | None = None,
+        role_loader: RoleLoader | None = None,
+    ) -> bool:
+        """指定されたロールを保持しているかを判定する."""
+        bit = self._bits.get(required)
+        if bit is None:
+            self._unknown(required)
+            return False
+        return bool(self.resolve(user_roles=user_roles, role_loader=role_loader) & bit)
+
+    def has_any_role(
+        self,
+        *required: str,
+        user_roles: Iterable[str] | int | None = None,
+        role_loader: RoleLoader | None = None,
+    ) -> bool:
+        """指定されたロールのいずれかを保持しているかを判定する."""
+        if not required:
+            return False
+        mask = self._lookup(required)[0]
+        return bool(self.resolve(user_roles=user_roles, role_loader=role_loader) & mask)
+
+    def has_all_roles(
+        self,
+        *required: str,
+        user_roles: Iterable[str] | int | None = None,
+        role_loader: RoleLoader | None = None,
+    ) -> bool:
+        """指定されたロールのすべてを保持しているかを判定する."""
+        if not required:
+            return True
+        mask, unknown = self._lookup(required)
+        if unknown:
+            return False
+        resolved = self.resolve(user_roles=user_roles, role_loader=role_loader)
+        return resolved & mask == mask
@@ -0,0 +1,208 @@
+"""streamlit-rbac のプロセス間共有ロールキャッシュ.
+
+同じホストで動く複数の Streamlit サーバープロセスが、
+ローカルファイル上のキャッシュを通じてロール解決結果を共有する。
+無効化は世代番号で全プロセスへ伝わる。
+すべての機能は標準ライブラリのみに依存する。
+"""
+
+from __future__ import annotations
+
+import sqlite3
+import threading
+import time
+from typing import TYPE_CHECKING
+
+from streamlit_rbac._cache import CacheStats
+from streamlit_rbac._core import _intern_roles
+from streamlit_rbac._sqlite import _ConnectionPool
+
+if TYPE_CHECKING:
+    import os
+    from collections.abc import Callable, Iterable
+
+    from streamlit_rbac._types import RoleLoader
+
+_TABLE = "role_cache"
+_META = "role_cache_meta"
+# key ごとの無効化回数. invalidate と読み込み中の保存の競合を検出する
+_INVALIDATIONS = "role_cache_invalidations"
+# 他プロセスの書き込み中にロック解除を待つ秒数
+_BUSY_TIMEOUT = 5.0
+
+
+def _encode(roles: Iterable[str]) -> bytes:
+    """ロール集合を NUL 終端の UTF-8 列に変換する.
+
+    Raises:
+        ValueError: ロール名に NUL 文字が含まれる場合.
+    """
+    names = sorted(roles)
+    if any("\0" in role for role in names):
+        msg = "Role names must not contain NUL characters."
+        raise ValueError(msg)
+    return "".join(role + "\0" for role in names).encode()
+
+
+def _decode(blob: bytes) -> frozenset[str]:
+    """_encode の逆変換."""
+    return _intern_roles(blob.decode().split("\0")[:-1])
+
+
+class SharedRoleCache:
+    """同じホストのプロセス間でロール解決結果を共有する RoleLoader.
+
+    結果は path の SQLite ファイルに、key ごとに NUL 区切りの
+    コンパクトな形式で保存される。各エントリには保存時の世代番号が記録され、
+    bump_generation で世代を進めると全プロセスの既存エントリが一度に無効になる。
+    ローダーの呼び出し中に世代が進んだ場合や、同じ key が invalidate された場合、
+    その結果は保存しない。
+
+    インスタンス自体が RoleLoader として振る舞うため、任意のローダーの前段に置ける。
+    ファイルへの問い合わせも省きたい場合は、短い ttl の CachedRoleLoader で包む。
+    key はプロセスをまたいで同じ値になる文字列 (ユーザーIDなど) を返す必要がある。
+
+    Raises:
+        ValueError: ttl が正の値でない場合.
+    """
+
+    def __init__(
+        self,
+        role_loader: RoleLoader,
+        *,
+        key: Callable[[], str],
+        path: str | os.PathLike[str],
+        ttl: float = 300.0,
+        timer: Callable[[], float] = time.time,
+    ) -> None:
+        if ttl <= 0:
+            msg = "ttl must be positive."
+            raise ValueError(msg)
+        self._role_loader = role_loader
+        self._key = key
+        self._path = str(path)
+        self._ttl = ttl
+        self._timer = timer
+        self._pool = _ConnectionPool(self._connect)
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+        with self._pool.connection() as connection, connection:
+            connection.execute(
+                f"CREATE TABLE IF NOT EXISTS {_TABLE} ("
+                "key TEXT PRIMARY KEY, generation INTEGER NOT NULL, "
+                "expires REAL NOT NULL, roles BLOB NOT NULL) WITHOUT ROWID"
+            )
+            connection.execute(
+                f"CREATE TABLE IF NOT EXISTS {_META} ("
+                "name TEXT PRIMARY KEY, value INTEGER NOT NULL) WITHOUT ROWID"
+            )
+            connection.execute(
+                f"CREATE TABLE IF NOT EXISTS {_INVALIDATIONS} ("
+                "key TEXT PRIMARY KEY, count INTEGER NOT NULL) WITHOUT ROWID"
+            )
+            connection.execute(
+                f"INSERT OR IGNORE INTO {_META} VALUES ('generation', 0)"
+            )
+
+    def _connect(self) -> sqlite3.Connection:
+        connection = sqlite3.connect(
+            self._path, timeout=_BUSY_TIMEOUT, check_same_thread=False
+        )
+        # 読み込みが書き込みを待たないようにする. キャッシュのため耐久性は求めない
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        return connection
+
+    def __call__(self) -> frozenset[str]:
+        """現在のユーザーのロールを返す. 未キャッシュ・期限切れ・旧世代なら再取得する."""
+        key = self._key()
+        now = self._timer()
+        with self._pool.connection() as connection:
+            generation, invalidations, blob = connection.execute(
+                f"SELECT m.value, coalesce(i.count, 0), e.roles FROM {_META} AS m "
+                f"LEFT JOIN {_INVALIDATIONS} AS i ON i.key = ? "
+                f"LEFT JOIN {_TABLE} AS e ON e.key = ? "
+                "AND e.generation = m.value AND e.expires > ? "
+                "WHERE m.name = 'generation'",
+                (key, key, now),
+            ).fetchone()
+        if blob is not None:
+            with self._lock:
+                self._hits += 1
+            return _decode(blob)
+        with self._lock:
+            self._misses += 1
+
+        # 接続はローダーの呼び出し中に保持せず、プールへ返しておく.
+        # 呼び出し中に世代か key の無効化回数が変わっていれば保存しない
+        roles = _intern_roles(self._role_loader())
+        with self._pool.connection() as connection, connection:
+            connection.execute(
+                f"INSERT OR REPLACE INTO {_TABLE} "
+                f"SELECT ?, value, ?, ? FROM {_META} "
+                "WHERE name = 'generation' AND value = ? AND ? = "
+                f"(SELECT coalesce(max(count), 0) FROM {_INVALIDATIONS} WHERE key = ?)",
+                (key, now + self._ttl, _encode(roles), generation, invalidations, key),
+            )
+        return roles
+
+    @property
+    def generation(self) -> int:
+        """現在の世代番号を返す."""
+        with self._pool.connection() as connection:
+            (value,) = connection.execute(
+                f"SELECT value FROM {_META} WHERE name = 'generation'"
+            ).fetchone()
+        return int(value)
+
+    def bump_generation(self) -> None:
+        """世代を進め、全プロセスのキャッシュを無効にする. ロール定義の変更時に使う."""
+        with self._pool.connection() as connection, connection:
+            connection.execute(
+                f"UPDATE {_META} SET value = value + 1 WHERE name = 'generation'"
+            )
+
+    def invalidate(self, user: str) -> None:
+        """指定ユーザーのキャッシュを全プロセスで破棄する.
+
+        無効化回数を進めるため、実行中の読み込みの結果も保存されない.
+        """
+        with self._pool.connection() as connection, connection:
+            connection.execute(f"DELETE FROM {_TABLE} WHERE key = ?", (user,))
+            connection.execute(
+                f"INSERT INTO {_INVALIDATIONS} VALUES (?, 1) "
+                "ON CONFLICT (key) DO UPDATE SET count = count + 1",
+                (user,),
+            )
+
+    def purge(self) -> int:
+        """期限切れと旧世代のエントリをファイルから削除し、削除件数を返す."""
+        with self._pool.connection() as connection, connection:
+            cursor = connection.execute(
+                f"DELETE FROM {_TABLE} WHERE expires <= ? OR generation < "
+                f"(SELECT value FROM {_META} WHERE name = 'generation')",
+                (self._timer(),),
+            )
+        with self._lock:
+            self._evictions += cursor.rowcount
+        return cursor.rowcount
+
+    @property
+    def stats(self) -> CacheStats:
+        """このプロセスでの統計情報を返す. size はファイル上のエントリ数."""
+        with self._pool.connection() as connection:
+            (size,) = connection.execute(f"SELECT COUNT(*) FROM {_TABLE}").fetchone()
+        with self._lock:
+            return CacheStats(
+                hits=self._hits,
+                misses=self._misses,
+                evictions=self._evictions,
+                size=size,
+            )
+
+    def close(self) -> None:
+        """このプロセスのプールの接続をすべて閉じる. ファイルは削除しない."""
+        self._pool.close()
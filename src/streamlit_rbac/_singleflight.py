@@ -0,0 +1,114 @@
+"""streamlit-rbac の single-flight 重複排除.
+
+同じキーに対する同時実行中の呼び出しを1回にまとめ、
+結果または例外を待機中の全スレッドで共有する。
+"""
+
+from __future__ import annotations
+
+import threading
+from typing import TYPE_CHECKING, Generic, TypeVar, cast
+
+from streamlit_rbac._core import _intern_roles
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Hashable
+
+    from streamlit_rbac._types import RoleLoader
+
+T = TypeVar("T")
+
+
+class _Call(Generic[T]):
+    """実行中の呼び出し."""
+
+    __slots__ = ("done", "error", "result")
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result: T | None = None
+        self.error: BaseException | None = None
+
+
+class SingleFlight(Generic[T]):
+    """キー単位で同時実行中の呼び出しを1回にまとめる.
+
+    最初の呼び出し (リーダー) だけが関数を実行し、
+    実行中に同じキーで呼び出したスレッドはその結果を待って共有する。
+    呼び出しが完了するとキーは解放され、次の呼び出しは再び関数を実行する。
+    """
+
+    def __init__(self) -> None:
+        self._calls: dict[Hashable, _Call[T]] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def in_flight(self) -> int:
+        """実行中の呼び出し数."""
+        with self._lock:
+            return len(self._calls)
+
+    def do(
+        self,
+        key: Hashable,
+        func: Callable[[], T],
+        *,
+        timeout: float | None = None,
+    ) -> T:
+        """key に対して func を実行する. 実行中であればその結果を待つ.
+
+        Raises:
+            TimeoutError: 待機側で timeout 秒以内に結果が得られなかった場合.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if call is None:
+                call = self._calls[key] = _Call()
+
+        if not leader:
+            if not call.done.wait(timeout):
+                msg = f"Timed out waiting for in-flight call for key {key!r}"
+                raise TimeoutError(msg)
+            if call.error is not None:
+                raise call.error
+            return cast("T", call.result)
+
+        try:
+            result = call.result = func()
+        except BaseException as error:
+            call.error = error
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return result
+
+
+class SingleFlightRoleLoader:
+    """同じキーの同時ロール解決を1回のローダー呼び出しにまとめる RoleLoader.
+
+    キャッシュ期限切れやデプロイ直後に多数のセッションが同時に
+    ロールを解決する場合に、ID基盤への同時リクエストを抑える。
+    結果はキャッシュしないため、CachedRoleLoader と組み合わせて使う。
+    """
+
+    def __init__(
+        self,
+        role_loader: RoleLoader,
+        *,
+        key: Callable[[], Hashable],
+        timeout: float | None = None,
+    ) -> None:
+        self._role_loader = role_loader
+        self._key = key
+        self._timeout = timeout
+        self._flight: SingleFlight[frozenset[str]] = SingleFlight()
+
+    def __call__(self) -> frozenset[str]:
+        """現在のキーのロールを返す. 実行中の呼び出しがあればその結果を共有する."""
+        return self._flight.do(self._key(), self._load, timeout=self._timeout)
+
+    def _load(self) -> frozenset[str]:
+        return _intern_roles(self._role_loader())
@@ -0,0 +1,192 @@
+"""streamlit-rbac の SQLite ロールストア.
+
+ユーザーとロールの対応を SQLite に保持する RoleLoader の参照実装を提供する。
+本番環境の DB を使うローダーの雛形や、テスト用のローカルな代替として使う。
+すべての機能は標準ライブラリのみに依存する。
+"""
+
+from __future__ import annotations
+
+import contextlib
+import itertools
+import queue
+import re
+import sqlite3
+import threading
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import os
+    from collections.abc import Callable, Iterable, Iterator
+
+    from streamlit_rbac._types import RoleLoader
+
+_IDENTIFIER = re.compile(r"[A-Za-z_][A-Za-z0-9_]*")
+# 古い SQLite のバインド変数の上限 (999) を超えないように分割する
+_CHUNK_SIZE = 500
+_memory_ids = itertools.count()
+# プールに保持する未使用の接続の上限
+_POOL_SIZE = 8
+
+
+class _ConnectionPool:
+    """スレッド間で使い回す sqlite3 接続のプール.
+
+    接続は使用中のスレッドだけが保持し、使用後はプールへ返す。
+    プールが満杯のときに返された接続は閉じるため、Streamlit のように
+    rerun ごとに新しいスレッドが作られても、未使用の接続は size 本を超えない。
+    serialize を指定すると、同時に貸し出す接続を1本に制限する。
+    """
+
+    def __init__(
+        self,
+        connect: Callable[[], sqlite3.Connection],
+        *,
+        size: int = _POOL_SIZE,
+        serialize: bool = False,
+    ) -> None:
+        self._connect = connect
+        self._idle: queue.LifoQueue[sqlite3.Connection] = queue.LifoQueue(size)
+        self._lock: contextlib.AbstractContextManager[object] = (
+            threading.Lock() if serialize else contextlib.nullcontext()
+        )
+
+    @contextlib.contextmanager
+    def connection(self) -> Iterator[sqlite3.Connection]:
+        """接続を1本借りる. プールが空なら新しく作成する."""
+        with self._lock:
+            try:
+                connection = self._idle.get_nowait()
+            except queue.Empty:
+                connection = self._connect()
+            try:
+                yield connection
+            finally:
+                if connection.in_transaction:
+                    connection.rollback()
+                try:
+                    self._idle.put_nowait(connection)
+                except queue.Full:
+                    connection.close()
+
+    def close(self) -> None:
+        """未使用の接続をすべて閉じる. 使用中の接続は返却時にプールへ戻る."""
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                return
+
+
+class SQLiteRoleStore:
+    """SQLite に保存したユーザー→ロールの対応を引く RoleLoader の参照実装.
+
+    (user_id, role) を主キーとする WITHOUT ROWID テーブルを使うため、
+    ユーザー単位の検索は主キーの範囲走査のみで完了する。
+    接続はスレッド間で共有するプールから借りて使い回し、SQL 文は固定文字列として
+    sqlite3 の文キャッシュに載せることで、rerun ごとの接続・構文解析を省く。
+    database に ":memory:" を指定した場合は、全スレッドで共有される
+    インメモリデータベースを作成する。共有キャッシュのインメモリ DB は
+    busy timeout が効かないテーブルロックで排他されるため、この場合は
+    接続の利用をストア内で直列化する。
+
+    Raises:
+        ValueError: table が SQL の識別子として不正な場合.
+    """
+
+    def __init__(
+        self,
+        database: str | os.PathLike[str],
+        *,
+        table: str = "user_roles",
+        timeout: float = 5.0,
+    ) -> None:
+        if not _IDENTIFIER.fullmatch(table):
+            msg = f"Invalid table name: {table!r}"
+            raise ValueError(msg)
+        self._memory = str(database) == ":memory:"
+        if self._memory:
+            self._database = f"file:streamlit_rbac_{next(_memory_ids)}?mode=memory"
+            self._database += "&cache=shared"
+        else:
+            self._database = str(database)
+        self._timeout = timeout
+        self._pool = _ConnectionPool(self._connect, serialize=self._memory)
+
+        self._select = f"SELECT role FROM {table} WHERE user_id = ?"
+        self._select_many = f"SELECT user_id, role FROM {table} WHERE user_id IN ({{}})"
+        self._insert = f"INSERT OR IGNORE INTO {table} (user_id, role) VALUES (?, ?)"
+        self._delete = f"DELETE FROM {table} WHERE user_id = ? AND role = ?"
+        self._delete_user = f"DELETE FROM {table} WHERE user_id = ?"
+
+        # インメモリの場合は、プールに接続が残っている間データベースが保持される
+        with self._pool.connection() as connection, connection:
+            if not self._memory:
+                connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute(
+                f"CREATE TABLE IF NOT EXISTS {table} ("
+                "user_id TEXT NOT NULL, role TEXT NOT NULL, "
+                "PRIMARY KEY (user_id, role)) WITHOUT ROWID"
+            )
+            connection.execute(
+                f"CREATE INDEX IF NOT EXISTS {table}_role ON {table} (role, user_id)"
+            )
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(
+            self._database,
+            timeout=self._timeout,
+            uri=self._memory,
+            check_same_thread=False,
+        )
+
+    def roles_for(self, user_id: str | None) -> frozenset[str]:
+        """ユーザーのロールを返す. user_id が None の場合は空集合."""
+        if user_id is None:
+            return frozenset()
+        with self._pool.connection() as connection:
+            rows = connection.execute(self._select, (user_id,))
+            return frozenset(role for (role,) in rows)
+
+    def load_many(self, user_ids: Iterable[str]) -> dict[str, frozenset[str]]:
+        """複数ユーザーのロールをまとめて返す. ロールのないユーザーは空集合."""
+        ids = list(dict.fromkeys(user_ids))
+        found: dict[str, set[str]] = {}
+        with self._pool.connection() as connection:
+            for start in range(0, len(ids), _CHUNK_SIZE):
+                chunk = ids[start : start + _CHUNK_SIZE]
+                query = self._select_many.format(",".join("?" * len(chunk)))
+                for user_id, role in connection.execute(query, chunk):
+                    found.setdefault(user_id, set()).add(role)
+        return {user_id: frozenset(found.get(user_id, ())) for user_id in ids}
+
+    def grant(self, user_id: str, *roles: str) -> None:
+        """ユーザーにロールを付与する. 付与済みのロールは無視する."""
+        with self._pool.connection() as connection, connection:
+            connection.executemany(self._insert, [(user_id, role) for role in roles])
+
+    def revoke(self, user_id: str, *roles: str) -> None:
+        """ユーザーからロールを剥奪する."""
+        with self._pool.connection() as connection, connection:
+            connection.executemany(self._delete, [(user_id, role) for role in roles])
+
+    def set_roles(self, user_id: str, roles: Iterable[str]) -> None:
+        """ユーザーのロールを1つのトランザクションで置き換える."""
+        with self._pool.connection() as connection, connection:
+            connection.execute(self._delete_user, (user_id,))
+            connection.executemany(self._insert, [(user_id, role) for role in roles])
+
+    def loader(self, user: Callable[[], str | None]) -> RoleLoader:
+        """user が返すユーザーIDのロールを引く RoleLoader を返す.
+
+        has_role / require_roles / authorize_page にそのまま渡せる。
+        """
+
+        def load() -> frozenset[str]:
+            return self.roles_for(user())
+
+        return load
+
+    def close(self) -> None:
+        """プールの接続をすべて閉じる. インメモリの場合はデータも破棄される."""
+        self._pool.close()
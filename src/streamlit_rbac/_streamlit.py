@@ -6,28 +6,168 @@ st.session_state との連携およびページガード機能を提供する。
 
 from __future__ import annotations
 
-from typing import TYPE_CHECKING
+import functools
+import sys
+from collections.abc import Mapping
+from typing import TYPE_CHECKING, Any, ParamSpec, TypeVar
 
-from streamlit_rbac._core import has_any_role
+from streamlit_rbac._config import _get_config
+from streamlit_rbac._core import (
+    _as_role_set,
+    _expand_roles,
+    _intern_roles,
+    _load_roles,
+)
+from streamlit_rbac._permissions import permission_policy
+from streamlit_rbac._policy import _to_policy
+from streamlit_rbac._versions import _role_version
 
 if TYPE_CHECKING:
+    from collections.abc import Callable, Hashable, Sequence
+    from pathlib import Path
+
+    from streamlit_rbac._policy import Policy
     from streamlit_rbac._types import RoleLoader
 
+P = ParamSpec("P")
+R = TypeVar("R")
+
+_RERUN_CACHE_ATTR = "_streamlit_rbac_rerun_cache"
+
+
+def _get_script_run_ctx() -> Any:
+    """現在のスクリプト実行コンテキストを返す. 実行外では None."""
+    from streamlit.runtime.scriptrunner import get_script_run_ctx  # noqa: PLC0415
+
+    return get_script_run_ctx(suppress_warning=True)
+
+
+def _rerun_cache() -> dict[RoleLoader, frozenset[str]] | None:
+    """現在の rerun に紐づくロール解決キャッシュを返す.
+
+    ScriptRunContext.cursors は rerun 開始時に新しい dict へ置き換えられるため、
+    その同一性を rerun の識別子として用いる。
+    """
+    ctx = _get_script_run_ctx()
+    if ctx is None:
+        return None
+    run_marker = ctx.cursors
+    entry = getattr(ctx, _RERUN_CACHE_ATTR, None)
+    if entry is None or entry[0] is not run_marker:
+        entry = (run_marker, {})
+        setattr(ctx, _RERUN_CACHE_ATTR, entry)
+    cache: dict[RoleLoader, frozenset[str]] = entry[1]
+    return cache
+
+
+def _page_script() -> str:
+    """このモジュールの外側で最初に見つかった呼び出し元 (ページスクリプト) を返す."""
+    frame = sys._getframe(1)
+    while frame.f_back is not None and frame.f_globals.get("__name__") == __name__:
+        frame = frame.f_back
+    return frame.f_code.co_filename
+
+
+def rerun_cached(role_loader: RoleLoader) -> RoleLoader:
+    """role_loader の結果を Streamlit のスクリプト実行 (rerun) 単位でキャッシュする.
+
+    同一 rerun 内の2回目以降の呼び出しは最初の解決結果を再利用し、
+    次の rerun が始まると自動的に破棄される。
+    スクリプト実行外では毎回 role_loader を呼び出す。
+    """
+
+    @functools.wraps(role_loader)
+    def loader() -> frozenset[str]:
+        cache = _rerun_cache()
+        if cache is None:
+            return _as_role_set(role_loader())
+        roles = cache.get(role_loader)
+        if roles is None:
+            roles = cache[role_loader] = _as_role_set(role_loader())
+        return roles
+
+    return loader
+
+
+def _rerun_roles(role_loader: RoleLoader) -> frozenset[str]:
+    """role_loader を現在の rerun で一度だけ呼び出し、展開済みのロール集合を返す."""
+    cache = _rerun_cache()
+    if cache is None:
+        return _load_roles(role_loader)
+    roles = cache.get(role_loader)
+    if roles is None:
+        roles = cache[role_loader] = _load_roles(role_loader)
+        return roles
+    # rerun_cached は階層展開前の集合を同じキャッシュに保存するため、ここで展開する
+    return _expand_roles(roles)
+
+
+class SessionRoleLoader:
+    """解決済みのロール集合を st.session_state に保持する RoleLoader.
+
+    最初の解決時に、階層展開済みのロール集合をバージョンとともに保存し、
+    以降の rerun ではそのスナップショットを返す。
+    bump_role_version で全体または該当ユーザーの世代が進んだ場合、
+    ユーザーが切り替わった場合、設定が更新された場合は、
+    次の呼び出しで一度だけ role_loader を呼び出して再解決する。
+    """
+
+    def __init__(
+        self,
+        role_loader: RoleLoader,
+        *,
+        user: Callable[[], Hashable] | None = None,
+        key: str = "_streamlit_rbac_roles",
+    ) -> None:
+        self._role_loader = role_loader
+        self._user = user
+        self._key = key
+
+    def __call__(self) -> frozenset[str]:
+        """現在のセッションのロールを返す. スナップショットが古い場合は再解決する."""
+        import streamlit as st  # noqa: PLC0415
+
+        user = self._user() if self._user is not None else None
+        token = (_get_config().version, user, *_role_version(user))
+        snapshot = st.session_state.get(self._key)
+        if snapshot is not None and snapshot[0] == token:
+            roles: frozenset[str] = snapshot[1]
+            return roles
+        roles = _intern_roles(_load_roles(self._role_loader))
+        st.session_state[self._key] = (token, roles)
+        return roles
+
+    def clear(self) -> None:
+        """現在のセッションのスナップショットを破棄する. ログアウト時に使う."""
+        import streamlit as st  # noqa: PLC0415
+
+        st.session_state.pop(self._key, None)
+
 
 def authorize_page(
-    *allowed_roles: str,
+    *allowed_roles: str | Policy,
     role_loader: RoleLoader,
     login_url: str | None = None,
     denied_message: str = "このページへのアクセス権限がありません。",
 ) -> None:
-    """ページ先頭でアクセス制御を行う."""
-    if not allowed_roles:
-        msg = "allowed_roles must not be empty."
-        raise ValueError(msg)
+    """ページ先頭でアクセス制御を行う.
+
+    role_loader は同じ rerun 内で一度だけ呼び出され、
+    authorized や RoleNavigation.navigation と解決結果を共有する。
+    """
+    policy = _to_policy(allowed_roles)
 
     import streamlit as st  # noqa: PLC0415
 
-    user_roles = list(role_loader())
+    user_roles = _rerun_roles(role_loader)
+    granted = bool(user_roles) and policy.evaluate(user_roles)
+    config = _get_config()
+    if config.metrics is not None:
+        config.metrics.record_check("authorize_page", policy.description, granted)
+    if config.audit is not None:
+        config.audit.record(
+            "authorize_page", _page_script(), policy, user_roles, granted
+        )
 
     if not user_roles:
         if login_url is not None:
@@ -39,7 +179,163 @@ def authorize_page(
         st.stop()
         return
 
-    if not has_any_role(*allowed_roles, user_roles=user_roles):
+    if not granted:
         st.error(denied_message)
         st.stop()
         return
+
+
+def authorize_permission(
+    permission: str,
+    *,
+    role_loader: RoleLoader,
+    login_url: str | None = None,
+    denied_message: str = "このページへのアクセス権限がありません。",
+) -> None:
+    """ページ先頭でパーミッションによるアクセス制御を行う."""
+    authorize_page(
+        permission_policy(permission),
+        role_loader=role_loader,
+        login_url=login_url,
+        denied_message=denied_message,
+    )
+
+
+def authorized(
+    *allowed_roles: str | Policy,
+    role_loader: RoleLoader,
+    placeholder: str | Callable[[], object] | None = None,
+) -> bool:
+    """ページ内のセクションを表示してよいかを判定する.
+
+    role_loader は同じ rerun 内で一度だけ呼び出され、
+    他の authorized / authorized_section と解決結果を共有する。
+    拒否された場合、placeholder が文字列なら st.info で表示し、
+    呼び出し可能オブジェクトならそのまま呼び出す。
+    """
+    policy = _to_policy(allowed_roles)
+    user_roles = _rerun_roles(role_loader)
+    granted = bool(user_roles) and policy.evaluate(user_roles)
+    config = _get_config()
+    if config.metrics is not None:
+        config.metrics.record_check("authorized", policy.description, granted)
+    if config.audit is not None:
+        config.audit.record("authorized", _page_script(), policy, user_roles, granted)
+
+    if not granted and placeholder is not None:
+        if isinstance(placeholder, str):
+            import streamlit as st  # noqa: PLC0415
+
+            st.info(placeholder)
+        else:
+            placeholder()
+    return granted
+
+
+def authorized_section(
+    *allowed_roles: str | Policy,
+    role_loader: RoleLoader,
+    placeholder: str | Callable[[], object] | None = None,
+) -> Callable[[Callable[P, R]], Callable[P, R | None]]:
+    """許可されたユーザーにだけセクションを描画する関数のデコレータ.
+
+    拒否された場合は関数本体 (データ取得を含む) を実行せずに None を返す。
+    判定は呼び出しのたびに authorized で行う。
+    """
+    policy = _to_policy(allowed_roles)
+
+    def decorator(func: Callable[P, R]) -> Callable[P, R | None]:
+        @functools.wraps(func)
+        def wrapper(*args: P.args, **kwargs: P.kwargs) -> R | None:
+            if not authorized(policy, role_loader=role_loader, placeholder=placeholder):
+                return None
+            return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+class RolePage:
+    """アクセス可能なロールを付与した st.Page の定義.
+
+    allowed_roles を省略したページは誰にでも表示される。
+    page_options は st.Page にそのまま渡される (title, icon, url_path など)。
+    """
+
+    __slots__ = ("options", "page", "policy")
+
+    def __init__(
+        self,
+        page: str | Path | Callable[[], None],
+        *allowed_roles: str | Policy,
+        **page_options: Any,
+    ) -> None:
+        self.page = page
+        self.policy = _to_policy(allowed_roles) if allowed_roles else None
+        self.options = page_options
+
+    def is_visible(self, roles: frozenset[str]) -> bool:
+        """解決済みのロール集合でこのページを表示できるかを判定する."""
+        return self.policy is None or self.policy.evaluate(roles)
+
+
+class RoleNavigation:
+    """ロールに応じた st.navigation のページ一覧を構築する.
+
+    ページ定義はモジュールレベルで一度だけ生成し、rerun ごとに
+    navigation() を呼び出す。表示対象のページはロール集合ごとに
+    キャッシュされるため、同じロールの組み合わせを持つユーザー間で共有され、
+    拒否されたページは st.Page の生成も評価も行われない。
+    キャッシュのキーには設定の世代を含めるため、パーミッション定義や
+    名前付きポリシーの差し替えは次の呼び出しから反映される。
+    """
+
+    def __init__(
+        self,
+        pages: Sequence[RolePage] | Mapping[str, Sequence[RolePage]],
+        *,
+        maxsize: int = 256,
+    ) -> None:
+        self._pages = pages
+        self._visible = functools.lru_cache(maxsize=maxsize)(self._compute_visible)
+
+    def _compute_visible(
+        self, roles: frozenset[str], _version: int
+    ) -> tuple[RolePage, ...] | dict[str, tuple[RolePage, ...]]:
+        if isinstance(self._pages, Mapping):
+            sections = {
+                section: tuple(page for page in pages if page.is_visible(roles))
+                for section, pages in self._pages.items()
+            }
+            return {section: pages for section, pages in sections.items() if pages}
+        return tuple(page for page in self._pages if page.is_visible(roles))
+
+    def visible_pages(
+        self, roles: frozenset[str]
+    ) -> tuple[RolePage, ...] | dict[str, tuple[RolePage, ...]]:
+        """解決済みのロール集合で表示できるページ定義を返す."""
+        return self._visible(roles, _get_config().version)
+
+    def navigation(self, *, role_loader: RoleLoader, **navigation_options: Any) -> Any:
+        """現在のユーザーに表示できるページだけで st.navigation を構築する.
+
+        navigation_options は st.navigation にそのまま渡される。
+        戻り値は st.navigation の戻り値 (現在のページ) である。
+        """
+        import streamlit as st  # noqa: PLC0415
+
+        roles = _rerun_roles(role_loader)
+        visible = self._visible(roles, _get_config().version)
+        if isinstance(visible, dict):
+            return st.navigation(
+                {
+                    section: [st.Page(page.page, **page.options) for page in pages]
+                    for section, pages in visible.items()
+                },
+                **navigation_options,
+            )
+        return st.navigation(
+            [st.Page(page.page, **page.options) for page in visible],
+            **navigation_options,
+        )
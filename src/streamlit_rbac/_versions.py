@@ -0,0 +1,38 @@
+"""streamlit-rbac のロールバージョン.
+
+ロールの付与・剥奪を、保存済みのロール解決結果に伝えるための世代番号を管理する。
+全ユーザー共通の世代とユーザーごとの世代があり、
+いずれかが進むと対応するスナップショットは無効になる。
+"""
+
+from __future__ import annotations
+
+import threading
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Hashable
+
+_lock = threading.Lock()
+_global_version = 0
+_user_versions: dict[Hashable, int] = {}
+
+
+def bump_role_version(user: Hashable | None = None) -> None:
+    """ロールの世代を進める.
+
+    user を指定した場合はそのユーザーの世代のみを、
+    省略した場合は全ユーザー共通の世代を進める。
+    管理画面でロールを変更した後などに呼び出す。
+    """
+    global _global_version  # noqa: PLW0603
+    with _lock:
+        if user is None:
+            _global_version += 1
+        else:
+            _user_versions[user] = _user_versions.get(user, 0) + 1
+
+
+def _role_version(user: Hashable | None) -> tuple[int, int]:
+    """全ユーザー共通の世代と、指定ユーザーの世代を返す内部関数."""
+    return _global_version, _user_versions.get(user, 0)
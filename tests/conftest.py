@@ -0,0 +1,29 @@
+"""テスト間で共有するフィクスチャ."""
+
+from collections.abc import Iterable, Iterator, Mapping
+from unittest.mock import patch
+
+import pytest
+
+from streamlit_rbac import RoleHierarchy, set_role_hierarchy
+from tests.helpers import RegisterHierarchy
+
+
+@pytest.fixture
+def register_hierarchy() -> Iterator[RegisterHierarchy]:
+    """ロール階層を登録する関数. テスト終了時に登録を解除する."""
+
+    def register(edges: Mapping[str, Iterable[str]]) -> RoleHierarchy:
+        hierarchy = RoleHierarchy(edges)
+        set_role_hierarchy(hierarchy)
+        return hierarchy
+
+    yield register
+    set_role_hierarchy(None)
+
+
+@pytest.fixture
+def no_script_run_ctx() -> Iterator[None]:
+    """Streamlit のスクリプト実行外として扱う. streamlit をモックに差し替えるテスト用."""
+    with patch("streamlit_rbac._streamlit._get_script_run_ctx", return_value=None):
+        yield
@@ -0,0 +1,32 @@
+"""テスト間で共有するヘルパー."""
+
+from collections.abc import Callable, Iterable, Mapping
+
+from streamlit_rbac import RoleHierarchy
+
+
+class FakeClock:
+    """now を書き換えて時間の経過を模擬するタイマー."""
+
+    def __init__(self, now: float = 0.0) -> None:
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class CountingLoader:
+    """user のロールを返し、呼び出し回数を数えるロールローダー."""
+
+    def __init__(self, roles: dict[str, list[str]]) -> None:
+        self.roles = roles
+        self.user = "alice"
+        self.calls = 0
+
+    def __call__(self) -> list[str]:
+        self.calls += 1
+        return self.roles[self.user]
+
+
+RegisterHierarchy = Callable[[Mapping[str, Iterable[str]]], RoleHierarchy]
+"""register_hierarchy フィクスチャの型."""
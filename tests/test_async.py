@@ -0,0 +1,165 @@
+"""非同期判定関数と async 関数へのデコレータのテスト."""
+
+import asyncio
+import functools
+import gc
+import inspect
+import warnings
+
+import pytest
+
+from streamlit_rbac import (
+    RoleLoader,
+    has_all_roles_async,
+    has_any_role_async,
+    has_role,
+    has_role_async,
+    require_roles,
+)
+
+
+async def admin_loader() -> list[str]:
+    await asyncio.sleep(0)
+    return ["Admin", "Auditor"]
+
+
+async def user_loader() -> list[str]:
+    return ["User"]
+
+
+async def roles_for(user: str) -> list[str]:
+    return ["Admin"] if user == "alice" else []
+
+
+class AsyncLoader:
+    async def __call__(self) -> list[str]:
+        return ["Admin"]
+
+
+class TestAsyncCoreFunctions:
+    def test_has_role_async(self) -> None:
+        assert asyncio.run(has_role_async("Admin", role_loader=admin_loader)) is True
+        assert asyncio.run(has_role_async("Admin", role_loader=user_loader)) is False
+
+    def test_has_any_role_async(self) -> None:
+        assert (
+            asyncio.run(has_any_role_async("Admin", "User", role_loader=user_loader))
+            is True
+        )
+        assert asyncio.run(has_any_role_async(role_loader=user_loader)) is False
+
+    def test_has_all_roles_async(self) -> None:
+        assert (
+            asyncio.run(
+                has_all_roles_async("Admin", "Auditor", role_loader=admin_loader)
+            )
+            is True
+        )
+        assert asyncio.run(has_all_roles_async(role_loader=user_loader)) is True
+
+    def test_sync_loader_and_user_roles(self) -> None:
+        assert asyncio.run(has_role_async("Admin", role_loader=lambda: ["Admin"]))
+        assert asyncio.run(has_role_async("Admin", user_roles=["Admin"]))
+
+    def test_mutual_exclusion(self) -> None:
+        with pytest.raises(ValueError, match="mutually exclusive"):
+            asyncio.run(
+                has_role_async("Admin", user_roles=["Admin"], role_loader=admin_loader)
+            )
+
+    def test_loaders_run_concurrently(self) -> None:
+        started = 0
+        peak = 0
+
+        async def slow_loader() -> list[str]:
+            nonlocal started, peak
+            started += 1
+            peak = max(peak, started)
+            await asyncio.sleep(0.01)
+            started -= 1
+            return ["Admin"]
+
+        async def main() -> list[bool]:
+            return await asyncio.gather(
+                *(has_role_async("Admin", role_loader=slow_loader) for _ in range(5))
+            )
+
+        assert asyncio.run(main()) == [True] * 5
+        assert peak == 5  # noqa: PLR2004
+
+
+class TestRequireRolesAsync:
+    def test_async_function_with_async_loader(self) -> None:
+        @require_roles("Admin", role_loader=admin_loader)
+        async def action(value: int) -> int:
+            await asyncio.sleep(0)
+            return value * 2
+
+        assert asyncio.run(action(21)) == 42  # noqa: PLR2004
+
+    def test_async_function_denied(self) -> None:
+        denied = []
+
+        @require_roles(
+            "Admin", role_loader=user_loader, on_denied=lambda: denied.append(1)
+        )
+        async def action() -> str:
+            return "ok"
+
+        with pytest.raises(PermissionError, match="Admin"):
+            asyncio.run(action())
+        assert denied == [1]
+
+    def test_async_function_with_sync_loader(self) -> None:
+        @require_roles("Admin", role_loader=lambda: ["Admin"])
+        async def action() -> str:
+            return "ok"
+
+        assert asyncio.run(action()) == "ok"
+
+    def test_async_function_with_static_roles(self) -> None:
+        @require_roles("Admin", user_roles=["User"])
+        async def action() -> str:
+            return "ok"
+
+        with pytest.raises(PermissionError):
+            asyncio.run(action())
+
+    def test_preserves_coroutine_function(self) -> None:
+        @require_roles("Admin", role_loader=admin_loader)
+        async def action() -> str:
+            return "ok"
+
+        assert inspect.iscoroutinefunction(action)
+        assert action.__name__ == "action"
+
+    def test_async_loader_rejected_for_sync_function(self) -> None:
+        with pytest.raises(TypeError, match="async role_loader"):
+
+            @require_roles("Admin", role_loader=admin_loader)
+            def action() -> str:
+                return "ok"
+
+
+class TestAsyncLoaderInSyncApi:
+    @pytest.mark.parametrize(
+        "loader",
+        [admin_loader, AsyncLoader(), functools.partial(roles_for, "alice")],
+        ids=["function", "async_call", "partial"],
+    )
+    def test_rejected_without_unawaited_warning(self, loader: RoleLoader) -> None:
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter("always")
+            with pytest.raises(TypeError, match="has_role_async"):
+                has_role("Admin", role_loader=loader)
+            gc.collect()
+
+        assert not [w for w in caught if issubclass(w.category, RuntimeWarning)]
+
+    def test_async_call_object_rejected_by_sync_guard(self) -> None:
+        @require_roles("Admin", role_loader=AsyncLoader())
+        def action() -> str:
+            return "ok"
+
+        with pytest.raises(TypeError, match="async role loaders"):
+            action()
@@ -0,0 +1,294 @@
+"""監査ログのテスト."""
+# ruff: noqa: PLC0415
+
+import asyncio
+import json
+import sqlite3
+import threading
+from collections.abc import Iterator, Sequence
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from streamlit_rbac import (
+    AuditEvent,
+    AuditSink,
+    JSONLinesAuditWriter,
+    Policy,
+    SQLiteAuditWriter,
+    get_audit_sink,
+    require_roles,
+    set_audit_sink,
+)
+from streamlit_rbac._audit import Backpressure
+
+
+class ListWriter:
+    def __init__(self) -> None:
+        self.batches: list[list[AuditEvent]] = []
+        self.closed = False
+        self.gate = threading.Event()
+        self.gate.set()
+        self.gate_waiting = threading.Event()
+
+    def write(self, events: Sequence[AuditEvent]) -> None:
+        self.gate_waiting.set()
+        self.gate.wait()
+        self.batches.append(list(events))
+
+    def close(self) -> None:
+        self.closed = True
+
+    @property
+    def events(self) -> list[AuditEvent]:
+        return [event for batch in self.batches for event in batch]
+
+
+def event(*, granted: bool = False) -> AuditEvent:
+    return AuditEvent(
+        timestamp=0.0,
+        source="test",
+        target="target",
+        policy="one of ('Admin',)",
+        required=("Admin",),
+        roles=("User",),
+        granted=granted,
+    )
+
+
+@pytest.fixture
+def writer() -> ListWriter:
+    return ListWriter()
+
+
+@pytest.fixture
+def sink(writer: ListWriter) -> Iterator[AuditSink]:
+    registered = AuditSink(writer, record_grant=lambda event: "Admin" in event.required)
+    set_audit_sink(registered)
+    yield registered
+    set_audit_sink(None)
+    registered.close()
+
+
+class TestAuditSink:
+    def test_registration(self, sink: AuditSink) -> None:
+        assert get_audit_sink() is sink
+
+    def test_require_roles_records_denials(
+        self, sink: AuditSink, writer: ListWriter
+    ) -> None:
+        @require_roles("Admin", role_loader=lambda: ["User"])
+        def protected() -> None: ...
+
+        with pytest.raises(PermissionError):
+            protected()
+        sink.flush()
+
+        (recorded,) = writer.events
+        assert recorded.source == "require_roles"
+        assert recorded.target.endswith("protected")
+        assert recorded.roles == ("User",)
+        assert recorded.granted is False
+
+    def test_grants_filtered_by_record_grant(
+        self, sink: AuditSink, writer: ListWriter
+    ) -> None:
+        @require_roles("Admin", role_loader=lambda: ["Admin"])
+        def admin_only() -> None: ...
+
+        @require_roles("User", user_roles=["User"])
+        def user_page() -> None: ...
+
+        admin_only()
+        user_page()
+        sink.flush()
+
+        assert [e.target.rsplit(".", 1)[-1] for e in writer.events] == ["admin_only"]
+        assert writer.events[0].granted is True
+
+    def test_async_function(self, sink: AuditSink, writer: ListWriter) -> None:
+        async def load() -> list[str]:
+            return ["Guest"]
+
+        @require_roles(Policy.any_of("Admin"), role_loader=load)
+        async def protected() -> None: ...
+
+        with pytest.raises(PermissionError):
+            asyncio.run(protected())
+        sink.flush()
+
+        assert writer.events[0].roles == ("Guest",)
+
+    @pytest.mark.usefixtures("no_script_run_ctx")
+    def test_authorize_page(self, sink: AuditSink, writer: ListWriter) -> None:
+        mock_st = MagicMock()
+
+        with patch.dict("sys.modules", {"streamlit": mock_st}):
+            from streamlit_rbac._streamlit import authorize_page
+
+            authorize_page("Admin", role_loader=lambda: ["User"])
+            authorize_page("Admin", role_loader=lambda: [])
+        sink.flush()
+
+        assert [e.source for e in writer.events] == ["authorize_page"] * 2
+        assert writer.events[0].target == __file__
+
+    def test_batches(self, writer: ListWriter) -> None:
+        writer.gate.clear()
+        sink = AuditSink(writer, batch_size=3)
+        try:
+            for _ in range(7):
+                sink.emit(event())
+            writer.gate.set()
+            sink.flush()
+        finally:
+            sink.close()
+
+        assert sum(len(batch) for batch in writer.batches) == 7  # noqa: PLR2004
+        assert max(len(batch) for batch in writer.batches) <= 3  # noqa: PLR2004
+        assert sink.stats.written == 7  # noqa: PLR2004
+
+    def test_drop_when_full(self, writer: ListWriter) -> None:
+        writer.gate.clear()
+        sink = AuditSink(writer, maxsize=2, batch_size=1)
+        try:
+            # 1件目はライターに渡されて書き込み待ちになる
+            sink.emit(event())
+            assert writer.gate_waiting.wait(5)
+            for _ in range(5):
+                sink.emit(event())
+            stats = sink.stats
+            writer.gate.set()
+        finally:
+            sink.close()
+
+        assert stats.dropped == 3  # noqa: PLR2004
+        assert len(writer.events) == 3  # noqa: PLR2004
+
+    def test_block_when_full(self, writer: ListWriter) -> None:
+        writer.gate.clear()
+        sink = AuditSink(writer, maxsize=1, batch_size=1, backpressure="block")
+
+        def produce() -> None:
+            for _ in range(5):
+                sink.emit(event())
+
+        producer = threading.Thread(target=produce)
+        try:
+            producer.start()
+            producer.join(timeout=0.2)
+            assert producer.is_alive()
+            writer.gate.set()
+            producer.join()
+        finally:
+            sink.close()
+
+        assert sink.stats.dropped == 0
+        assert len(writer.events) == 5  # noqa: PLR2004
+
+    def test_close_flushes_and_closes_writer(self, writer: ListWriter) -> None:
+        sink = AuditSink(writer)
+        for _ in range(3):
+            sink.emit(event())
+
+        sink.close()
+        sink.emit(event())
+
+        assert len(writer.events) == 3  # noqa: PLR2004
+        assert writer.closed is True
+        assert sink.stats.dropped == 1
+
+    def test_close_during_emit_keeps_event(self, writer: ListWriter) -> None:
+        sink = AuditSink(writer)
+        put = sink._queue.put
+        closer = threading.Thread(target=sink.close)
+
+        def put_racing_close(item: AuditEvent | None, block: bool = True) -> None:
+            if item is not None:
+                # 投入の直前に別スレッドから close が呼ばれた状況を再現する
+                closer.start()
+                closer.join(timeout=0.1)
+            put(item, block=block)
+
+        with patch.object(sink._queue, "put", side_effect=put_racing_close):
+            sink.emit(event())
+            closer.join()
+
+        assert sink.stats.recorded == sink.stats.written == 1
+        assert len(writer.events) == 1
+
+    @pytest.mark.parametrize("backpressure", ["drop", "block"])
+    def test_close_while_emitting(
+        self, writer: ListWriter, backpressure: Backpressure
+    ) -> None:
+        sink = AuditSink(writer, maxsize=4, batch_size=2, backpressure=backpressure)
+        started = threading.Barrier(5)
+
+        def produce() -> None:
+            started.wait()
+            for _ in range(200):
+                sink.emit(event())
+
+        producers = [threading.Thread(target=produce) for _ in range(4)]
+        for producer in producers:
+            producer.start()
+        started.wait()
+        sink.close()
+        for producer in producers:
+            producer.join(timeout=5)
+            assert not producer.is_alive()
+
+        stats = sink.stats
+        assert stats.recorded == stats.written == len(writer.events)
+        assert stats.recorded + stats.dropped == 800  # noqa: PLR2004
+
+    def test_writer_errors_counted(self) -> None:
+        failing = MagicMock()
+        failing.write.side_effect = OSError("disk full")
+        sink = AuditSink(failing)
+        try:
+            sink.emit(event())
+            sink.flush()
+        finally:
+            sink.close()
+
+        assert sink.stats.failed == 1
+        assert isinstance(sink.last_error, OSError)
+
+    @pytest.mark.parametrize(("maxsize", "batch_size"), [(0, 1), (1, 0)])
+    def test_invalid_limits(
+        self, writer: ListWriter, maxsize: int, batch_size: int
+    ) -> None:
+        with pytest.raises(ValueError, match="must be positive"):
+            AuditSink(writer, maxsize=maxsize, batch_size=batch_size)
+
+
+class TestWriters:
+    def test_json_lines(self, tmp_path: Path) -> None:
+        path = tmp_path / "audit.jsonl"
+        sink = AuditSink(JSONLinesAuditWriter(path))
+        sink.emit(event())
+        sink.emit(event(granted=True))
+        sink.close()
+
+        lines = [json.loads(line) for line in path.read_text().splitlines()]
+        assert [line["granted"] for line in lines] == [False, True]
+        assert lines[0]["required"] == ["Admin"]
+
+    def test_sqlite(self, tmp_path: Path) -> None:
+        path = tmp_path / "audit.db"
+        sink = AuditSink(SQLiteAuditWriter(path))
+        sink.emit(event())
+        sink.close()
+
+        with sqlite3.connect(path) as connection:
+            rows = connection.execute(
+                "SELECT source, roles, granted FROM audit_log"
+            ).fetchall()
+        connection.close()
+        assert rows == [("test", '["User"]', 0)]
+
+    def test_sqlite_invalid_table(self, tmp_path: Path) -> None:
+        with pytest.raises(ValueError, match="Invalid table name"):
+            SQLiteAuditWriter(tmp_path / "audit.db", table="audit log")
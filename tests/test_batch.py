@@ -0,0 +1,94 @@
+"""バッチ認可のテスト."""
+
+import pytest
+
+from streamlit_rbac import (
+    DecisionCache,
+    Policy,
+    RoleHierarchy,
+    authorize_batch,
+    has_all_roles,
+    has_any_role,
+    has_role,
+    set_decision_cache,
+    set_role_hierarchy,
+)
+
+ROLE_SETS = [
+    ["Admin"],
+    ["Manager", "User"],
+    [],
+    ["User", "Manager"],
+    ["Admin"],
+    ["Contractor", "Manager"],
+]
+
+
+class TestAuthorizeBatch:
+    def test_matches_scalar_functions(self) -> None:
+        policies: list[str | Policy] = [
+            "Admin",
+            Policy.any_of("Admin", "Manager"),
+            Policy.all_of("Manager", "User"),
+            Policy.any_of("Manager") & Policy.none_of("Contractor"),
+        ]
+
+        matrix = authorize_batch(ROLE_SETS, policies)
+
+        assert len(matrix) == len(ROLE_SETS)
+        for roles, row in zip(ROLE_SETS, matrix, strict=True):
+            assert row == (
+                has_role("Admin", user_roles=roles),
+                has_any_role("Admin", "Manager", user_roles=roles),
+                has_all_roles("Manager", "User", user_roles=roles),
+                has_role("Manager", user_roles=roles)
+                and not has_role("Contractor", user_roles=roles),
+            )
+
+    def test_identical_role_sets_evaluated_once(self) -> None:
+        calls = 0
+
+        def evaluate(roles: frozenset[str]) -> bool:
+            nonlocal calls
+            calls += 1
+            return "Admin" in roles
+
+        policy = Policy(evaluate, description="counting")
+
+        matrix = authorize_batch(ROLE_SETS, [policy])
+
+        assert calls == len({frozenset(roles) for roles in ROLE_SETS})
+        assert matrix[0] is matrix[4]
+
+    def test_repeated_batches_hit_decision_cache(self) -> None:
+        cache = DecisionCache()
+        set_decision_cache(cache)
+        try:
+            first = authorize_batch(ROLE_SETS, ["Admin", "Manager"])
+            misses = cache.stats.misses
+            second = authorize_batch(ROLE_SETS, ["Admin", "Manager"])
+        finally:
+            set_decision_cache(None)
+
+        assert second == first
+        assert cache.stats.misses == misses
+        assert cache.stats.hits == misses
+
+    def test_with_hierarchy(self) -> None:
+        set_role_hierarchy(RoleHierarchy({"Admin": ["Manager"]}))
+        try:
+            assert authorize_batch([["Admin"]], ["Manager"]) == [(True,)]
+        finally:
+            set_role_hierarchy(None)
+
+    @pytest.mark.parametrize(
+        ("role_sets", "policies", "expected"),
+        [([], ["Admin"], []), ([["Admin"]], [], [()])],
+    )
+    def test_empty(
+        self,
+        role_sets: list[list[str]],
+        policies: list[str | Policy],
+        expected: list[tuple[bool, ...]],
+    ) -> None:
+        assert authorize_batch(role_sets, policies) == expected
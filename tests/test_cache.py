@@ -0,0 +1,202 @@
+"""ロールローダーキャッシュのテスト."""
+
+import threading
+
+import pytest
+
+from streamlit_rbac import CachedRoleLoader, has_role, require_roles
+from streamlit_rbac._cache import _StripedLRU
+from tests.helpers import CountingLoader, FakeClock
+
+
+@pytest.fixture
+def source() -> CountingLoader:
+    return CountingLoader({"alice": ["Admin"], "bob": ["User"]})
+
+
+class TestCachedRoleLoader:
+    def test_hit_after_first_call(self, source: CountingLoader) -> None:
+        loader = CachedRoleLoader(source, key=lambda: source.user)
+
+        assert has_role("Admin", role_loader=loader) is True
+        assert has_role("Admin", role_loader=loader) is True
+        assert source.calls == 1
+        assert loader.stats.hits == 1
+        assert loader.stats.misses == 1
+        assert loader.stats.hit_rate == pytest.approx(0.5)
+
+    def test_keyed_per_user(self, source: CountingLoader) -> None:
+        loader = CachedRoleLoader(source, key=lambda: source.user)
+
+        assert loader() == frozenset({"Admin"})
+        source.user = "bob"
+        assert loader() == frozenset({"User"})
+        assert source.calls == 2  # noqa: PLR2004
+
+    def test_ttl_expiry(self, source: CountingLoader) -> None:
+        clock = FakeClock()
+        loader = CachedRoleLoader(source, key=lambda: source.user, ttl=10, timer=clock)
+
+        loader()
+        clock.now = 9.9
+        loader()
+        assert source.calls == 1
+        clock.now = 10.0
+        loader()
+        assert source.calls == 2  # noqa: PLR2004
+
+    def test_lru_eviction(self, source: CountingLoader) -> None:
+        loader = CachedRoleLoader(source, key=lambda: source.user, maxsize=1)
+
+        loader()
+        source.user = "bob"
+        loader()
+        source.user = "alice"
+        loader()
+        assert source.calls == 3  # noqa: PLR2004
+        assert loader.stats.evictions == 2  # noqa: PLR2004
+        assert loader.stats.size == 1
+
+    def test_invalidate(self, source: CountingLoader) -> None:
+        loader = CachedRoleLoader(source, key=lambda: source.user)
+
+        loader()
+        source.roles["alice"] = ["User"]
+        loader.invalidate("alice")
+        assert loader() == frozenset({"User"})
+        assert source.calls == 2  # noqa: PLR2004
+
+    def test_clear(self, source: CountingLoader) -> None:
+        loader = CachedRoleLoader(source, key=lambda: source.user)
+
+        loader()
+        loader.clear()
+        assert loader.stats.size == 0
+        loader()
+        assert source.calls == 2  # noqa: PLR2004
+
+    @pytest.mark.parametrize("reset", ["invalidate", "clear"])
+    def test_invalidated_during_load_is_not_stored(self, reset: str) -> None:
+        roles = {"alice": ["Admin"]}
+        loader: CachedRoleLoader
+
+        def revoke_while_loading() -> list[str]:
+            stale = list(roles["alice"])
+            # 取得中にバックエンドのロールが変わり、キャッシュが破棄される
+            roles["alice"] = ["User"]
+            if reset == "invalidate":
+                loader.invalidate("alice")
+            else:
+                loader.clear()
+            return stale
+
+        loader = CachedRoleLoader(revoke_while_loading, key=lambda: "alice")
+
+        assert loader() == frozenset({"Admin"})
+        assert loader.stats.size == 0
+        assert loader() == frozenset({"User"})
+
+    def test_loader_exception_not_cached(self) -> None:
+        calls = 0
+
+        def flaky() -> list[str]:
+            nonlocal calls
+            calls += 1
+            if calls == 1:
+                raise RuntimeError("loader failed")
+            return ["Admin"]
+
+        loader = CachedRoleLoader(flaky, key=lambda: "alice")
+
+        with pytest.raises(RuntimeError, match="loader failed"):
+            loader()
+        assert loader() == frozenset({"Admin"})
+
+    def test_with_require_roles(self, source: CountingLoader) -> None:
+        loader = CachedRoleLoader(source, key=lambda: source.user)
+
+        @require_roles("Admin", role_loader=loader)
+        def action() -> str:
+            return "ok"
+
+        assert action() == "ok"
+        assert action() == "ok"
+        assert source.calls == 1
+
+    @pytest.mark.parametrize(
+        ("ttl", "maxsize", "message"),
+        [(0, 1024, "ttl must be positive"), (300.0, 0, "maxsize")],
+    )
+    def test_invalid_arguments(self, ttl: float, maxsize: int, message: str) -> None:
+        with pytest.raises(ValueError, match=message):
+            CachedRoleLoader(lambda: [], key=lambda: "alice", ttl=ttl, maxsize=maxsize)
+
+    def test_equal_large_role_sets_share_one_instance(self) -> None:
+        roles = [f"group-{i}" for i in range(1000)]
+        loader = CountingLoader({"alice": list(roles), "bob": list(roles)})
+        cached = CachedRoleLoader(loader, key=lambda: loader.user)
+
+        alice = cached()
+        loader.user = "bob"
+
+        assert cached() is alice
+
+
+class TestStripedLRU:
+    def test_small_cache_uses_single_stripe(self) -> None:
+        cache: _StripedLRU[int, int] = _StripedLRU(8)
+
+        for key in range(10):
+            cache.put(key, key)
+
+        assert cache.get(0) is None
+        assert cache.get(9) == 9  # noqa: PLR2004
+        assert cache.stats().size == 8  # noqa: PLR2004
+
+    def test_capacity_split_across_stripes(self) -> None:
+        maxsize = 1000
+        cache: _StripedLRU[int, int] = _StripedLRU(maxsize, stripes=16)
+
+        for key in range(maxsize * 3):
+            cache.put(key, key)
+
+        stats = cache.stats()
+        assert stats.size <= maxsize
+        assert stats.evictions == maxsize * 3 - stats.size
+
+    def test_is_valid(self) -> None:
+        cache: _StripedLRU[str, int] = _StripedLRU(8)
+        cache.put("a", 1)
+
+        assert cache.get("a", lambda value: value > 1) is None
+        assert cache.get("a", lambda value: value == 1) == 1
+        assert (cache.stats().hits, cache.stats().misses) == (1, 1)
+
+    def test_concurrent_access(self) -> None:
+        calls_per_thread = 2000
+        threads = 8
+        users = [f"user{i}" for i in range(64)]
+        local = threading.local()
+        loader = CachedRoleLoader(
+            lambda: [local.user], key=lambda: local.user, maxsize=128
+        )
+        errors: list[str] = []
+
+        def worker(offset: int) -> None:
+            for i in range(calls_per_thread):
+                local.user = users[(i + offset) % len(users)]
+                if loader() != frozenset({local.user}):
+                    errors.append(local.user)
+
+        workers = [
+            threading.Thread(target=worker, args=(index,)) for index in range(threads)
+        ]
+        for thread in workers:
+            thread.start()
+        for thread in workers:
+            thread.join()
+
+        stats = loader.stats
+        assert errors == []
+        assert stats.hits + stats.misses == calls_per_thread * threads
+        assert stats.size == len(users)
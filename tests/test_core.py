@@ -2,7 +2,15 @@
 
 import pytest
 
-from streamlit_rbac import has_all_roles, has_any_role, has_role
+from streamlit_rbac import (
+    has_all_roles,
+    has_any_role,
+    has_role,
+)
+from streamlit_rbac._core import _INTERN_THRESHOLD, _as_role_set, _intern_roles
+from tests.helpers import RegisterHierarchy
+
+LARGE_ROLES = [f"group-{i}" for i in range(5000)]
 
 
 class TestHasRole:
@@ -102,3 +110,49 @@ class TestRoleLoaderExceptionPropagation:
 
         with pytest.raises(RuntimeError, match="loader failed"):
             has_all_roles("Admin", role_loader=bad_loader)
+
+
+@pytest.fixture
+def hierarchy(register_hierarchy: RegisterHierarchy) -> None:
+    register_hierarchy({"group-4999": ["Admin"]})
+
+
+class TestLargeRoleSets:
+    def test_frozenset_is_not_copied(self) -> None:
+        roles = frozenset({"Admin", "User"})
+
+        assert _as_role_set(roles) is roles
+
+    def test_large_sets_are_interned(self) -> None:
+        first = _intern_roles(list(LARGE_ROLES))
+        second = _intern_roles(reversed(LARGE_ROLES))
+
+        assert first == frozenset(LARGE_ROLES)
+        assert first is second
+
+    def test_small_sets_are_not_interned(self) -> None:
+        roles = [f"role-{i}" for i in range(_INTERN_THRESHOLD - 1)]
+
+        assert _intern_roles(roles) is not _intern_roles(roles)
+
+    @pytest.mark.parametrize("user_roles", [LARGE_ROLES, tuple(LARGE_ROLES)])
+    def test_direct_scan(self, user_roles: list[str]) -> None:
+        assert has_role("group-4999", user_roles=user_roles)
+        assert not has_role("Admin", user_roles=user_roles)
+        assert has_any_role("Admin", "group-0", user_roles=user_roles)
+        assert has_any_role("group-10", user_roles=user_roles)
+        assert not has_any_role("Admin", "Manager", user_roles=user_roles)
+        assert has_all_roles("group-0", "group-4999", user_roles=user_roles)
+        assert has_all_roles("group-10", user_roles=user_roles)
+        assert not has_all_roles("group-0", "Admin", user_roles=user_roles)
+        assert not has_all_roles("Admin", user_roles=user_roles)
+
+    @pytest.mark.usefixtures("hierarchy")
+    def test_direct_scan_skipped_with_hierarchy(self) -> None:
+        assert has_role("Admin", user_roles=LARGE_ROLES)
+        assert has_any_role("Admin", "Manager", user_roles=LARGE_ROLES)
+        assert has_all_roles("Admin", "group-0", user_roles=LARGE_ROLES)
+
+    def test_direct_scan_keeps_source_check(self) -> None:
+        with pytest.raises(ValueError, match="mutually exclusive"):
+            has_any_role("Admin", user_roles=["Admin"], role_loader=list)
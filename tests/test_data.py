@@ -0,0 +1,185 @@
+"""行・列レベルのデータフィルタのテスト."""
+
+import pytest
+
+from streamlit_rbac import (
+    PermissionMap,
+    Policy,
+    RoleDataFilter,
+    permission_policy,
+    set_permission_map,
+)
+from tests.helpers import RegisterHierarchy
+
+ROWS = {
+    "name": ["a", "b", "c", "d"],
+    "visible_to": ["Admin", "User", "Manager", None],
+    "salary": [100, 200, 300, 400],
+}
+
+
+@pytest.fixture
+def hierarchy(register_hierarchy: RegisterHierarchy) -> None:
+    register_hierarchy({"Admin": ["Manager"], "Manager": ["User"]})
+
+
+class TestRoleDataFilterMapping:
+    def test_filters_rows_by_role(self) -> None:
+        data_filter = RoleDataFilter("visible_to")
+
+        result = data_filter.apply(ROWS, user_roles=["User"])
+
+        assert result == {"name": ["b"], "visible_to": ["User"], "salary": [200]}
+
+    def test_missing_values_hidden(self) -> None:
+        data_filter = RoleDataFilter("visible_to")
+
+        result = data_filter.apply(ROWS, user_roles=["Admin", "User", "Manager"])
+
+        assert result["name"] == ["a", "b", "c"]
+
+    def test_list_cells_match_any_role(self) -> None:
+        data = {"visible_to": [["Admin", "Manager"], ["User"], []]}
+        data_filter = RoleDataFilter("visible_to")
+
+        result = data_filter.apply(data, user_roles=["Manager"])
+
+        assert result == {"visible_to": [["Admin", "Manager"]]}
+
+    def test_column_roles(self) -> None:
+        data_filter = RoleDataFilter(
+            "visible_to",
+            column_roles={"salary": "Admin", "name": Policy.none_of("Guest")},
+        )
+
+        result = data_filter.apply(ROWS, user_roles=["User"])
+
+        assert list(result) == ["name", "visible_to"]
+
+    @pytest.mark.usefixtures("hierarchy")
+    def test_hierarchy_expands_roles(self) -> None:
+        data_filter = RoleDataFilter("visible_to", column_roles={"salary": "Manager"})
+
+        result = data_filter.apply(ROWS, user_roles=["Admin"])
+
+        assert result["name"] == ["a", "b", "c"]
+        assert "salary" in result
+
+    def test_role_loader(self) -> None:
+        data_filter = RoleDataFilter("visible_to")
+
+        result = data_filter.apply(ROWS, role_loader=lambda: ["Manager"])
+
+        assert result["name"] == ["c"]
+
+    def test_unsupported_type(self) -> None:
+        data_filter = RoleDataFilter("visible_to")
+
+        with pytest.raises(TypeError, match="Unsupported data type: list"):
+            data_filter.apply([1, 2], user_roles=["User"])
+
+    def test_missing_role_column(self) -> None:
+        data_filter = RoleDataFilter("owner")
+
+        with pytest.raises(KeyError):
+            data_filter.apply(ROWS, user_roles=["User"])
+
+
+class TestVisibleColumns:
+    def test_cached_per_role_set(self) -> None:
+        calls = 0
+
+        def evaluate(roles: frozenset[str]) -> bool:
+            nonlocal calls
+            calls += 1
+            return "Admin" in roles
+
+        data_filter = RoleDataFilter(
+            "visible_to",
+            column_roles={"salary": Policy(evaluate, description="counting")},
+        )
+        columns = ["name", "salary"]
+
+        for _ in range(3):
+            assert data_filter.visible_columns(columns, frozenset({"User"})) == (
+                "name",
+            )
+        assert data_filter.visible_columns(columns, frozenset({"Admin"})) == (
+            "name",
+            "salary",
+        )
+        assert calls == 2  # noqa: PLR2004
+
+    def test_follows_config_changes(self) -> None:
+        data_filter = RoleDataFilter(
+            "visible_to", column_roles={"salary": permission_policy("salary:view")}
+        )
+        columns = ["name", "salary"]
+        roles = frozenset({"Manager"})
+
+        set_permission_map(PermissionMap({"Admin": ["salary:view"]}))
+        try:
+            assert data_filter.visible_columns(columns, roles) == ("name",)
+            set_permission_map(PermissionMap({"Manager": ["salary:view"]}))
+            assert data_filter.visible_columns(columns, roles) == ("name", "salary")
+        finally:
+            set_permission_map(None)
+
+
+class TestRoleDataFilterPandas:
+    def test_filters_rows_and_columns(self) -> None:
+        pd = pytest.importorskip("pandas")
+        frame = pd.DataFrame(ROWS)
+        data_filter = RoleDataFilter("visible_to", column_roles={"salary": "Admin"})
+
+        result = data_filter.apply(frame, user_roles=["User", "Manager"])
+
+        assert list(result.columns) == ["name", "visible_to"]
+        assert result["name"].tolist() == ["b", "c"]
+
+    def test_categorical_column(self) -> None:
+        pd = pytest.importorskip("pandas")
+        frame = pd.DataFrame(ROWS).astype({"visible_to": "category"})
+        data_filter = RoleDataFilter("visible_to")
+
+        result = data_filter.apply(frame, user_roles=["Admin"])
+
+        assert result["name"].tolist() == ["a"]
+
+    def test_list_cells(self) -> None:
+        pd = pytest.importorskip("pandas")
+        frame = pd.DataFrame(
+            {"name": ["a", "b", "c"], "visible_to": [["Admin", "User"], [], None]},
+            index=[10, 20, 30],
+        )
+        data_filter = RoleDataFilter("visible_to")
+
+        result = data_filter.apply(frame, user_roles=["User"])
+
+        assert result["name"].tolist() == ["a"]
+
+
+class TestRoleDataFilterArrow:
+    def test_filters_rows_and_columns(self) -> None:
+        pa = pytest.importorskip("pyarrow")
+        table = pa.table(ROWS)
+        data_filter = RoleDataFilter("visible_to", column_roles={"salary": "Admin"})
+
+        result = data_filter.apply(table, user_roles=["User", "Manager"])
+
+        assert result.column_names == ["name", "visible_to"]
+        assert result.column("name").to_pylist() == ["b", "c"]
+
+    def test_list_cells(self) -> None:
+        pa = pytest.importorskip("pyarrow")
+        table = pa.table(
+            {
+                "name": ["a", "b", "c", "d"],
+                "visible_to": [["Admin", "User"], [], None, ["Manager"]],
+            }
+        )
+        data_filter = RoleDataFilter("visible_to")
+
+        result = data_filter.apply(table, user_roles=["User", "Manager"])
+
+        assert result.column("name").to_pylist() == ["a", "d"]
@@ -0,0 +1,174 @@
+"""認可判定キャッシュのテスト."""
+
+import threading
+from collections.abc import Iterator
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from streamlit_rbac import (
+    DecisionCache,
+    PermissionMap,
+    Policy,
+    RoleHierarchy,
+    get_decision_cache,
+    has_permission,
+    require_roles,
+    set_decision_cache,
+    set_permission_map,
+    set_role_hierarchy,
+)
+
+
+class CountingPolicy:
+    def __init__(self, role: str) -> None:
+        self.calls = 0
+        self.policy = Policy(self._evaluate, description=f"counting {role}")
+        self.role = role
+
+    def _evaluate(self, roles: frozenset[str]) -> bool:
+        self.calls += 1
+        return self.role in roles
+
+
+@pytest.fixture
+def cache() -> Iterator[DecisionCache]:
+    registered = DecisionCache(maxsize=2)
+    set_decision_cache(registered)
+    yield registered
+    set_decision_cache(None)
+
+
+class TestDecisionCache:
+    def test_registration(self, cache: DecisionCache) -> None:
+        assert get_decision_cache() is cache
+
+    @pytest.mark.usefixtures("cache")
+    def test_hit_for_same_roles_and_policy(self) -> None:
+        counting = CountingPolicy("Admin")
+
+        for _ in range(3):
+            assert counting.policy.allows(user_roles=["Admin"]) is True
+            assert counting.policy.allows(user_roles=["User"]) is False
+
+        assert counting.calls == 2  # noqa: PLR2004
+
+    def test_keyed_by_policy_identity(self, cache: DecisionCache) -> None:
+        first = CountingPolicy("Admin")
+        second = CountingPolicy("Admin")
+
+        first.policy.evaluate(frozenset({"Admin"}))
+        second.policy.evaluate(frozenset({"Admin"}))
+
+        assert (first.calls, second.calls) == (1, 1)
+        assert cache.stats.size == 2  # noqa: PLR2004
+
+    def test_lru_eviction(self, cache: DecisionCache) -> None:
+        counting = CountingPolicy("Admin")
+        admin, user, guest = (frozenset({r}) for r in ("Admin", "User", "Guest"))
+
+        counting.policy.evaluate(admin)
+        counting.policy.evaluate(user)
+        counting.policy.evaluate(admin)
+        counting.policy.evaluate(guest)
+        counting.policy.evaluate(admin)
+
+        assert counting.calls == 3  # noqa: PLR2004
+        assert cache.stats.evictions == 1
+
+    def test_cleared_on_config_change(self, cache: DecisionCache) -> None:
+        set_permission_map(PermissionMap({"Admin": ["report:view"]}))
+        try:
+            assert has_permission("report:view", user_roles=["Manager"]) is False
+            set_permission_map(PermissionMap({"Manager": ["report:view"]}))
+            assert has_permission("report:view", user_roles=["Manager"]) is True
+            set_role_hierarchy(RoleHierarchy({"Admin": ["Manager"]}))
+            assert cache.stats.size == 0
+        finally:
+            set_permission_map(None)
+            set_role_hierarchy(None)
+
+    @pytest.mark.usefixtures("cache")
+    def test_require_roles(self) -> None:
+        counting = CountingPolicy("Admin")
+
+        @require_roles(counting.policy, role_loader=lambda: ["Admin"])
+        def protected() -> str:
+            return "ok"
+
+        assert [protected() for _ in range(3)] == ["ok"] * 3
+        assert counting.calls == 1
+
+    def test_page_guards_share_entries(self, cache: DecisionCache) -> None:
+        mock_st = MagicMock()
+        set_permission_map(PermissionMap({"Admin": ["report:view"]}))
+        try:
+            with (
+                patch.dict("sys.modules", {"streamlit": mock_st}),
+                patch(
+                    "streamlit_rbac._streamlit._get_script_run_ctx", return_value=None
+                ),
+            ):
+                from streamlit_rbac._streamlit import (  # noqa: PLC0415
+                    authorize_page,
+                    authorize_permission,
+                    authorized,
+                )
+
+                # rerun ごとにページスクリプトが再実行される状況を模擬する
+                for _ in range(10):
+                    authorize_page("Admin", role_loader=lambda: ["Admin"])
+                    authorize_permission("report:view", role_loader=lambda: ["Admin"])
+                    authorized("Admin", role_loader=lambda: ["Admin"])
+        finally:
+            set_permission_map(None)
+
+        mock_st.stop.assert_not_called()
+        assert cache.stats.size == 2  # noqa: PLR2004
+        assert cache.stats.misses == 2  # noqa: PLR2004
+        assert cache.stats.hits == 28  # noqa: PLR2004
+
+    def test_without_registration(self) -> None:
+        counting = CountingPolicy("Admin")
+
+        counting.policy.evaluate(frozenset({"Admin"}))
+        counting.policy.evaluate(frozenset({"Admin"}))
+
+        assert counting.calls == 2  # noqa: PLR2004
+
+    def test_clear(self, cache: DecisionCache) -> None:
+        Policy.any_of("Admin").evaluate(frozenset({"Admin"}))
+
+        cache.clear()
+
+        assert cache.stats.size == 0
+
+    def test_concurrent_access(self) -> None:
+        cache = DecisionCache(maxsize=8)
+        set_decision_cache(cache)
+        policies = [Policy.any_of(f"R{i}") for i in range(4)]
+        role_sets = [frozenset({f"R{i}"}) for i in range(4)]
+        errors: list[AssertionError] = []
+
+        def worker() -> None:
+            for _ in range(200):
+                for i, policy in enumerate(policies):
+                    for j, roles in enumerate(role_sets):
+                        if policy.evaluate(roles) is not (i == j):
+                            errors.append(AssertionError((i, j)))
+
+        try:
+            threads = [threading.Thread(target=worker) for _ in range(8)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        finally:
+            set_decision_cache(None)
+
+        assert errors == []
+        assert cache.stats.size <= 8  # noqa: PLR2004
+
+    def test_invalid_maxsize(self) -> None:
+        with pytest.raises(ValueError, match="maxsize must be positive"):
+            DecisionCache(maxsize=0)
@@ -1,8 +1,18 @@
 """デコレータのテスト."""
 
+from collections.abc import Iterator
+
 import pytest
 
-from streamlit_rbac import require_roles
+from streamlit_rbac import (
+    PermissionMap,
+    Policy,
+    RoleHierarchy,
+    require_permission,
+    require_roles,
+    set_permission_map,
+    set_role_hierarchy,
+)
 
 
 class TestRequireRoles:
@@ -104,3 +114,77 @@ class TestRequireRoles:
 
         with pytest.raises(RuntimeError, match="loader failed"):
             action()
+
+
+class TestRequireRolesPolicy:
+    def test_with_policy(self) -> None:
+        @require_roles(Policy.all_of("Admin", "Auditor"), user_roles=["Admin"])
+        def action() -> str:
+            return "ok"
+
+        with pytest.raises(PermissionError, match="all of"):
+            action()
+
+    def test_roles_and_policy_combined_with_or(self) -> None:
+        @require_roles("Admin", Policy.none_of("Guest"), user_roles=["User"])
+        def action() -> str:
+            return "ok"
+
+        assert action() == "ok"
+
+    def test_static_user_roles_resolved_once(self) -> None:
+        def roles() -> Iterator[str]:
+            yield "Admin"
+
+        @require_roles("Admin", user_roles=roles())
+        def action() -> str:
+            return "ok"
+
+        assert action() == "ok"
+        assert action() == "ok"
+
+    def test_static_user_roles_follow_config_changes(self) -> None:
+        @require_roles("Manager", user_roles=["Admin"])
+        def manage() -> str:
+            return "ok"
+
+        # デコレート時点で未登録のパーミッション定義も、呼び出し時に参照される
+        @require_permission("report:view", user_roles=["Manager"])
+        def view_report() -> str:
+            return "ok"
+
+        with pytest.raises(PermissionError):
+            manage()
+        set_role_hierarchy(RoleHierarchy({"Admin": ["Manager"]}))
+        set_permission_map(PermissionMap({"Manager": ["report:view"]}))
+        try:
+            assert manage() == "ok"
+            assert view_report() == "ok"
+            set_permission_map(PermissionMap({"Admin": ["report:view"]}))
+            with pytest.raises(PermissionError):
+                view_report()
+        finally:
+            set_role_hierarchy(None)
+            set_permission_map(None)
+
+    def test_mutual_exclusion_checked_at_decoration(self) -> None:
+        with pytest.raises(ValueError, match="mutually exclusive"):
+            require_roles("Admin", user_roles=["Admin"], role_loader=lambda: [])
+        with pytest.raises(ValueError, match="must be specified"):
+            require_roles("Admin")
+
+    def test_role_loader_called_per_call(self) -> None:
+        calls = 0
+
+        def loader() -> list[str]:
+            nonlocal calls
+            calls += 1
+            return ["Admin"]
+
+        @require_roles("Admin", role_loader=loader)
+        def action() -> str:
+            return "ok"
+
+        action()
+        action()
+        assert calls == 2  # noqa: PLR2004
@@ -0,0 +1,105 @@
+"""ポリシー式のテスト."""
+
+import re
+
+import pytest
+
+from streamlit_rbac import Policy, parse_policy, require_roles
+
+EXPRESSION = "Admin or (Manager and not Contractor)"
+
+
+class TestParsePolicy:
+    @pytest.mark.parametrize(
+        ("user_roles", "expected"),
+        [
+            (["Admin"], True),
+            (["Manager"], True),
+            (["Manager", "Contractor"], False),
+            (["Admin", "Contractor"], True),
+            (["User"], False),
+            ([], False),
+        ],
+    )
+    def test_evaluates(self, user_roles: list[str], expected: bool) -> None:
+        assert parse_policy(EXPRESSION).allows(user_roles=user_roles) is expected
+
+    @pytest.mark.parametrize(
+        ("expression", "user_roles", "expected"),
+        [
+            ("A or B and C", ["A"], True),
+            ("A or B and C", ["B"], False),
+            ("(A or B) and C", ["A"], False),
+            ("not A and B", ["B"], True),
+            ("not not A", ["A"], True),
+            ("not (A or B)", ["B"], False),
+        ],
+    )
+    def test_precedence(
+        self, expression: str, user_roles: list[str], expected: bool
+    ) -> None:
+        assert parse_policy(expression).allows(user_roles=user_roles) is expected
+
+    def test_role_name_characters(self) -> None:
+        policy = parse_policy("""report:view or 'Team Lead' or "org-admin" """)
+
+        assert policy.roles == frozenset({"report:view", "Team Lead", "org-admin"})
+        assert policy.allows(user_roles=["Team Lead"]) is True
+
+    def test_description_is_expression(self) -> None:
+        policy = parse_policy(f"  {EXPRESSION} ")
+
+        assert policy.description == EXPRESSION
+        assert policy.roles == frozenset({"Admin", "Manager", "Contractor"})
+
+    def test_parse_cache(self) -> None:
+        assert parse_policy(EXPRESSION) is parse_policy(EXPRESSION)
+
+    def test_short_circuit(self) -> None:
+        calls = 0
+
+        def load() -> list[str]:
+            nonlocal calls
+            calls += 1
+            return ["Admin"]
+
+        policy = parse_policy(EXPRESSION)
+
+        assert policy.allows(role_loader=load) is True
+        assert calls == 1
+
+    def test_resolved_once_per_evaluation(self) -> None:
+        evaluated: list[frozenset[str]] = []
+
+        def spy(roles: frozenset[str]) -> bool:
+            evaluated.append(roles)
+            return True
+
+        combined = parse_policy("Admin") | Policy(spy, description="spy")
+
+        combined.allows(role_loader=lambda: ["User"])
+
+        assert evaluated == [frozenset({"User"})]
+
+    @pytest.mark.parametrize(
+        ("expression", "message"),
+        [
+            ("", "expected a role name, 'not' or '\\(', found end of expression"),
+            ("Admin and", "found end of expression"),
+            ("(Admin or User", "expected '\\)'"),
+            ("Admin User", "found 'User' at position 6"),
+            ("Admin or )", "found '\\)' at position 9"),
+            ("'Admin", "Unterminated quote at position 0"),
+        ],
+    )
+    def test_invalid_expression(self, expression: str, message: str) -> None:
+        with pytest.raises(ValueError, match=message):
+            parse_policy(expression)
+
+    def test_require_roles(self) -> None:
+        @require_roles(parse_policy(EXPRESSION), role_loader=lambda: ["Contractor"])
+        def protected() -> str:
+            return "ok"
+
+        with pytest.raises(PermissionError, match=re.escape(f"required {EXPRESSION}")):
+            protected()
@@ -0,0 +1,107 @@
+"""ロール階層のテスト."""
+
+import pytest
+
+from streamlit_rbac import (
+    Policy,
+    RoleHierarchy,
+    RoleRegistry,
+    get_role_hierarchy,
+    has_all_roles,
+    has_any_role,
+    has_role,
+    require_roles,
+)
+from streamlit_rbac._hierarchy import _EXPAND_CACHE_SIZE
+from tests.helpers import RegisterHierarchy
+
+
+@pytest.fixture
+def hierarchy(register_hierarchy: RegisterHierarchy) -> RoleHierarchy:
+    return register_hierarchy(
+        {
+            "Admin": ["Manager", "Auditor"],
+            "Manager": ["User"],
+            "Auditor": ["User"],
+        }
+    )
+
+
+class TestRoleHierarchy:
+    def test_transitive_closure(self) -> None:
+        hierarchy = RoleHierarchy({"Admin": ["Manager"], "Manager": ["User"]})
+
+        assert hierarchy.implied("Admin") == frozenset({"Admin", "Manager", "User"})
+        assert hierarchy.implied("User") == frozenset({"User"})
+        assert hierarchy.implied("Guest") == frozenset({"Guest"})
+
+    def test_expand(self) -> None:
+        hierarchy = RoleHierarchy({"Admin": ["Manager"], "Manager": ["User"]})
+
+        assert hierarchy.expand(["Manager", "Guest"]) == frozenset(
+            {"Manager", "User", "Guest"}
+        )
+
+    def test_expand_returns_same_set_when_nothing_implied(self) -> None:
+        hierarchy = RoleHierarchy({"Admin": ["Manager"]})
+        roles = frozenset({"User"})
+
+        assert hierarchy.expand(roles) is roles
+
+    def test_expand_reuses_results_and_stays_bounded(self) -> None:
+        hierarchy = RoleHierarchy({"Admin": ["Manager"]})
+
+        first = hierarchy.expand(["Admin"])
+        assert hierarchy.expand(["Admin"]) is first
+        for i in range(_EXPAND_CACHE_SIZE + 1):
+            hierarchy.expand([f"Role{i}"])
+        assert len(hierarchy._expanded) <= _EXPAND_CACHE_SIZE
+        assert hierarchy.expand(["Admin"]) == first
+
+    @pytest.mark.parametrize(
+        ("inherits", "cycle"),
+        [
+            ({"Admin": ["Admin"]}, "Admin -> Admin"),
+            (
+                {"Admin": ["Manager"], "Manager": ["User"], "User": ["Manager"]},
+                "Manager -> User -> Manager",
+            ),
+        ],
+    )
+    def test_cycle_detection(self, inherits: dict[str, list[str]], cycle: str) -> None:
+        with pytest.raises(
+            ValueError, match=f"Cycle detected in role hierarchy: {cycle}"
+        ):
+            RoleHierarchy(inherits)
+
+
+class TestRegisteredHierarchy:
+    def test_get_role_hierarchy(self, hierarchy: RoleHierarchy) -> None:
+        assert get_role_hierarchy() is hierarchy
+
+    @pytest.mark.usefixtures("hierarchy")
+    def test_core_functions(self) -> None:
+        assert has_role("User", user_roles=["Admin"]) is True
+        assert has_any_role("Manager", role_loader=lambda: ["Admin"]) is True
+        assert has_all_roles("Manager", "Auditor", user_roles=["Admin"]) is True
+        assert has_role("Admin", user_roles=["Manager"]) is False
+
+    @pytest.mark.usefixtures("hierarchy")
+    def test_policy_and_decorator(self) -> None:
+        @require_roles("User", role_loader=lambda: ["Manager"])
+        def action() -> str:
+            return "ok"
+
+        assert action() == "ok"
+        assert Policy.none_of("User").allows(user_roles=["Admin"]) is False
+
+    @pytest.mark.usefixtures("hierarchy")
+    def test_registry(self) -> None:
+        registry = RoleRegistry(["Admin", "Manager", "Auditor", "User"])
+
+        assert registry.has_role("User", user_roles=["Admin"]) is True
+        assert registry.has_role("User", role_loader=lambda: ["Manager"]) is True
+
+    def test_unregistered(self) -> None:
+        assert get_role_hierarchy() is None
+        assert has_role("User", user_roles=["Admin"]) is False
@@ -36,6 +36,10 @@ class TestLazyImport:
 
         assert callable(authorize_page)
 
+    def test_all_exports_resolvable(self) -> None:
+        for name in streamlit_rbac.__all__:
+            assert getattr(streamlit_rbac, name) is not None, name
+
     def test_invalid_attribute_raises_error(self) -> None:
         with pytest.raises(AttributeError, match="no_such_function"):
             streamlit_rbac.no_such_function  # noqa: B018
@@ -0,0 +1,280 @@
+"""計測フックのテスト."""
+# ruff: noqa: PLC0415
+
+import asyncio
+import threading
+from collections.abc import Iterator
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from streamlit_rbac import (
+    CachedRoleLoader,
+    DecisionCache,
+    MetricsAggregator,
+    PermissionMap,
+    Policy,
+    authorize_batch,
+    get_metrics_hook,
+    has_all_roles,
+    has_all_roles_async,
+    has_any_role,
+    has_any_role_async,
+    has_permission,
+    has_role,
+    has_role_async,
+    require_roles,
+    set_decision_cache,
+    set_metrics_hook,
+    set_permission_map,
+)
+
+
+def load_roles() -> list[str]:
+    return ["User"]
+
+
+@pytest.fixture
+def metrics() -> Iterator[MetricsAggregator]:
+    aggregator = MetricsAggregator()
+    set_metrics_hook(aggregator)
+    yield aggregator
+    set_metrics_hook(None)
+
+
+class TestMetricsHook:
+    def test_registration(self, metrics: MetricsAggregator) -> None:
+        assert get_metrics_hook() is metrics
+
+    def test_core_checks(self, metrics: MetricsAggregator) -> None:
+        has_role("Admin", user_roles=["Admin"])
+        has_role("Admin", role_loader=load_roles)
+        has_any_role("Admin", "User", user_roles=("User",))
+        has_all_roles("Admin", "User", user_roles={"User"})
+
+        assert metrics.snapshot()["checks"] == {
+            "has_role": {"one of ('Admin',)": {"granted": 1, "denied": 1}},
+            "has_any_role": {"one of ('Admin', 'User')": {"granted": 1, "denied": 0}},
+            "has_all_roles": {"all of ('Admin', 'User')": {"granted": 0, "denied": 1}},
+        }
+
+    def test_async_checks(self, metrics: MetricsAggregator) -> None:
+        async def checks() -> None:
+            await has_role_async("Admin", role_loader=load_roles)
+            await has_any_role_async("Admin", "User", user_roles=["User"])
+            await has_all_roles_async("Admin", "User", user_roles=["User"])
+
+        asyncio.run(checks())
+
+        assert metrics.snapshot()["checks"] == {
+            "has_role_async": {"one of ('Admin',)": {"granted": 0, "denied": 1}},
+            "has_any_role_async": {
+                "one of ('Admin', 'User')": {"granted": 1, "denied": 0}
+            },
+            "has_all_roles_async": {
+                "all of ('Admin', 'User')": {"granted": 0, "denied": 1}
+            },
+        }
+
+    def test_has_permission(self, metrics: MetricsAggregator) -> None:
+        set_permission_map(PermissionMap({"User": ["report:view"]}))
+        try:
+            has_permission("report:view", role_loader=load_roles)
+            has_permission("member:delete", user_roles=["User"])
+        finally:
+            set_permission_map(None)
+
+        assert metrics.snapshot()["checks"]["has_permission"] == {
+            "permission 'report:view'": {"granted": 1, "denied": 0},
+            "permission 'member:delete'": {"granted": 0, "denied": 1},
+        }
+
+    def test_policy_allows(self, metrics: MetricsAggregator) -> None:
+        policy = Policy.all_of("Admin", "User")
+
+        policy.allows(role_loader=load_roles)
+        policy.evaluate(frozenset({"Admin", "User"}))
+
+        assert metrics.snapshot()["checks"] == {
+            "Policy.allows": {"all of ('Admin', 'User')": {"granted": 0, "denied": 1}}
+        }
+
+    def test_authorize_batch(self, metrics: MetricsAggregator) -> None:
+        authorize_batch(
+            [["Admin"], ["User"], ["Admin"]], ["Admin", Policy.any_of("User")]
+        )
+
+        assert metrics.snapshot()["checks"]["authorize_batch"] == {
+            "one of ('Admin',)": {"granted": 2, "denied": 1},
+            "one of ('User',)": {"granted": 1, "denied": 2},
+        }
+
+    def test_require_roles(self, metrics: MetricsAggregator) -> None:
+        @require_roles("Admin", role_loader=load_roles)
+        def admin_only() -> None:
+            pass
+
+        @require_roles("User", role_loader=load_roles)
+        def user_only() -> None:
+            pass
+
+        user_only()
+        with pytest.raises(PermissionError):
+            admin_only()
+
+        checks = metrics.snapshot()["checks"]["require_roles"]
+        assert checks["one of ('Admin',)"] == {"granted": 0, "denied": 1}
+        assert checks["one of ('User',)"] == {"granted": 1, "denied": 0}
+
+    @pytest.mark.usefixtures("no_script_run_ctx")
+    def test_authorize_page(self, metrics: MetricsAggregator) -> None:
+        mock_st = MagicMock()
+
+        with patch.dict("sys.modules", {"streamlit": mock_st}):
+            from streamlit_rbac._streamlit import authorize_page
+
+            authorize_page(Policy.any_of("User"), role_loader=load_roles)
+            authorize_page("Admin", role_loader=load_roles)
+
+        assert metrics.snapshot()["checks"]["authorize_page"] == {
+            "one of ('User',)": {"granted": 1, "denied": 0},
+            "one of ('Admin',)": {"granted": 0, "denied": 1},
+        }
+
+    def test_loader_timing(self, metrics: MetricsAggregator) -> None:
+        has_role("Admin", role_loader=load_roles)
+        has_role("User", role_loader=load_roles)
+
+        loaders = metrics.snapshot()["loaders"]
+        assert loaders["load_roles"]["count"] == 2  # noqa: PLR2004
+        assert loaders["load_roles"]["seconds"] >= 0
+
+    def test_loader_timing_on_exception(self, metrics: MetricsAggregator) -> None:
+        def failing() -> list[str]:
+            raise RuntimeError("loader failed")
+
+        with pytest.raises(RuntimeError):
+            has_role("Admin", role_loader=failing)
+
+        ((name, loader),) = metrics.snapshot()["loaders"].items()
+        assert name.endswith("<locals>.failing")
+        assert loader["count"] == 1
+
+    def test_async_loader_timing(self, metrics: MetricsAggregator) -> None:
+        async def load_async() -> list[str]:
+            return ["Admin"]
+
+        @require_roles("Admin", role_loader=load_async)
+        async def admin_only() -> str:
+            return "ok"
+
+        assert asyncio.run(admin_only()) == "ok"
+        (loader,) = metrics.snapshot()["loaders"].values()
+        assert loader["count"] == 1
+
+    def test_callable_instance_loader_name(self, metrics: MetricsAggregator) -> None:
+        cached = CachedRoleLoader(load_roles, key=lambda: "alice")
+
+        has_role("User", role_loader=cached)
+
+        assert set(metrics.snapshot()["loaders"]) == {"CachedRoleLoader"}
+
+    def test_no_hook(self) -> None:
+        assert get_metrics_hook() is None
+        assert has_role("User", role_loader=load_roles)
+
+
+class TestMetricsAggregator:
+    def test_cache_hit_rates(self, metrics: MetricsAggregator) -> None:
+        cached = CachedRoleLoader(load_roles, key=lambda: "alice")
+        metrics.watch_cache("roles", cached)
+        set_decision_cache(DecisionCache())
+        try:
+            for _ in range(4):
+                has_role("User", role_loader=cached)
+                Policy.any_of("User").evaluate(frozenset({"User"}))
+            caches = metrics.snapshot()["caches"]
+        finally:
+            set_decision_cache(None)
+
+        assert caches["roles"]["hits"] == 3  # noqa: PLR2004
+        assert caches["roles"]["hit_rate"] == 0.75  # noqa: PLR2004
+        assert caches["decision_cache"]["misses"] == 4  # noqa: PLR2004
+
+    def test_prometheus(self, metrics: MetricsAggregator) -> None:
+        has_role("Admin", role_loader=load_roles)
+        metrics.watch_cache("roles", CachedRoleLoader(load_roles, key=str))
+
+        text = metrics.prometheus()
+
+        assert "# TYPE streamlit_rbac_checks_total counter" in text
+        assert (
+            'streamlit_rbac_checks_total{source="has_role",'
+            'policy="one of (\'Admin\',)",result="denied"} 1'
+        ) in text
+        assert (
+            'streamlit_rbac_loader_seconds_bucket{loader="load_roles",le="+Inf"} 1'
+            in text
+        )
+        assert 'streamlit_rbac_loader_seconds_count{loader="load_roles"} 1' in text
+        assert 'streamlit_rbac_cache_hits_total{cache="roles"} 0' in text
+        assert text.endswith("\n")
+
+    def test_prometheus_escapes_labels(self) -> None:
+        aggregator = MetricsAggregator()
+
+        aggregator.record_check("test", 'role "a"\\b\nc', granted=True)
+
+        assert 'policy="role \\"a\\"\\\\b\\nc"' in aggregator.prometheus()
+
+    def test_histogram_buckets_are_cumulative(self) -> None:
+        aggregator = MetricsAggregator(buckets=(0.1, 1.0))
+
+        for seconds in (0.05, 0.5, 0.5, 2.0):
+            aggregator.record_load("slow", seconds)
+
+        text = aggregator.prometheus()
+        assert 'streamlit_rbac_loader_seconds_bucket{loader="slow",le="0.1"} 1' in text
+        assert 'streamlit_rbac_loader_seconds_bucket{loader="slow",le="1.0"} 3' in text
+        assert 'streamlit_rbac_loader_seconds_bucket{loader="slow",le="+Inf"} 4' in text
+
+    def test_concurrent_records_are_merged(self) -> None:
+        aggregator = MetricsAggregator()
+        barrier = threading.Barrier(8)
+
+        def worker() -> None:
+            barrier.wait()
+            for i in range(500):
+                aggregator.record_check("has_role", "p", granted=i % 2 == 0)
+                aggregator.record_load("loader", 0.002)
+
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        snapshot = aggregator.snapshot()
+        assert snapshot["checks"]["has_role"]["p"] == {
+            "granted": 2000,
+            "denied": 2000,
+        }
+        assert snapshot["loaders"]["loader"]["count"] == 4000  # noqa: PLR2004
+        assert (
+            'streamlit_rbac_loader_seconds_bucket{loader="loader",le="0.005"} 4000'
+            in aggregator.prometheus()
+        )
+
+    def test_reset(self) -> None:
+        aggregator = MetricsAggregator()
+        aggregator.record_check("test", "policy", granted=False)
+        aggregator.record_load("loader", 0.1)
+
+        aggregator.reset()
+
+        assert aggregator.snapshot() == {"checks": {}, "loaders": {}, "caches": {}}
+
+    @pytest.mark.parametrize("buckets", [(), (1.0, 0.5), (0.5, 0.5)])
+    def test_invalid_buckets(self, buckets: tuple[float, ...]) -> None:
+        with pytest.raises(ValueError, match="buckets"):
+            MetricsAggregator(buckets=buckets)
@@ -0,0 +1,205 @@
+"""ロール単位で分割されたデータキャッシュのテスト."""
+
+from typing import TYPE_CHECKING, cast
+
+import pytest
+
+from streamlit_rbac import (
+    role_fingerprint,
+    role_partitioned_cache,
+)
+from tests.helpers import FakeClock, RegisterHierarchy
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+
+class Session:
+    def __init__(self) -> None:
+        self.roles = ["User"]
+
+    def __call__(self) -> list[str]:
+        return self.roles
+
+
+@pytest.fixture
+def session() -> Session:
+    return Session()
+
+
+@pytest.fixture
+def hierarchy(register_hierarchy: RegisterHierarchy) -> None:
+    register_hierarchy({"Admin": ["User"]})
+
+
+class TestRoleFingerprint:
+    def test_order_and_duplicates_ignored(self) -> None:
+        assert role_fingerprint(["A", "B"]) == role_fingerprint(["B", "A", "A"])
+
+    def test_different_sets_differ(self) -> None:
+        assert role_fingerprint(["A", "B"]) != role_fingerprint(["AB"])
+        assert role_fingerprint([]) != role_fingerprint([""])
+
+
+class TestRolePartitionedCache:
+    def test_shared_between_identical_roles(self, session: Session) -> None:
+        calls: list[str] = []
+
+        @role_partitioned_cache(role_loader=session)
+        def load(region: str) -> str:
+            calls.append(region)
+            return f"{region}:{len(calls)}"
+
+        first = load("east")
+        session.roles = ["User"]  # 別ユーザーだが同じロール
+        assert load("east") == first
+        assert calls == ["east"]
+        assert load.stats.hits == 1
+
+    def test_isolated_between_different_roles(self, session: Session) -> None:
+        @role_partitioned_cache(role_loader=session)
+        def load() -> tuple[str, ...]:
+            return tuple(session.roles)
+
+        assert load() == ("User",)
+        session.roles = ["Admin"]
+        assert load() == ("Admin",)
+        assert load.partition_sizes == {
+            role_fingerprint(["User"]): 1,
+            role_fingerprint(["Admin"]): 1,
+        }
+
+    def test_arguments_are_part_of_key(self, session: Session) -> None:
+        @role_partitioned_cache(role_loader=session)
+        def load(a: int, *, b: int = 0) -> int:
+            return a + b
+
+        assert load(1, b=2) == 3  # noqa: PLR2004
+        assert load(1, b=3) == 4  # noqa: PLR2004
+        assert load.partition_sizes == {role_fingerprint(["User"]): 2}
+
+    @pytest.mark.usefixtures("hierarchy")
+    def test_partitioned_by_effective_roles(self, session: Session) -> None:
+        @role_partitioned_cache(role_loader=session)
+        def load() -> int:
+            return 0
+
+        session.roles = ["Admin"]
+        load()
+        session.roles = ["Admin", "User"]
+        load()
+
+        assert load.stats.hits == 1
+        assert load.partition_sizes == {role_fingerprint(["Admin", "User"]): 1}
+
+    def test_ttl_expiry(self, session: Session) -> None:
+        clock = FakeClock()
+        calls = 0
+
+        @role_partitioned_cache(role_loader=session, ttl=10, timer=clock)
+        def load() -> int:
+            nonlocal calls
+            calls += 1
+            return calls
+
+        assert load() == 1
+        clock.now = 9.9
+        assert load() == 1
+        clock.now = 10.0
+        assert load() == 2  # noqa: PLR2004
+        assert load.partition_sizes == {role_fingerprint(["User"]): 1}
+
+    def test_maxsize_evicts_least_recently_used(self, session: Session) -> None:
+        @role_partitioned_cache(role_loader=session, maxsize=2)
+        def load(value: int) -> int:
+            return value
+
+        load(1)
+        session.roles = ["Admin"]
+        load(2)
+        session.roles = ["User"]
+        load(1)
+        load(3)
+
+        assert load.stats.evictions == 1
+        assert load.partition_sizes == {role_fingerprint(["User"]): 2}
+
+    def test_invalidate_partition(self, session: Session) -> None:
+        @role_partitioned_cache(role_loader=session)
+        def load(value: int) -> int:
+            return value
+
+        load(1)
+        load(2)
+        session.roles = ["Admin"]
+        load(1)
+
+        load.invalidate(["User"])
+
+        assert load.partition_sizes == {role_fingerprint(["Admin"]): 1}
+        assert load.stats.size == 1
+
+    @pytest.mark.usefixtures("hierarchy")
+    def test_invalidate_expands_roles(self, session: Session) -> None:
+        @role_partitioned_cache(role_loader=session)
+        def load() -> int:
+            return 0
+
+        session.roles = ["Admin"]
+        load()
+        session.roles = ["User"]
+        load()
+
+        load.invalidate(["Admin"])
+
+        assert load.partition_sizes == {role_fingerprint(["User"]): 1}
+
+    @pytest.mark.parametrize("clear", [False, True])
+    def test_invalidated_during_call_is_not_stored(
+        self, session: Session, *, clear: bool
+    ) -> None:
+        calls = 0
+
+        @role_partitioned_cache(role_loader=session)
+        def load() -> int:
+            nonlocal calls
+            calls += 1
+            if calls == 1:
+                if clear:
+                    load.clear()
+                else:
+                    load.invalidate(["User"])
+            return calls
+
+        assert load() == 1
+        assert load.stats.size == 0
+        assert load() == 2  # noqa: PLR2004
+        assert load() == 2  # noqa: PLR2004
+
+    def test_clear(self, session: Session) -> None:
+        @role_partitioned_cache(role_loader=session)
+        def load() -> int:
+            return 0
+
+        load()
+        load.clear()
+
+        assert load.partition_sizes == {}
+        assert load.stats.size == 0
+
+    def test_preserves_metadata(self, session: Session) -> None:
+        @role_partitioned_cache(role_loader=session)
+        def load() -> int:
+            """Docstring."""
+            return 0
+
+        # functools.update_wrapper で付与される属性は型上は宣言されていない
+        assert cast("Callable[[], int]", load).__name__ == "load"
+        assert load.__doc__ == "Docstring."
+
+    @pytest.mark.parametrize(("ttl", "maxsize"), [(0, 1), (1, 0)])
+    def test_invalid_limits(self, session: Session, ttl: float, maxsize: int) -> None:
+        with pytest.raises(ValueError, match="must be positive"):
+            role_partitioned_cache(role_loader=session, ttl=ttl, maxsize=maxsize)(
+                lambda: 0
+            )
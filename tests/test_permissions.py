@@ -0,0 +1,136 @@
+"""パーミッションのテスト."""
+# ruff: noqa: PLC0415
+
+from collections.abc import Iterator
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from streamlit_rbac import (
+    PermissionMap,
+    RoleHierarchy,
+    get_permission_map,
+    has_permission,
+    require_permission,
+    set_permission_map,
+    set_role_hierarchy,
+)
+
+
+@pytest.fixture
+def permissions() -> Iterator[PermissionMap]:
+    registered = PermissionMap(
+        {
+            "Admin": ["member:delete", "report:export"],
+            "Manager": ["report:export", "report:view"],
+            "User": ["report:view"],
+        }
+    )
+    set_permission_map(registered)
+    yield registered
+    set_permission_map(None)
+
+
+class TestPermissionMap:
+    def test_inverted_index(self, permissions: PermissionMap) -> None:
+        assert permissions.roles_for("report:export") == frozenset({"Admin", "Manager"})
+        assert permissions.roles_for("no:such") == frozenset()
+        assert permissions.permissions == frozenset(
+            {"member:delete", "report:export", "report:view"}
+        )
+
+    def test_permissions_for(self, permissions: PermissionMap) -> None:
+        assert permissions.permissions_for(["Manager"]) == frozenset(
+            {"report:export", "report:view"}
+        )
+
+
+class TestHasPermission:
+    @pytest.mark.usefixtures("permissions")
+    @pytest.mark.parametrize(
+        ("permission", "user_roles", "expected"),
+        [
+            ("member:delete", ["Admin"], True),
+            ("member:delete", ["Manager", "User"], False),
+            ("report:export", ["Manager"], True),
+            ("no:such", ["Admin"], False),
+            ("report:view", [], False),
+        ],
+    )
+    def test_with_user_roles(
+        self, permission: str, user_roles: list[str], expected: bool
+    ) -> None:
+        assert has_permission(permission, user_roles=user_roles) is expected
+
+    @pytest.mark.usefixtures("permissions")
+    def test_with_role_loader(self) -> None:
+        assert has_permission("report:view", role_loader=lambda: ["User"]) is True
+
+    @pytest.mark.usefixtures("permissions")
+    def test_with_hierarchy(self) -> None:
+        set_role_hierarchy(RoleHierarchy({"Lead": ["Admin"]}))
+        try:
+            assert has_permission("member:delete", user_roles=["Lead"]) is True
+        finally:
+            set_role_hierarchy(None)
+
+    def test_not_registered(self) -> None:
+        assert get_permission_map() is None
+        with pytest.raises(RuntimeError, match="No PermissionMap is registered"):
+            has_permission("member:delete", user_roles=["Admin"])
+
+
+class TestRequirePermission:
+    @pytest.mark.usefixtures("permissions")
+    def test_allowed(self) -> None:
+        @require_permission("member:delete", role_loader=lambda: ["Admin"])
+        def delete_member() -> str:
+            return "ok"
+
+        assert delete_member() == "ok"
+
+    @pytest.mark.usefixtures("permissions")
+    def test_denied(self) -> None:
+        @require_permission("member:delete", role_loader=lambda: ["Manager"])
+        def delete_member() -> str:
+            return "ok"
+
+        with pytest.raises(PermissionError, match="permission 'member:delete'"):
+            delete_member()
+
+    def test_follows_registered_map(self) -> None:
+        @require_permission("member:delete", role_loader=lambda: ["Manager"])
+        def delete_member() -> str:
+            return "ok"
+
+        set_permission_map(PermissionMap({"Manager": ["member:delete"]}))
+        try:
+            assert delete_member() == "ok"
+        finally:
+            set_permission_map(None)
+
+
+@pytest.mark.usefixtures("no_script_run_ctx")
+class TestAuthorizePermission:
+    @pytest.mark.usefixtures("permissions")
+    def test_allowed(self) -> None:
+        mock_st = MagicMock()
+
+        with patch.dict("sys.modules", {"streamlit": mock_st}):
+            from streamlit_rbac._streamlit import authorize_permission
+
+            authorize_permission("report:view", role_loader=lambda: ["User"])
+            mock_st.stop.assert_not_called()
+
+    @pytest.mark.usefixtures("permissions")
+    def test_denied(self) -> None:
+        mock_st = MagicMock()
+
+        with patch.dict("sys.modules", {"streamlit": mock_st}):
+            from streamlit_rbac._streamlit import authorize_permission
+
+            authorize_permission(
+                "member:delete", role_loader=lambda: ["User"], denied_message="拒否"
+            )
+            mock_st.error.assert_called_once_with("拒否")
+            mock_st.stop.assert_called_once()
@@ -0,0 +1,56 @@
+"""認可ポリシーのテスト."""
+
+import pytest
+
+from streamlit_rbac import Policy, has_all_roles, has_any_role
+
+
+class TestPolicy:
+    @pytest.mark.parametrize(
+        ("roles", "user_roles"),
+        [
+            (("Admin",), ["Admin"]),
+            (("Admin",), ["User"]),
+            (("Admin", "Manager"), ["Manager", "User"]),
+            (("Admin", "Manager"), ["User"]),
+            ((), ["Admin"]),
+        ],
+    )
+    def test_matches_scalar_functions(
+        self, roles: tuple[str, ...], user_roles: list[str]
+    ) -> None:
+        assert Policy.any_of(*roles).allows(user_roles=user_roles) == has_any_role(
+            *roles, user_roles=user_roles
+        )
+        assert Policy.all_of(*roles).allows(user_roles=user_roles) == has_all_roles(
+            *roles, user_roles=user_roles
+        )
+
+    def test_none_of(self) -> None:
+        policy = Policy.none_of("Contractor", "Guest")
+        assert policy.allows(user_roles=["Admin"]) is True
+        assert policy.allows(user_roles=["Admin", "Guest"]) is False
+
+    def test_evaluate_resolved_roles(self) -> None:
+        policy = Policy.all_of("Admin", "Auditor")
+        assert policy.evaluate(frozenset({"Admin", "Auditor"})) is True
+        assert policy.evaluate(frozenset({"Admin"})) is False
+
+    def test_composition(self) -> None:
+        policy = Policy.any_of("Admin") | (
+            Policy.any_of("Manager") & ~Policy.any_of("Contractor")
+        )
+        assert policy.allows(user_roles=["Admin", "Contractor"]) is True
+        assert policy.allows(user_roles=["Manager"]) is True
+        assert policy.allows(user_roles=["Manager", "Contractor"]) is False
+        assert policy.roles == frozenset({"Admin", "Manager", "Contractor"})
+
+    def test_with_role_loader(self) -> None:
+        assert Policy.any_of("Admin").allows(role_loader=lambda: ["Admin"]) is True
+
+    def test_mutual_exclusion(self) -> None:
+        with pytest.raises(ValueError, match="mutually exclusive"):
+            Policy.any_of("Admin").allows(user_roles=[], role_loader=lambda: [])
+
+    def test_repr(self) -> None:
+        assert repr(Policy.all_of("Admin")) == "Policy(all of ('Admin',))"
@@ -0,0 +1,197 @@
+"""ポリシーファイルのテスト."""
+
+import os
+import threading
+import time
+import tomllib
+from collections.abc import Iterator
+from pathlib import Path
+
+import pytest
+
+from streamlit_rbac import (
+    PolicyFile,
+    authorize_batch,
+    get_named_policies,
+    get_permission_map,
+    get_role_hierarchy,
+    has_permission,
+    named_policy,
+    require_roles,
+    set_named_policies,
+    set_permission_map,
+    set_role_hierarchy,
+)
+from tests.helpers import FakeClock
+
+POLICIES = """
+[hierarchy]
+Admin = ["Manager"]
+Manager = ["User"]
+
+[permissions]
+Manager = ["report:view"]
+
+[policies]
+"page:reports" = "Manager and not Contractor"
+"""
+
+
+def write(path: Path, content: str) -> None:
+    """内容を書き込み、更新時刻を確実に進める."""
+    path.write_text(content)
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+@pytest.fixture
+def path(tmp_path: Path) -> Iterator[Path]:
+    policy_path = tmp_path / "policies.toml"
+    policy_path.write_text(POLICIES)
+    yield policy_path
+    set_role_hierarchy(None)
+    set_permission_map(None)
+    set_named_policies(None)
+
+
+class TestPolicyFile:
+    def test_load(self, path: Path) -> None:
+        PolicyFile(path).load()
+
+        assert get_role_hierarchy() is not None
+        assert get_permission_map() is not None
+        assert has_permission("report:view", user_roles=["Admin"]) is True
+        assert list(get_named_policies()) == ["page:reports"]
+
+    def test_named_policy(self, path: Path) -> None:
+        PolicyFile(path).load()
+
+        @require_roles(named_policy("page:reports"), role_loader=lambda: ["Admin"])
+        def reports() -> str:
+            return "ok"
+
+        assert reports() == "ok"
+        assert authorize_batch(
+            [["User"], ["Manager", "Contractor"]], [named_policy("page:reports")]
+        ) == [(False,), (False,)]
+
+    def test_unknown_named_policy(self, path: Path) -> None:
+        PolicyFile(path).load()
+
+        with pytest.raises(RuntimeError, match="No policy named 'missing'"):
+            named_policy("missing").allows(user_roles=["Admin"])
+
+    def test_check_is_rate_limited(self, path: Path) -> None:
+        clock = FakeClock()
+        policy_file = PolicyFile(path, interval=5, timer=clock)
+        policy_file.load()
+
+        write(path, POLICIES.replace("report:view", "report:edit"))
+        clock.now = 1.0
+        assert policy_file.check() is True
+        assert has_permission("report:edit", user_roles=["Manager"]) is True
+
+        write(path, POLICIES)
+        clock.now = 4.0
+        assert policy_file.check() is False
+        assert has_permission("report:view", user_roles=["Manager"]) is False
+        clock.now = 6.0
+        assert policy_file.check() is True
+        assert has_permission("report:view", user_roles=["Manager"]) is True
+
+    def test_unchanged_content_not_recompiled(self, path: Path) -> None:
+        clock = FakeClock()
+        policy_file = PolicyFile(path, interval=1, timer=clock)
+        policy_file.load()
+        hierarchy = get_role_hierarchy()
+
+        write(path, POLICIES)  # touch だけで内容は同じ
+        clock.now = 2.0
+
+        assert policy_file.check() is False
+        assert get_role_hierarchy() is hierarchy
+
+    def test_missing_sections_cleared(self, path: Path) -> None:
+        PolicyFile(path).load()
+
+        write(path, '[policies]\nadmin = "Admin"\n')
+        PolicyFile(path).load()
+
+        assert get_role_hierarchy() is None
+        assert get_permission_map() is None
+
+    @pytest.mark.parametrize(
+        ("content", "error", "message"),
+        [
+            ("[roles]\n", ValueError, "Unknown sections"),
+            ("[hierarchy]\nAdmin = 'User'\n", ValueError, r"\[hierarchy\]"),
+            ("[policies]\nx = 1\n", ValueError, r"\[policies\]"),
+            ("[policies]\nx = 'Admin and'\n", ValueError, "Invalid policy"),
+            ("[hierarchy\n", tomllib.TOMLDecodeError, "Expected"),
+        ],
+    )
+    def test_invalid_file_keeps_previous_config(
+        self, path: Path, content: str, error: type[Exception], message: str
+    ) -> None:
+        PolicyFile(path).load()
+        hierarchy = get_role_hierarchy()
+
+        write(path, content)
+        with pytest.raises(error, match=message):
+            PolicyFile(path).load()
+
+        assert get_role_hierarchy() is hierarchy
+
+    def test_background_reload(self, path: Path) -> None:
+        policy_file = PolicyFile(path, interval=0.01)
+        policy_file.load()
+        policy_file.start()
+        try:
+            write(path, POLICIES.replace("report:view", "report:edit"))
+            deadline = time.monotonic() + 5
+            while not has_permission("report:edit", user_roles=["Manager"]):
+                assert time.monotonic() < deadline
+                time.sleep(0.01)
+
+            write(path, "[hierarchy\n")
+            while policy_file.last_error is None:
+                assert time.monotonic() < deadline
+                time.sleep(0.01)
+            assert has_permission("report:edit", user_roles=["Manager"]) is True
+        finally:
+            policy_file.stop()
+
+    def test_checks_never_see_partial_config(self, path: Path) -> None:
+        policy_file = PolicyFile(path, interval=0.001)
+        policy_file.load()
+        stop = threading.Event()
+        failures: list[str] = []
+
+        def checker() -> None:
+            while not stop.is_set():
+                # 階層とパーミッションは常に同じ版の組み合わせで観測される
+                if not has_permission("report:view", user_roles=["Admin"]):
+                    failures.append("report:view")
+
+        thread = threading.Thread(target=checker)
+        thread.start()
+        try:
+            for i in range(20):
+                write(path, POLICIES + f"# revision {i}\n")
+                policy_file.load()
+        finally:
+            stop.set()
+            thread.join()
+
+        assert failures == []
+
+    @pytest.mark.usefixtures("path")
+    def test_set_named_policies(self) -> None:
+        set_named_policies({"admin": "Admin", "staff": named_policy("admin")})
+
+        assert named_policy("staff").allows(user_roles=["Admin"]) is True
+        assert named_policy("admin").allows(user_roles=["User"]) is False
+
+    def test_invalid_interval(self, path: Path) -> None:
+        with pytest.raises(ValueError, match="interval must be positive"):
+            PolicyFile(path, interval=0)
@@ -0,0 +1,85 @@
+"""ロールレジストリのテスト."""
+
+from enum import Enum
+
+import pytest
+
+from streamlit_rbac import RoleRegistry, has_all_roles, has_any_role, has_role
+
+
+class Role(Enum):
+    ADMIN = "Admin"
+    MANAGER = "Manager"
+    USER = "User"
+
+
+ADMIN_BIT = 0b001
+MANAGER_BIT = 0b010
+USER_BIT = 0b100
+
+
+@pytest.fixture
+def registry() -> RoleRegistry:
+    return RoleRegistry(Role)
+
+
+class TestRoleRegistry:
+    def test_bit_assignment(self, registry: RoleRegistry) -> None:
+        assert registry.roles == ("Admin", "Manager", "User")
+        assert registry.mask(["Admin", "User"]) == ADMIN_BIT | USER_BIT
+        assert registry.names(ADMIN_BIT | USER_BIT) == frozenset({"Admin", "User"})
+        assert registry.all_mask == ADMIN_BIT | MANAGER_BIT | USER_BIT
+
+    @pytest.mark.parametrize(
+        "user_roles",
+        [[], ["Admin"], ["Manager", "User"], ["Admin", "Manager", "User"]],
+    )
+    @pytest.mark.parametrize(
+        "required", [(), ("Admin",), ("Manager", "User"), ("Admin", "User")]
+    )
+    def test_matches_string_api(
+        self,
+        registry: RoleRegistry,
+        user_roles: list[str],
+        required: tuple[str, ...],
+    ) -> None:
+        mask = registry.mask(user_roles)
+        for user in (user_roles, mask):
+            assert registry.has_any_role(*required, user_roles=user) == has_any_role(
+                *required, user_roles=user_roles
+            )
+            assert registry.has_all_roles(*required, user_roles=user) == (
+                has_all_roles(*required, user_roles=user_roles)
+            )
+        for role in required:
+            assert registry.has_role(role, user_roles=mask) == has_role(
+                role, user_roles=user_roles
+            )
+
+    def test_with_role_loader(self, registry: RoleRegistry) -> None:
+        assert registry.has_role("Admin", role_loader=lambda: ["Admin"]) is True
+        assert registry.resolve(role_loader=lambda: ["Manager"]) == MANAGER_BIT
+
+    def test_mutual_exclusion(self, registry: RoleRegistry) -> None:
+        with pytest.raises(ValueError, match="mutually exclusive"):
+            registry.has_role("Admin", user_roles=ADMIN_BIT, role_loader=lambda: [])
+        with pytest.raises(ValueError, match="must be specified"):
+            registry.has_role("Admin")
+
+    def test_unknown_role_raises(self, registry: RoleRegistry) -> None:
+        with pytest.raises(ValueError, match="Unknown role: 'Auditor'"):
+            registry.has_role("Auditor", user_roles=["Admin"])
+        with pytest.raises(ValueError, match="Unknown role"):
+            registry.mask(["Auditor"])
+
+    def test_unknown_role_ignored(self) -> None:
+        registry = RoleRegistry(Role, on_unknown="ignore")
+
+        assert registry.mask(["Admin", "Auditor"]) == ADMIN_BIT
+        assert registry.has_role("Auditor", user_roles=["Auditor"]) is False
+        assert registry.has_any_role("Auditor", "Admin", user_roles=["Admin"]) is True
+        assert registry.has_all_roles("Auditor", "Admin", user_roles=["Admin"]) is False
+
+    def test_duplicate_roles(self) -> None:
+        with pytest.raises(ValueError, match="duplicates"):
+            RoleRegistry(["Admin", "Admin"])
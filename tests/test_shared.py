@@ -0,0 +1,248 @@
+"""プロセス間共有ロールキャッシュのテスト."""
+
+import sqlite3
+import subprocess
+import sys
+import textwrap
+import threading
+from collections.abc import Iterator
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from streamlit_rbac import SharedRoleCache, has_role
+from streamlit_rbac._shared import _decode, _encode
+from tests.helpers import CountingLoader, FakeClock
+
+
+@pytest.fixture
+def source() -> CountingLoader:
+    return CountingLoader({"alice": ["Admin", "User"], "bob": []})
+
+
+@pytest.fixture
+def clock() -> FakeClock:
+    return FakeClock(1000.0)
+
+
+@pytest.fixture
+def workers(
+    tmp_path: Path, source: CountingLoader, clock: FakeClock
+) -> Iterator[tuple[SharedRoleCache, SharedRoleCache]]:
+    """同じファイルを共有する2つのワーカー相当のキャッシュ."""
+    caches = tuple(
+        SharedRoleCache(
+            source,
+            key=lambda: source.user,
+            path=tmp_path / "roles.db",
+            ttl=60,
+            timer=clock,
+        )
+        for _ in range(2)
+    )
+    yield caches[0], caches[1]
+    for cache in caches:
+        cache.close()
+
+
+class TestEncoding:
+    @pytest.mark.parametrize(
+        "roles", [set(), {""}, {"Admin"}, {"Admin", "User", "管理者"}]
+    )
+    def test_round_trip(self, roles: set[str]) -> None:
+        assert _decode(_encode(roles)) == roles
+
+    def test_rejects_nul(self) -> None:
+        with pytest.raises(ValueError, match="NUL"):
+            _encode(["Ad\0min"])
+
+
+class TestSharedRoleCache:
+    def test_shared_between_instances(
+        self,
+        workers: tuple[SharedRoleCache, SharedRoleCache],
+        source: CountingLoader,
+    ) -> None:
+        first, second = workers
+
+        assert first() == frozenset({"Admin", "User"})
+        assert second() == frozenset({"Admin", "User"})
+        assert source.calls == 1
+        assert first.stats.misses == 1
+        assert second.stats.hits == 1
+
+    def test_empty_role_set_is_cached(
+        self,
+        workers: tuple[SharedRoleCache, SharedRoleCache],
+        source: CountingLoader,
+    ) -> None:
+        first, second = workers
+        source.user = "bob"
+
+        assert first() == frozenset()
+        assert second() == frozenset()
+        assert source.calls == 1
+
+    def test_ttl_expiry(
+        self,
+        workers: tuple[SharedRoleCache, SharedRoleCache],
+        source: CountingLoader,
+        clock: FakeClock,
+    ) -> None:
+        first, second = workers
+        first()
+        clock.now += 61
+
+        second()
+
+        assert source.calls == 2  # noqa: PLR2004
+
+    def test_invalidate(
+        self,
+        workers: tuple[SharedRoleCache, SharedRoleCache],
+        source: CountingLoader,
+    ) -> None:
+        first, second = workers
+        first()
+        source.roles["alice"] = ["User"]
+
+        second.invalidate("alice")
+
+        assert first() == frozenset({"User"})
+        assert source.calls == 2  # noqa: PLR2004
+
+    def test_bump_generation(
+        self,
+        workers: tuple[SharedRoleCache, SharedRoleCache],
+        source: CountingLoader,
+    ) -> None:
+        first, second = workers
+        first()
+
+        second.bump_generation()
+
+        assert first.generation == 1
+        first()
+        assert source.calls == 2  # noqa: PLR2004
+
+    def test_generation_bumped_during_load_is_not_stored(
+        self,
+        tmp_path: Path,
+        workers: tuple[SharedRoleCache, SharedRoleCache],
+        source: CountingLoader,
+        clock: FakeClock,
+    ) -> None:
+        first, second = workers
+
+        def stale_loader() -> list[str]:
+            second.bump_generation()
+            return ["Admin"]
+
+        racing = SharedRoleCache(
+            stale_loader, key=lambda: "alice", path=tmp_path / "roles.db", timer=clock
+        )
+        try:
+            assert racing() == frozenset({"Admin"})
+        finally:
+            racing.close()
+
+        assert first() == frozenset({"Admin", "User"})
+        assert source.calls == 1
+
+    def test_invalidated_during_load_is_not_stored(
+        self,
+        tmp_path: Path,
+        workers: tuple[SharedRoleCache, SharedRoleCache],
+        source: CountingLoader,
+        clock: FakeClock,
+    ) -> None:
+        first, second = workers
+
+        def stale_loader() -> list[str]:
+            second.invalidate("alice")
+            return ["Admin"]
+
+        racing = SharedRoleCache(
+            stale_loader, key=lambda: "alice", path=tmp_path / "roles.db", timer=clock
+        )
+        try:
+            assert racing() == frozenset({"Admin"})
+        finally:
+            racing.close()
+
+        assert first() == frozenset({"Admin", "User"})
+        assert source.calls == 1
+        # 無効化後に読み込みを始めた結果は保存される
+        assert second() == frozenset({"Admin", "User"})
+        assert source.calls == 1
+
+    def test_purge(
+        self,
+        workers: tuple[SharedRoleCache, SharedRoleCache],
+        source: CountingLoader,
+        clock: FakeClock,
+    ) -> None:
+        first, _ = workers
+        first()
+        source.user = "bob"
+        first()
+        clock.now += 61
+
+        assert first.purge() == 2  # noqa: PLR2004
+        assert first.stats.size == 0
+        assert first.stats.evictions == 2  # noqa: PLR2004
+
+    def test_with_has_role(
+        self,
+        workers: tuple[SharedRoleCache, SharedRoleCache],
+        source: CountingLoader,
+    ) -> None:
+        first, _ = workers
+
+        assert has_role("Admin", role_loader=first)
+        assert has_role("User", role_loader=first)
+        assert source.calls == 1
+
+    def test_short_lived_threads_reuse_connections(
+        self, workers: tuple[SharedRoleCache, SharedRoleCache]
+    ) -> None:
+        first, _ = workers
+        results: list[frozenset[str]] = []
+
+        with patch("sqlite3.connect", wraps=sqlite3.connect) as connect:
+            for _ in range(50):
+                thread = threading.Thread(target=lambda: results.append(first()))
+                thread.start()
+                thread.join()
+
+        assert results == [frozenset({"Admin", "User"})] * 50
+        connect.assert_not_called()
+
+    def test_shared_across_processes(
+        self, tmp_path: Path, source: CountingLoader
+    ) -> None:
+        path = tmp_path / "roles.db"
+        script = textwrap.dedent(
+            f"""
+            from streamlit_rbac import SharedRoleCache
+
+            cache = SharedRoleCache(
+                lambda: ["Auditor"], key=lambda: "alice", path={str(path)!r}
+            )
+            cache()
+            cache.close()
+            """
+        )
+        subprocess.run([sys.executable, "-c", script], check=True)
+
+        cache = SharedRoleCache(source, key=lambda: "alice", path=path)
+        try:
+            assert cache() == frozenset({"Auditor"})
+        finally:
+            cache.close()
+        assert source.calls == 0
+
+    def test_invalid_ttl(self, tmp_path: Path) -> None:
+        with pytest.raises(ValueError, match="ttl must be positive"):
+            SharedRoleCache(list, key=str, path=tmp_path / "roles.db", ttl=0)
@@ -0,0 +1,137 @@
+"""single-flight 重複排除のテスト."""
+
+import threading
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from streamlit_rbac import (
+    CachedRoleLoader,
+    SingleFlight,
+    SingleFlightRoleLoader,
+    has_role,
+)
+
+WORKERS = 8
+RELEASE_DELAY = 0.2
+
+
+class BlockingLoader:
+    """release されるまでブロックするロールローダー."""
+
+    def __init__(self, roles: list[str]) -> None:
+        self.roles = roles
+        self.calls = 0
+        self.entered = threading.Event()
+        self.release = threading.Event()
+
+    def __call__(self) -> list[str]:
+        self.calls += 1
+        self.entered.set()
+        self.release.wait(5)
+        return self.roles
+
+
+def run_concurrently(
+    flight: SingleFlight[str], key: str, func: Callable[[], str], count: int
+) -> list[object]:
+    """count 個のスレッドから同時に do を呼び出し、結果または例外を返す."""
+    barrier = threading.Barrier(count)
+
+    def call() -> object:
+        barrier.wait()
+        try:
+            return flight.do(key, func)
+        except Exception as error:
+            return error
+
+    with ThreadPoolExecutor(count) as pool:
+        return list(pool.map(lambda _: call(), range(count)))
+
+
+class TestSingleFlight:
+    def test_concurrent_calls_share_one_execution(self) -> None:
+        flight: SingleFlight[str] = SingleFlight()
+        calls = 0
+        gate = threading.Event()
+
+        def slow() -> str:
+            nonlocal calls
+            calls += 1
+            gate.wait(5)
+            return "value"
+
+        timer = threading.Timer(RELEASE_DELAY, gate.set)
+        timer.start()
+        results = run_concurrently(flight, "alice", slow, WORKERS)
+
+        assert results == ["value"] * WORKERS
+        assert calls == 1
+        assert flight.in_flight == 0
+
+    def test_exception_shared_with_waiters(self) -> None:
+        flight: SingleFlight[str] = SingleFlight()
+        gate = threading.Event()
+
+        def failing() -> str:
+            gate.wait(5)
+            raise RuntimeError("loader failed")
+
+        timer = threading.Timer(RELEASE_DELAY, gate.set)
+        timer.start()
+        results = run_concurrently(flight, "alice", failing, WORKERS)
+
+        assert all(isinstance(result, RuntimeError) for result in results)
+
+    def test_key_released_after_completion(self) -> None:
+        flight: SingleFlight[int] = SingleFlight()
+        counter = iter(range(10))
+
+        assert flight.do("alice", lambda: next(counter)) == 0
+        assert flight.do("alice", lambda: next(counter)) == 1
+
+    def test_waiter_timeout(self) -> None:
+        flight: SingleFlight[list[str]] = SingleFlight()
+        loader = BlockingLoader(["Admin"])
+        leader = threading.Thread(target=flight.do, args=("alice", loader))
+        leader.start()
+        loader.entered.wait(5)
+
+        with pytest.raises(TimeoutError, match="'alice'"):
+            flight.do("alice", loader, timeout=0.01)
+
+        loader.release.set()
+        leader.join()
+        assert loader.calls == 1
+
+
+class TestSingleFlightRoleLoader:
+    def test_with_core_functions(self) -> None:
+        source = BlockingLoader(["Admin"])
+        source.release.set()
+        loader = SingleFlightRoleLoader(source, key=lambda: "alice")
+
+        assert has_role("Admin", role_loader=loader) is True
+        assert has_role("Admin", role_loader=loader) is True
+        assert source.calls == 2  # 完了後の呼び出しは共有しない  # noqa: PLR2004
+
+    def test_deduplicates_behind_cache(self) -> None:
+        source = BlockingLoader(["Admin"])
+        loader = CachedRoleLoader(
+            SingleFlightRoleLoader(source, key=lambda: "alice"),
+            key=lambda: "alice",
+        )
+        barrier = threading.Barrier(WORKERS)
+
+        def check() -> bool:
+            barrier.wait()
+            return has_role("Admin", role_loader=loader)
+
+        timer = threading.Timer(RELEASE_DELAY, source.release.set)
+        timer.start()
+        with ThreadPoolExecutor(WORKERS) as pool:
+            results = list(pool.map(lambda _: check(), range(WORKERS)))
+
+        assert results == [True] * WORKERS
+        assert source.calls == 1
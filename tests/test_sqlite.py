@@ -0,0 +1,168 @@
+"""SQLite ロールストアのテスト."""
+
+import sqlite3
+import threading
+from collections.abc import Iterator
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from streamlit_rbac import SQLiteRoleStore, has_role, require_roles
+from streamlit_rbac._sqlite import _POOL_SIZE
+
+
+@pytest.fixture
+def store() -> Iterator[SQLiteRoleStore]:
+    registered = SQLiteRoleStore(":memory:")
+    registered.grant("alice", "Admin", "User")
+    registered.grant("bob", "User")
+    yield registered
+    registered.close()
+
+
+class TestSQLiteRoleStore:
+    def test_roles_for(self, store: SQLiteRoleStore) -> None:
+        assert store.roles_for("alice") == frozenset({"Admin", "User"})
+        assert store.roles_for("nobody") == frozenset()
+        assert store.roles_for(None) == frozenset()
+
+    def test_grant_is_idempotent(self, store: SQLiteRoleStore) -> None:
+        store.grant("bob", "User", "Manager")
+
+        assert store.roles_for("bob") == frozenset({"User", "Manager"})
+
+    def test_revoke(self, store: SQLiteRoleStore) -> None:
+        store.revoke("alice", "Admin", "Missing")
+
+        assert store.roles_for("alice") == frozenset({"User"})
+
+    def test_set_roles(self, store: SQLiteRoleStore) -> None:
+        store.set_roles("alice", ["Auditor"])
+
+        assert store.roles_for("alice") == frozenset({"Auditor"})
+
+    def test_load_many(self, store: SQLiteRoleStore) -> None:
+        users = ["bob", "alice", "nobody", "bob"]
+
+        assert store.load_many(users) == {
+            "bob": frozenset({"User"}),
+            "alice": frozenset({"Admin", "User"}),
+            "nobody": frozenset(),
+        }
+
+    def test_load_many_chunks_large_inputs(self, store: SQLiteRoleStore) -> None:
+        users = [f"user{i}" for i in range(1200)]
+        store.grant("user1100", "User")
+
+        result = store.load_many(users)
+
+        assert len(result) == len(users)
+        assert result["user1100"] == frozenset({"User"})
+
+    def test_loader(self, store: SQLiteRoleStore) -> None:
+        current = {"user": "alice"}
+        loader = store.loader(lambda: current["user"])
+
+        @require_roles("Admin", role_loader=loader)
+        def protected() -> str:
+            return "ok"
+
+        assert protected() == "ok"
+        current["user"] = "bob"
+        assert has_role("Admin", role_loader=loader) is False
+        with pytest.raises(PermissionError):
+            protected()
+
+    def test_threads_share_pooled_connections(self, store: SQLiteRoleStore) -> None:
+        results: list[frozenset[str]] = []
+
+        def worker() -> None:
+            results.append(store.roles_for("alice"))
+            results.append(store.roles_for("bob"))
+
+        with patch("sqlite3.connect", wraps=sqlite3.connect) as connect:
+            # rerun ごとに新しいスレッドを作る Streamlit を模擬する
+            for _ in range(50):
+                thread = threading.Thread(target=worker)
+                thread.start()
+                thread.join()
+
+        assert results.count(frozenset({"Admin", "User"})) == 50  # noqa: PLR2004
+        connect.assert_not_called()
+
+    def test_concurrent_threads(self, store: SQLiteRoleStore) -> None:
+        results: list[frozenset[str]] = []
+        barrier = threading.Barrier(12)
+
+        def worker() -> None:
+            barrier.wait()
+            results.append(store.roles_for("alice"))
+
+        threads = [threading.Thread(target=worker) for _ in range(12)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert results == [frozenset({"Admin", "User"})] * len(threads)
+        assert store._pool._idle.qsize() <= _POOL_SIZE
+
+    def test_concurrent_reads_and_writes(self, store: SQLiteRoleStore) -> None:
+        errors: list[Exception] = []
+        barrier = threading.Barrier(8)
+
+        def worker(index: int) -> None:
+            barrier.wait()
+            try:
+                for n in range(50):
+                    store.grant(f"user{index}", f"Role{n}")
+                    store.roles_for("alice")
+            except sqlite3.OperationalError as error:
+                errors.append(error)
+
+        threads = [threading.Thread(target=worker, args=(i,)) for i in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert errors == []
+        assert len(store.roles_for("user0")) == 50  # noqa: PLR2004
+
+    def test_file_database(self, tmp_path: Path) -> None:
+        path = tmp_path / "roles.db"
+        first = SQLiteRoleStore(path, table="roles")
+        first.grant("alice", "Admin")
+        first.close()
+
+        second = SQLiteRoleStore(path, table="roles")
+        try:
+            assert second.roles_for("alice") == frozenset({"Admin"})
+        finally:
+            second.close()
+
+    def test_lookup_uses_primary_key(self, tmp_path: Path) -> None:
+        path = tmp_path / "roles.db"
+        SQLiteRoleStore(path).close()
+
+        with sqlite3.connect(path) as connection:
+            plan = connection.execute(
+                "EXPLAIN QUERY PLAN SELECT role FROM user_roles WHERE user_id = ?",
+                ("alice",),
+            ).fetchall()
+        connection.close()
+
+        assert "PRIMARY KEY" in plan[0][-1]
+
+    def test_invalid_table_name(self) -> None:
+        with pytest.raises(ValueError, match="Invalid table name"):
+            SQLiteRoleStore(":memory:", table="roles; DROP TABLE x")
+
+    @pytest.mark.usefixtures("store")
+    def test_memory_databases_are_independent(self) -> None:
+        other = SQLiteRoleStore(":memory:")
+        try:
+            assert other.roles_for("alice") == frozenset()
+        finally:
+            other.close()
@@ -1,11 +1,31 @@
 """Streamlit統合のテスト."""
 # ruff: noqa: PLC0415
 
+from types import SimpleNamespace
 from unittest.mock import MagicMock, patch
 
 import pytest
 
+from streamlit_rbac import (
+    DecisionCache,
+    MetricsAggregator,
+    PermissionMap,
+    Policy,
+    RoleHierarchy,
+    bump_role_version,
+    has_any_role,
+    has_role,
+    permission_policy,
+    set_decision_cache,
+    set_metrics_hook,
+    set_permission_map,
+    set_role_hierarchy,
+)
+from streamlit_rbac._streamlit import RoleNavigation, RolePage, SessionRoleLoader
+from tests.helpers import CountingLoader
 
+
+@pytest.mark.usefixtures("no_script_run_ctx")
 class TestAuthorizePage:
     def test_allowed(self) -> None:
         mock_st = MagicMock()
@@ -71,6 +91,18 @@ class TestAuthorizePage:
             mock_st.error.assert_not_called()
             mock_st.stop.assert_not_called()
 
+    def test_policy(self) -> None:
+        mock_st = MagicMock()
+
+        with patch.dict("sys.modules", {"streamlit": mock_st}):
+            from streamlit_rbac._streamlit import authorize_page
+
+            authorize_page(
+                Policy.all_of("Admin", "Auditor"), role_loader=lambda: ["Admin"]
+            )
+            mock_st.error.assert_called_once()
+            mock_st.stop.assert_called_once()
+
     def test_empty_allowed_roles_raises_value_error(self) -> None:
         from streamlit_rbac._streamlit import authorize_page
 
@@ -88,3 +120,343 @@ class TestAuthorizePage:
 
             with pytest.raises(RuntimeError, match="loader failed"):
                 authorize_page("Admin", role_loader=bad_loader)
+
+
+class TestRerunCached:
+    def test_reuses_result_within_rerun(self) -> None:
+        from streamlit_rbac._streamlit import rerun_cached
+
+        ctx = SimpleNamespace(cursors={})
+        loader = CountingLoader({"alice": ["Admin"]})
+        cached = rerun_cached(loader)
+
+        with patch("streamlit_rbac._streamlit._get_script_run_ctx", return_value=ctx):
+            assert has_role("Admin", role_loader=cached) is True
+            assert has_any_role("Admin", "Manager", role_loader=cached) is True
+            assert cached() == frozenset({"Admin"})
+        assert loader.calls == 1
+
+    def test_invalidated_on_next_rerun(self) -> None:
+        from streamlit_rbac._streamlit import rerun_cached
+
+        ctx = SimpleNamespace(cursors={})
+        loader = CountingLoader({"alice": ["Admin"]})
+        cached = rerun_cached(loader)
+
+        with patch("streamlit_rbac._streamlit._get_script_run_ctx", return_value=ctx):
+            cached()
+            ctx.cursors = {}  # ScriptRunContext.reset() 相当
+            cached()
+            cached()
+        assert loader.calls == 2  # noqa: PLR2004
+
+    def test_without_script_run_ctx(self) -> None:
+        from streamlit_rbac._streamlit import rerun_cached
+
+        loader = CountingLoader({"alice": ["Admin"]})
+        cached = rerun_cached(loader)
+
+        with patch("streamlit_rbac._streamlit._get_script_run_ctx", return_value=None):
+            cached()
+            cached()
+        assert loader.calls == 2  # noqa: PLR2004
+
+    def test_shared_with_authorize_page(self) -> None:
+        from streamlit_rbac._streamlit import authorize_page, rerun_cached
+
+        mock_st = MagicMock()
+        ctx = SimpleNamespace(cursors={})
+        loader = CountingLoader({"alice": ["Admin"]})
+        cached = rerun_cached(loader)
+
+        with (
+            patch.dict("sys.modules", {"streamlit": mock_st}),
+            patch("streamlit_rbac._streamlit._get_script_run_ctx", return_value=ctx),
+        ):
+            authorize_page("Admin", role_loader=cached)
+            has_role("Admin", role_loader=cached)
+        mock_st.stop.assert_not_called()
+        assert loader.calls == 1
+
+
+class TestAuthorized:
+    def test_granted(self) -> None:
+        mock_st = MagicMock()
+
+        with (
+            patch.dict("sys.modules", {"streamlit": mock_st}),
+            patch("streamlit_rbac._streamlit._get_script_run_ctx", return_value=None),
+        ):
+            from streamlit_rbac._streamlit import authorized
+
+            assert authorized("Admin", role_loader=lambda: ["Admin"]) is True
+        mock_st.info.assert_not_called()
+        mock_st.stop.assert_not_called()
+
+    def test_denied_renders_placeholder(self) -> None:
+        mock_st = MagicMock()
+
+        with (
+            patch.dict("sys.modules", {"streamlit": mock_st}),
+            patch("streamlit_rbac._streamlit._get_script_run_ctx", return_value=None),
+        ):
+            from streamlit_rbac._streamlit import authorized
+
+            assert (
+                authorized(
+                    "Admin", role_loader=lambda: ["User"], placeholder="Admin only"
+                )
+                is False
+            )
+            assert authorized("Admin", role_loader=lambda: []) is False
+        mock_st.info.assert_called_once_with("Admin only")
+        mock_st.stop.assert_not_called()
+
+    def test_callable_placeholder(self) -> None:
+        placeholder = MagicMock()
+
+        from streamlit_rbac._streamlit import authorized
+
+        assert not authorized(
+            "Admin", role_loader=lambda: ["User"], placeholder=placeholder
+        )
+        placeholder.assert_called_once_with()
+
+    def test_shares_roles_within_rerun(self) -> None:
+        from streamlit_rbac._streamlit import authorized, authorized_section
+
+        ctx = SimpleNamespace(cursors={})
+        loader = CountingLoader({"alice": ["Manager"]})
+
+        @authorized_section("Manager", role_loader=loader)
+        def section() -> str:
+            return "rendered"
+
+        with patch("streamlit_rbac._streamlit._get_script_run_ctx", return_value=ctx):
+            assert authorized("Manager", role_loader=loader)
+            assert not authorized(Policy.all_of("Manager", "Admin"), role_loader=loader)
+            assert section() == "rendered"
+            assert loader.calls == 1
+            ctx.cursors = {}  # ScriptRunContext.reset() 相当
+            assert authorized("Manager", role_loader=loader)
+        assert loader.calls == 2  # noqa: PLR2004
+
+    def test_shared_with_page_guard_and_navigation(self) -> None:
+        from streamlit_rbac._streamlit import authorize_page, authorized
+
+        mock_st = MagicMock()
+        ctx = SimpleNamespace(cursors={})
+        loader = CountingLoader({"alice": ["Manager"]})
+        navigation = RoleNavigation([RolePage("pages/Manager.py", "Manager")])
+
+        with (
+            patch.dict("sys.modules", {"streamlit": mock_st}),
+            patch("streamlit_rbac._streamlit._get_script_run_ctx", return_value=ctx),
+        ):
+            navigation.navigation(role_loader=loader)
+            authorize_page("Manager", role_loader=loader)
+            assert authorized("Manager", role_loader=loader)
+            assert loader.calls == 1
+            ctx.cursors = {}  # ScriptRunContext.reset() 相当
+            authorize_page("Manager", role_loader=loader)
+        mock_st.stop.assert_not_called()
+        assert loader.calls == 2  # noqa: PLR2004
+
+    def test_expands_rerun_cached_roles(self) -> None:
+        from streamlit_rbac._streamlit import authorized, rerun_cached
+
+        ctx = SimpleNamespace(cursors={})
+        loader = CountingLoader({"alice": ["Admin"]})
+        set_role_hierarchy(RoleHierarchy({"Admin": ["Manager"]}))
+        try:
+            with patch(
+                "streamlit_rbac._streamlit._get_script_run_ctx", return_value=ctx
+            ):
+                rerun_cached(loader)()
+                assert authorized("Manager", role_loader=loader)
+        finally:
+            set_role_hierarchy(None)
+        assert loader.calls == 1
+
+    def test_section_skipped_when_denied(self) -> None:
+        mock_st = MagicMock()
+        query = MagicMock(return_value="rows")
+
+        with (
+            patch.dict("sys.modules", {"streamlit": mock_st}),
+            patch("streamlit_rbac._streamlit._get_script_run_ctx", return_value=None),
+        ):
+            from streamlit_rbac._streamlit import authorized_section
+
+            @authorized_section(
+                "Admin", role_loader=lambda: ["User"], placeholder="Admin only"
+            )
+            def admin_report(region: str) -> str:
+                return str(query(region))
+
+            assert admin_report("east") is None
+        query.assert_not_called()
+        mock_st.info.assert_called_once_with("Admin only")
+
+
+class TestSessionRoleLoader:
+    def _loader(self) -> tuple[CountingLoader, SessionRoleLoader]:
+        loader = CountingLoader({"alice": ["Admin"], "bob": ["User"]})
+        return loader, SessionRoleLoader(loader, user=lambda: loader.user)
+
+    def test_reuses_snapshot_across_reruns(self) -> None:
+        mock_st = MagicMock(session_state={})
+        loader, session = self._loader()
+
+        with patch.dict("sys.modules", {"streamlit": mock_st}):
+            for _ in range(3):
+                assert has_role("Admin", role_loader=session) is True
+        assert loader.calls == 1
+
+    def test_observability_registration_keeps_snapshot(self) -> None:
+        mock_st = MagicMock(session_state={})
+        loader, session = self._loader()
+
+        with patch.dict("sys.modules", {"streamlit": mock_st}):
+            session()
+            set_metrics_hook(MetricsAggregator())
+            set_decision_cache(DecisionCache())
+            try:
+                session()
+            finally:
+                set_metrics_hook(None)
+                set_decision_cache(None)
+        assert loader.calls == 1
+
+    def test_stores_expanded_roles(self) -> None:
+        mock_st = MagicMock(session_state={})
+        _, session = self._loader()
+        set_role_hierarchy(RoleHierarchy({"Admin": ["User"]}))
+        try:
+            with patch.dict("sys.modules", {"streamlit": mock_st}):
+                assert session() == frozenset({"Admin", "User"})
+        finally:
+            set_role_hierarchy(None)
+        (_, roles) = mock_st.session_state["_streamlit_rbac_roles"]
+        assert roles == frozenset({"Admin", "User"})
+
+    def test_user_version_bump(self) -> None:
+        mock_st = MagicMock(session_state={})
+        loader, session = self._loader()
+
+        with patch.dict("sys.modules", {"streamlit": mock_st}):
+            session()
+            loader.roles["alice"] = ["User"]
+            bump_role_version("bob")
+            assert session() == frozenset({"Admin"})
+            bump_role_version("alice")
+            assert session() == frozenset({"User"})
+            session()
+        assert loader.calls == 2  # noqa: PLR2004
+
+    def test_global_version_bump(self) -> None:
+        mock_st = MagicMock(session_state={})
+        loader, session = self._loader()
+
+        with patch.dict("sys.modules", {"streamlit": mock_st}):
+            session()
+            bump_role_version()
+            session()
+            session()
+        assert loader.calls == 2  # noqa: PLR2004
+
+    def test_user_switch(self) -> None:
+        mock_st = MagicMock(session_state={})
+        loader, session = self._loader()
+
+        with patch.dict("sys.modules", {"streamlit": mock_st}):
+            assert session() == frozenset({"Admin"})
+            loader.user = "bob"
+            assert session() == frozenset({"User"})
+
+    def test_clear(self) -> None:
+        mock_st = MagicMock(session_state={})
+        loader, session = self._loader()
+
+        with patch.dict("sys.modules", {"streamlit": mock_st}):
+            session()
+            session.clear()
+            session()
+        assert loader.calls == 2  # noqa: PLR2004
+
+
+@pytest.mark.usefixtures("no_script_run_ctx")
+class TestRoleNavigation:
+    def _navigation(self) -> RoleNavigation:
+        return RoleNavigation(
+            [
+                RolePage("pages/Home.py", title="Home", default=True),
+                RolePage("pages/Manager.py", "Manager", "Admin", title="Manager"),
+                RolePage("pages/Admin.py", Policy.all_of("Admin"), title="Admin"),
+            ]
+        )
+
+    def test_visible_pages(self) -> None:
+        navigation = self._navigation()
+
+        def titles(roles: set[str]) -> list[str]:
+            visible = navigation.visible_pages(frozenset(roles))
+            assert isinstance(visible, tuple)
+            return [page.options["title"] for page in visible]
+
+        assert titles(set()) == ["Home"]
+        assert titles({"Manager"}) == ["Home", "Manager"]
+        assert titles({"Admin"}) == ["Home", "Manager", "Admin"]
+
+    def test_visible_pages_cached_per_role_set(self) -> None:
+        navigation = self._navigation()
+
+        first = navigation.visible_pages(frozenset({"Manager", "User"}))
+        second = navigation.visible_pages(frozenset({"User", "Manager"}))
+        assert first is second
+
+    def test_visible_pages_follow_config_changes(self) -> None:
+        navigation = RoleNavigation(
+            [RolePage("pages/Reports.py", permission_policy("report:view"))]
+        )
+        roles = frozenset({"Manager"})
+
+        set_permission_map(PermissionMap({"Admin": ["report:view"]}))
+        try:
+            assert navigation.visible_pages(roles) == ()
+            set_permission_map(PermissionMap({"Manager": ["report:view"]}))
+            assert len(navigation.visible_pages(roles)) == 1
+        finally:
+            set_permission_map(None)
+
+    def test_navigation_builds_only_visible_pages(self) -> None:
+        mock_st = MagicMock()
+        navigation = self._navigation()
+
+        with patch.dict("sys.modules", {"streamlit": mock_st}):
+            result = navigation.navigation(
+                role_loader=lambda: ["Manager"], position="top"
+            )
+
+        assert mock_st.Page.call_count == 2  # noqa: PLR2004
+        mock_st.Page.assert_any_call("pages/Manager.py", title="Manager")
+        mock_st.navigation.assert_called_once_with(
+            [mock_st.Page.return_value] * 2, position="top"
+        )
+        assert result is mock_st.navigation.return_value
+
+    def test_sections(self) -> None:
+        mock_st = MagicMock()
+        navigation = RoleNavigation(
+            {
+                "General": [RolePage("pages/Home.py")],
+                "Admin": [RolePage("pages/Admin.py", "Admin")],
+            }
+        )
+
+        with patch.dict("sys.modules", {"streamlit": mock_st}):
+            navigation.navigation(role_loader=lambda: ["User"])
+
+        mock_st.navigation.assert_called_once_with(
+            {"General": [mock_st.Page.return_value]}
+        )